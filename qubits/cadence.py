@@ -0,0 +1,345 @@
+#!/usr/local/bin/python
+# encoding: utf-8
+"""
+*A searchable index of the survey cadence - the observation epochs of each filter as sorted arrays spanning one or more survey years, repeated for the whole survey. The cadence (and the depth of each epoch) can also be read from a real survey's observation log*
+
+:Author:
+    David Young
+
+:Date Created:
+    October 18, 2026
+"""
+################# GLOBAL IMPORTS ####################
+import sys
+import os
+import re
+import numpy as np
+
+
+class cadence_index():
+    """
+    *A searchable index of the survey cadence*
+
+    The observation epochs of each filter are held as a sorted float array covering the whole survey (``numberOfYears`` survey years), so epochs can fall at any time of day and each year can follow a different pattern. The survey repeats once it ends, so the observation following the last one of the survey is the first one (offset by the survey length). The index of each filter's first epoch of every survey year is precomputed to find the season an epoch belongs to. Each epoch can also carry its own limiting magnitude (e.g. read from an observation log with ``read_observation_log``). Look-ups for many SNe at once are done with a single ``np.searchsorted``.
+
+    **Key Arguments:**
+        - ``log`` -- logger
+        - ``cadenceDictionary`` -- a dictionary of { band : observedDayList } - days since the start of the survey
+        - ``surveyYear`` -- the length of the survey year (days)
+        - ``numberOfYears`` -- the number of survey years the cadence spans. Default *1*
+        - ``depthDictionary`` -- a dictionary of { band : limitingMagList } giving the limiting magnitude of each epoch in ``cadenceDictionary``. Default *None* (every epoch of a filter has the same depth)
+
+    **Usage:**
+
+        .. code-block:: python
+
+            from qubits.cadence import cadence_index
+            cadence = cadence_index(
+                log=log,
+                cadenceDictionary=cadenceDictionary,
+                surveyYear=12. * 29.3,
+                numberOfYears=3
+            )
+            discoveryDays, waitingTimes, epochIndex = cadence.next_observation(
+                "g", visibleDays)
+            seasons = cadence.survey_year("g", epochIndex)
+    """
+    # Initialisation
+
+    def __init__(
+            self,
+            log,
+            cadenceDictionary,
+            surveyYear,
+            numberOfYears=1,
+            depthDictionary=None
+    ):
+        self.log = log
+        log.debug("instansiating a new 'cadence_index' object")
+        self.surveyYear = float(surveyYear)
+        self.numberOfYears = int(numberOfYears)
+        self.surveyLength = self.surveyYear * self.numberOfYears
+
+        self.epochs = {}
+        self.depths = {}
+        self.seasonStarts = {}
+        yearStarts = np.arange(self.numberOfYears + 1) * self.surveyYear
+        for band, days in cadenceDictionary.iteritems():
+            days = np.asarray(days, dtype=float)
+            order = np.argsort(days, kind="mergesort")
+            self.epochs[band] = days[order]
+            if depthDictionary and band in depthDictionary:
+                self.depths[band] = np.asarray(
+                    depthDictionary[band], dtype=float)[order]
+            self.seasonStarts[band] = np.searchsorted(
+                self.epochs[band], yearStarts)
+
+        return None
+
+    def next_observation(
+            self,
+            ffilter,
+            days):
+        """
+        *the first observation in the given filter strictly after each of the given days of the survey*
+
+        **Key Arguments:**
+            - ``ffilter`` -- the filter
+            - ``days`` -- array of days since the start of the survey
+
+        **Return:**
+            - ``observationDays`` -- array of the days of the survey of the next observations
+            - ``waitingTimes`` -- array of the times (days) until the next observations
+            - ``epochIndex`` -- array of the indices of the next observations in the filter's sorted cadence. -1 where the filter is never observed (the observation day and waiting time are then NaN)
+        """
+        epochs = self.epochs.get(ffilter, np.zeros(0))
+        days = np.asarray(days, dtype=float)
+        if not len(epochs):
+            nan = np.ones(days.shape) * np.nan
+            return nan, nan.copy(), -np.ones(days.shape, dtype=int)
+
+        # DAYS AFTER THE LAST OBSERVATION OF THE SURVEY WRAP TO ITS FIRST
+        # OBSERVATION
+        epochIndex = np.searchsorted(epochs, days, side="right")
+        wrapped = epochIndex == len(epochs)
+        epochIndex[wrapped] = 0
+        observationDays = epochs[epochIndex]
+        waitingTimes = observationDays - days + wrapped * self.surveyLength
+
+        return observationDays, waitingTimes, epochIndex
+
+    def count_within(
+            self,
+            ffilter,
+            epochIndex,
+            window):
+        """
+        *the number of observations that follow each given observation within a time window*
+
+        **Key Arguments:**
+            - ``ffilter`` -- the filter
+            - ``epochIndex`` -- array of indices of observations in the filter's sorted cadence
+            - ``window`` -- array of window lengths (days) after each observation
+
+        **Return:**
+            - ``counts`` -- integer array of the number of observations in each window
+        """
+        epochs = self.epochs[ffilter]
+        epochIndex = np.asarray(epochIndex)
+        window = np.clip(np.asarray(window, dtype=float), 0., None)
+
+        # EACH REPEAT OF THE SURVEY HOLDS ONE FULL CADENCE - COUNT THE
+        # REMAINDER ACROSS TWO CONSECUTIVE REPEATS OF THE EPOCHS
+        fullRepeats = np.floor(window / self.surveyLength)
+        remainder = window - fullRepeats * self.surveyLength
+        twoRepeats = np.concatenate([epochs, epochs + self.surveyLength])
+        windowEnd = epochs[epochIndex] + remainder
+        counts = np.searchsorted(
+            twoRepeats, windowEnd, side="right") - (epochIndex + 1)
+
+        return (fullRepeats * len(epochs) + counts).astype(int)
+
+    def future_offsets(
+            self,
+            ffilter,
+            epochIndex,
+            numberOfEpochs):
+        """
+        *the times of the next observations relative to each given observation, following the cadence into later repeats of the survey*
+
+        **Key Arguments:**
+            - ``ffilter`` -- the filter
+            - ``epochIndex`` -- array of indices of observations in the filter's sorted cadence
+            - ``numberOfEpochs`` -- the number of following observations to return
+
+        **Return:**
+            - ``offsets`` -- (len(epochIndex), numberOfEpochs) array of days after each observation
+        """
+        epochs = self.epochs[ffilter]
+        epochIndex = np.asarray(epochIndex)
+        following = epochIndex[:, None] + \
+            np.arange(1, numberOfEpochs + 1)[None, :]
+        offsets = epochs[following % len(epochs)] + (following // len(epochs)) * \
+            self.surveyLength - epochs[epochIndex][:, None]
+
+        return offsets
+
+    def epoch_depths(
+            self,
+            ffilter,
+            epochIndex,
+            limitingMag):
+        """
+        *the limiting magnitude of each given observation*
+
+        **Key Arguments:**
+            - ``ffilter`` -- the filter
+            - ``epochIndex`` -- array of indices of observations in the filter's sorted cadence
+            - ``limitingMag`` -- the limiting magnitude of the filter, used if its epochs have no depths of their own
+
+        **Return:**
+            - ``depths`` -- array of the limiting magnitudes (or ``limitingMag`` itself)
+        """
+        if ffilter not in self.depths:
+            return limitingMag
+
+        return self.depths[ffilter][np.asarray(epochIndex)]
+
+    def future_depths(
+            self,
+            ffilter,
+            epochIndex,
+            numberOfEpochs,
+            limitingMag):
+        """
+        *the limiting magnitudes of the next observations following each given observation - the depths matching* ``future_offsets``
+
+        **Key Arguments:**
+            - ``ffilter`` -- the filter
+            - ``epochIndex`` -- array of indices of observations in the filter's sorted cadence
+            - ``numberOfEpochs`` -- the number of following observations to return
+            - ``limitingMag`` -- the limiting magnitude of the filter, used if its epochs have no depths of their own
+
+        **Return:**
+            - ``depths`` -- (len(epochIndex), numberOfEpochs) array of limiting magnitudes (or ``limitingMag`` itself)
+        """
+        if ffilter not in self.depths:
+            return limitingMag
+
+        depths = self.depths[ffilter]
+        following = np.asarray(epochIndex)[:, None] + \
+            np.arange(1, numberOfEpochs + 1)[None, :]
+
+        return depths[following % len(depths)]
+
+    def survey_year(
+            self,
+            ffilter,
+            epochIndex):
+        """
+        *the survey year (season) each given observation falls in*
+
+        **Key Arguments:**
+            - ``ffilter`` -- the filter
+            - ``epochIndex`` -- array of indices of observations in the filter's sorted cadence
+
+        **Return:**
+            - ``surveyYears`` -- integer array of the survey years, counting from 0
+        """
+        return np.searchsorted(
+            self.seasonStarts[ffilter][1:-1], np.asarray(epochIndex), side="right")
+
+
+# LAST MODIFIED : October 18, 2026
+# CREATED : October 18, 2026
+# AUTHOR : DRYX
+def read_observation_log(
+        log,
+        pathToObservationLog,
+        bands=['g', 'r', 'i', 'z'],
+        surveyYear=12. * 29.3,
+        chunkSize=33554432):
+    """
+    *read the pointing log of a real survey into the cadence and per-epoch limiting magnitudes of each band*
+
+    The log is a text file with one pointing per line: the MJD, the band and the limiting magnitude, comma separated. A header line and ``#`` comment lines are skipped, as are pointings in bands other than ``bands`` (their number is logged). The log is read in large chunks and each chunk is parsed with a single ``np.fromstring`` call once its band names have been swapped for numeric codes, so no Python object is created per pointing and logs of millions of lines load in seconds.
+
+    **Key Arguments:**
+        - ``log`` -- logger
+        - ``pathToObservationLog`` -- path to the observation log
+        - ``bands`` -- the bands that may appear in the log. Default *['g', 'r', 'i', 'z']*
+        - ``surveyYear`` -- the length of the survey year (days). Default *12 x 29.3*
+        - ``chunkSize`` -- the number of bytes of the log parsed at once. Default *32MB*
+
+    **Return:**
+        - ``cadenceDictionary`` -- a dictionary of { band : array of epochs } - days since the first night of the log
+        - ``depthDictionary`` -- a dictionary of { band : array of the limiting magnitudes of those epochs }
+        - ``numberOfYears`` -- the number of survey years the log spans
+
+    **Usage:**
+
+        .. code-block:: python
+
+            from qubits.cadence import read_observation_log, cadence_index
+            cadenceDictionary, depthDictionary, numberOfYears = read_observation_log(
+                log=log,
+                pathToObservationLog="/path/to/pointings.csv"
+            )
+            cadence = cadence_index(
+                log=log,
+                cadenceDictionary=cadenceDictionary,
+                surveyYear=12. * 29.3,
+                numberOfYears=numberOfYears,
+                depthDictionary=depthDictionary
+            )
+    """
+    log.info('reading the observation log %s' % (pathToObservationLog,))
+    reSkippedLines = re.compile(r"(?m)^[ \t]*[#A-Za-z].*$")
+    reOtherBands = re.compile(r"(?m)^[^,\n]*,[^,\n]*[^0-9,\n][^,\n]*,.*$")
+    dropped = [0]
+
+    def _parse(text):
+        # DROP HEADER AND COMMENT LINES, SWAP THE BANDS FOR CODES AND DROP
+        # THE POINTINGS IN ANY OTHER BAND
+        text = reSkippedLines.sub("", text)
+        text = text.replace(" ", "").replace("\t", "").replace("\r", "")
+        for code, band in enumerate(bands):
+            text = text.replace(",%s," % (band,), ",%s," % (code,))
+        text, numberDropped = reOtherBands.subn("", text)
+        dropped[0] += numberDropped
+        text = re.sub(r"\n+", "\n", text).strip("\n")
+        if not text:
+            return np.zeros((0, 3))
+        text = text.replace("\n", ",")
+        values = np.fromstring(text, sep=",")
+        if len(values) != text.count(",") + 1 or len(values) % 3:
+            message = 'could not parse the observation log %s - each line must read `MJD, band, limiting magnitude` with a band in %s' % (
+                pathToObservationLog, bands)
+            log.critical(message)
+            raise ValueError(message)
+        return values.reshape(-1, 3)
+
+    chunks = []
+    remainder = ""
+    with open(pathToObservationLog, "r") as stream:
+        while True:
+            text = stream.read(chunkSize)
+            if not text:
+                break
+            text = remainder + text
+            lastLine = text.rfind("\n")
+            if lastLine < 0:
+                remainder = text
+                continue
+            remainder = text[lastLine + 1:]
+            chunks.append(_parse(text[:lastLine]))
+    chunks.append(_parse(remainder))
+    pointings = np.concatenate(chunks)
+
+    if dropped[0]:
+        log.warning('skipped %s pointings of the observation log in bands other than %s' % (
+            dropped[0], bands))
+
+    if not len(pointings):
+        message = 'the observation log %s holds no pointings' % (
+            pathToObservationLog,)
+        log.critical(message)
+        raise ValueError(message)
+
+    # EPOCHS ARE COUNTED FROM THE FIRST NIGHT OF THE LOG
+    firstNight = np.floor(pointings[:, 0].min())
+    codes = pointings[:, 1].astype(int)
+    cadenceDictionary = {}
+    depthDictionary = {}
+    for code, band in enumerate(bands):
+        thisBand = pointings[codes == code]
+        order = np.argsort(thisBand[:, 0], kind="mergesort")
+        cadenceDictionary[band] = thisBand[order, 0] - firstNight
+        depthDictionary[band] = thisBand[order, 2]
+    numberOfYears = int(
+        (pointings[:, 0].max() - firstNight) // surveyYear) + 1
+
+    log.info('read %s pointings spanning %s survey year(s) from the observation log' % (
+        len(pointings), numberOfYears))
+
+    return cadenceDictionary, depthDictionary, numberOfYears
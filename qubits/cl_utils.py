@@ -6,11 +6,13 @@
 Usage:
     qubits init <pathToWorkspace>
     qubits run -s <pathToSettingsFile> -o <pathToOutputDirectory> -d <pathToSpectralDatabase>
+    qubits compile-db -d <pathToSpectralDatabase>
 
     COMMANDS
     --------
     init            setup a qubits settings file and a test spectral database
     run             run the qubits simulation according to the setup given in the settings file
+    compile-db      pack the spectral database into memory-mapped binary arrays (one per model) for faster reading
 
     ARGUMENTS
     ---------
@@ -32,6 +34,7 @@ import readline
 import glob
 import pickle
 import yaml
+import numpy as np
 from docopt import docopt
 from fundamentals import tools, times
 from subprocess import Popen, PIPE, STDOUT
@@ -42,6 +45,9 @@ from . import datagenerator as dg
 from . import results as r
 import dryxPython.commonutils as dcu
 from . import universe as u
+from .cosmology import cosmology_table
+from .randomness import random_streams
+from .cadence import read_observation_log
 import dryxPython.mmd.mmd as dmd
 # from ..__init__ import *
 
@@ -69,6 +75,7 @@ def main(arguments=None):
             varname = arg.replace("<", "").replace(">", "")
         if varname == "import":
             varname = "iimport"
+        varname = varname.replace("-", "_")
         if isinstance(val, str) or isinstance(val, unicode):
             exec(varname + " = '%s'" % (val,))
         else:
@@ -92,6 +99,16 @@ def main(arguments=None):
         ws.setup()
         return
 
+    if compile_db:
+        from .spectra import spectral_cache
+        spectra = spectral_cache(
+            log=log,
+            pathToSpectralDatabase=pathToSpectralDatabase
+        )
+        compiledModels = spectra.compile()
+        print "compiled %s models into %s" % (len(compiledModels), spectra.pathToCompiledDatabase)
+        return
+
     # IMPORT THE SIMULATION SETTINGS
     (allSettings,
      programSettings,
@@ -168,14 +185,18 @@ def main(arguments=None):
             pathToOutputPlotDirectory=pathToOutputPlotDirectory,
             explosionDaysFromSettings=explosionDaysFromSettings,
             extendLightCurveTail=extendLightCurveTail,
-            polyOrder=lightCurvePolyOrder
+            polyOrder=lightCurvePolyOrder,
+            photometryEngine=allSettings.get(
+                "Synthetic photometry engine", "native"),
+            plot=programSettings.get("Generate Lightcurve Plots", True)
         )
         print "The lightcurve file can be found here: %(pathToOutputDirectory)stransient_light_curves.yaml" % locals()
-        print "The lightcurve plots can be found in %(pathToOutputPlotDirectory)s" % locals()
+        if programSettings.get("Generate Lightcurve Plots", True):
+            print "The lightcurve plots can be found in %(pathToOutputPlotDirectory)s" % locals()
 
     if programSettings['Generate KCorrection Database']:
         log.info('generating the kcorrection data')
-        dg.generate_kcorrection_listing_database(
+        listingFailures = dg.generate_kcorrection_listing_database(
             log,
             pathToOutputDirectory=pathToOutputDirectory,
             pathToSpectralDatabase=pathToSpectralDatabase,
@@ -183,9 +204,12 @@ def main(arguments=None):
             temporalResolution=kCorrectionTemporalResolution,
             redshiftResolution=redshiftResolution,
             redshiftLower=lowerRedshiftLimit,
-            redshiftUpper=upperRedshiftLimit + redshiftResolution)
+            redshiftUpper=upperRedshiftLimit + redshiftResolution,
+            photometryEngine=allSettings.get(
+                "Synthetic photometry engine", "native"),
+            numberOfWorkers=allSettings.get("K-correction workers", 1))
         log.info('generating the kcorrection polynomials')
-        dg.generate_kcorrection_polynomial_database(
+        polynomialFailures = dg.generate_kcorrection_polynomial_database(
             log,
             pathToOutputDirectory=pathToOutputDirectory,
             restFrameFilter=restFrameFilter,
@@ -194,13 +218,33 @@ def main(arguments=None):
             redshiftResolution=redshiftResolution,
             redshiftLower=lowerRedshiftLimit,
             redshiftUpper=upperRedshiftLimit + redshiftResolution,
-            plot=programSettings['Generate KCorrection Plots'])
+            plot=programSettings['Generate KCorrection Plots'],
+            numberOfWorkers=allSettings.get("K-correction workers", 1))
 
-        print "The k-correction database has been generated here: %(pathToOutputDirectory)sk_corrections" % locals()
+        print "The k-correction database has been generated here: %(pathToOutputDirectory)sk_corrections.db" % locals()
+        if listingFailures or polynomialFailures:
+            print "%s k-correction work units failed - see the summary in %s" % (len(listingFailures) + len(polynomialFailures), logFilePath)
         if programSettings['Generate KCorrection Plots']:
             print "The k-correction polynomial plots can also be found in %(pathToOutputDirectory)sk_corrections" % locals()
 
+    # BUILD (OR RELOAD) THE COSMOLOGY LOOKUP TABLE SHARED BY THE SIMULATION
+    # AND RESULTS STAGES
+    if programSettings['Run the Simulation'] or programSettings['Compile and Plot Results']:
+        log.info('building the cosmology lookup table')
+        cosmology = cosmology_table(
+            log=log,
+            upperRedshiftLimit=upperRedshiftLimit + redshiftResolution,
+            pathToOutputDirectory=pathToOutputDirectory
+        )
+
     if programSettings['Run the Simulation']:
+        # ONE INDEPENDENT, REPRODUCIBLE RANDOM STREAM PER SIMULATION STAGE
+        streams = random_streams(
+            log=log,
+            seed=allSettings.get("Random seed", None)
+        )
+        resultsDict['Random Seed'] = streams.seed
+
         # CREATE THE OBSERVABLE UNIVERSE!
         log.info('generating the redshift array')
         redshiftArray = u.random_redshift_array(
@@ -210,24 +254,29 @@ def main(arguments=None):
             upperRedshiftLimit,
             redshiftResolution=redshiftResolution,
             pathToOutputPlotDirectory=pathToOutputPlotDirectory,
-            plot=programSettings['Plot Simulation Helper Plots'])
+            plot=programSettings['Plot Simulation Helper Plots'],
+            cosmology=cosmology,
+            randomState=streams.stream("redshifts"))
         resultsDict['Redshifts'] = redshiftArray.tolist()
 
         log.info('generating the SN type array')
-        snTypesArray = u.random_sn_types_array(
+        snTypesArray, snTypeNames = u.random_sn_types_array(
             log,
             sampleNumber,
             relativeSNRates,
             pathToOutputPlotDirectory=pathToOutputPlotDirectory,
-            plot=programSettings['Plot Simulation Helper Plots'])
-        resultsDict['SN Types'] = snTypesArray.tolist()
+            plot=programSettings['Plot Simulation Helper Plots'],
+            randomState=streams.stream("sn types"))
+        resultsDict['SN Types'] = snTypeNames[snTypesArray].tolist()
 
         log.info('generating peak magnitudes for the SNe')
         peakMagnitudesArray = u.random_peak_magnitudes(
             log,
             peakMagnitudeDistributions,
             snTypesArray,
-            plot=programSettings['Plot Simulation Helper Plots'])
+            plot=programSettings['Plot Simulation Helper Plots'],
+            snTypeNames=snTypeNames,
+            randomState=streams.stream("peak magnitudes"))
 
         log.info('generating the SN host extictions array')
         hostExtinctionArray = u.random_host_extinction(
@@ -262,7 +311,9 @@ def main(arguments=None):
             snTypesArray,
             snLightCurves,
             pathToOutputDirectory=pathToOutputDirectory,
-            plot=programSettings['Plot Simulation Helper Plots'])
+            plot=programSettings['Plot Simulation Helper Plots'],
+            snTypeNames=snTypeNames,
+            restFrameFilter=restFrameFilter)
 
         log.info('generating the observed lightcurves for the SNe')
         observedFrameLightCurveInfo, peakAppMagList = u.convert_lightcurves_to_observered_frame(
@@ -279,35 +330,38 @@ def main(arguments=None):
             pathToOutputDirectory=pathToOutputDirectory,
             pathToOutputPlotDirectory=pathToOutputPlotDirectory,
             polyOrder=lightCurvePolyOrder,
-            plot=programSettings['Plot Simulation Helper Plots'])
-
-        log.info('generating the survey observation cadence')
-        cadenceDictionary = ss.survey_cadence_arrays(
-            log,
-            surveyCadenceSettings,
-            pathToOutputDirectory=pathToOutputDirectory,
-            pathToOutputPlotDirectory=pathToOutputPlotDirectory,
-            plot=programSettings['Plot Simulation Helper Plots'])
-
-        log.info('determining if the SNe are discoverable by the survey')
-        discoverableList = ss.determine_if_sne_are_discoverable(
-            log,
-            redshiftArray=redshiftArray,
-            limitingMags=limitingMags,
-            observedFrameLightCurveInfo=observedFrameLightCurveInfo,
-            pathToOutputDirectory=pathToOutputDirectory,
-            pathToOutputPlotDirectory=pathToOutputPlotDirectory,
-            plot=programSettings['Plot Simulation Helper Plots'])
-
-        log.info(
-            'determining the day (if and) when each SN is first discoverable by the survey')
-        ripeDayList = ss.determine_when_sne_are_ripe_for_discovery(
-            log,
-            redshiftArray=redshiftArray,
-            limitingMags=limitingMags,
-            discoverableList=discoverableList,
-            observedFrameLightCurveInfo=observedFrameLightCurveInfo,
-            plot=programSettings['Plot Simulation Helper Plots'])
+            plot=programSettings['Plot Simulation Helper Plots'],
+            cosmology=cosmology,
+            timeDilationMethod=allSettings.get(
+                "Lightcurve time dilation method", "analytic"),
+            snTypeNames=snTypeNames)
+
+        # THE CADENCE OF A REAL SURVEY IS READ FROM ITS OBSERVATION LOG,
+        # OTHERWISE IT IS SYNTHESISED FROM THE SETTINGS
+        surveyLength = surveyCadenceSettings.get("Survey Length (years)", 1)
+        limitingMagsPerEpoch = None
+        if surveyCadenceSettings.get("Observation Log", False):
+            log.info('reading the survey observation cadence from the log')
+            cadenceDictionary, limitingMagsPerEpoch, surveyLength = read_observation_log(
+                log,
+                pathToObservationLog=os.path.expanduser(
+                    surveyCadenceSettings["Observation Log"]),
+                bands=[f["band"] for f in surveyCadenceSettings["Filters"]])
+        else:
+            log.info('generating the survey observation cadence')
+            cadenceDictionary = ss.survey_cadence_arrays(
+                log,
+                surveyCadenceSettings,
+                pathToOutputDirectory=pathToOutputDirectory,
+                pathToOutputPlotDirectory=pathToOutputPlotDirectory,
+                plot=programSettings['Plot Simulation Helper Plots'],
+                randomState=streams.stream("survey cadence"))
+            limitingMagsPerEpoch = ss.survey_epoch_depths(
+                log,
+                cadenceDictionary=cadenceDictionary,
+                limitingMags=limitingMags,
+                surveyCadenceSettings=surveyCadenceSettings,
+                randomState=streams.stream("epoch depths"))
 
         # log.info('determining the day when each SN is disappears fainter than the survey limiting mags')
         # disappearDayList = determine_when_discovered_sne_disappear(
@@ -318,22 +372,34 @@ def main(arguments=None):
         #     observedFrameLightCurveInfo=observedFrameLightCurveInfo,
         #     plot=programSettings['Plot Simulation Helper Plots'])
 
-        log.info('determining if and when each SN is discovered by the survey')
-        lightCurveDiscoveryDayList, surveyDiscoveryDayList, snCampaignLengthList = ss.determine_if_sne_are_discovered(
+        # DISCOVERABLE, RIPE, DISCOVERED AND CAMPAIGN LENGTH IN A SINGLE
+        # CHUNKED PASS OVER THE SNE
+        log.info(
+            'determining if, when and for how long each SN is discovered by the survey')
+        discoveries = ss.determine_sn_discoveries(
             log,
+            redshiftArray=redshiftArray,
             limitingMags=limitingMags,
-            ripeDayList=ripeDayList,
             cadenceDictionary=cadenceDictionary,
             observedFrameLightCurveInfo=observedFrameLightCurveInfo,
-            extraSurveyConstraints=extraSurveyConstraints,
-            plot=programSettings['Plot Simulation Helper Plots'])
+            pathToOutputPlotDirectory=pathToOutputPlotDirectory,
+            plot=programSettings['Plot Simulation Helper Plots'],
+            randomState=streams.stream("discovery days"),
+            surveyLength=surveyLength,
+            limitingMagsPerEpoch=limitingMagsPerEpoch)
+        lightCurveDiscoveryDayList, surveyDiscoveryDayList, snCampaignLengthList = ss.discovery_lists(
+            log,
+            discoveries=discoveries)
 
         resultsDict[
             'Discoveries Relative to Peak Magnitudes'] = lightCurveDiscoveryDayList
         resultsDict[
             'Discoveries Relative to Survey Year'] = surveyDiscoveryDayList
         resultsDict['Campaign Length'] = snCampaignLengthList
-        resultsDict['Cadence Dictionary'] = cadenceDictionary
+        resultsDict['Cadence Dictionary'] = {}
+        for band, epochs in cadenceDictionary.iteritems():
+            resultsDict['Cadence Dictionary'][band] = np.asarray(
+                epochs).tolist()
         resultsDict['Peak Apparent Magnitudes'] = peakAppMagList
 
         now = datetime.now()
@@ -371,7 +437,8 @@ def main(arguments=None):
             peakAppMagList=peakAppMagList,
             snCampaignLengthList=snCampaignLengthList,
             extraSurveyConstraints=extraSurveyConstraints,
-            pathToOutputPlotFolder=pathToOutputPlotDirectory)
+            pathToOutputPlotFolder=pathToOutputPlotDirectory,
+            cosmology=cosmology)
         result_log += """
 ## Results ##
 
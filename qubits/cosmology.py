@@ -0,0 +1,217 @@
+#!/usr/local/bin/python
+# encoding: utf-8
+"""
+*A dense redshift-distance lookup table built once per simulation run and shared by the universe, datagenerator and results partials*
+
+:Author:
+    David Young
+
+:Date Created:
+    October 18, 2026
+"""
+################# GLOBAL IMPORTS ####################
+import os
+import numpy as np
+
+
+class cosmology_table():
+    """
+    *A dense redshift-distance lookup table built once per simulation run*
+
+    The numerical integration behind ``dryxPython.astrotools.convert_redshift_to_distance`` is run once for each point of a dense redshift grid. All subsequent distance, distance modulus and volume requests are served by (vectorised) linear interpolation of this table. The table runs from z = 0 to just beyond ``upperRedshiftLimit``; a request outside that range raises a ``ValueError`` rather than being clamped to the end of the table.
+
+    **Key Arguments:**
+        - ``log`` -- logger
+        - ``upperRedshiftLimit`` -- the highest redshift the table needs to cover
+        - ``pathToOutputDirectory`` -- persist the table in this directory (and reuse it on later runs). Default *False* (do not persist)
+        - ``redshiftStep`` -- the spacing of the table's redshift grid. Default *0.001*
+
+    **Usage:**
+
+        .. code-block:: python
+
+            from qubits.cosmology import cosmology_table
+            cosmo = cosmology_table(
+                log=log,
+                upperRedshiftLimit=1.0,
+                pathToOutputDirectory="/path/to/qubits_output"
+            )
+            dmod = cosmo.distance_modulus([0.1, 0.2, 0.3])
+    """
+    # Initialisation
+
+    def __init__(
+            self,
+            log,
+            upperRedshiftLimit,
+            pathToOutputDirectory=False,
+            redshiftStep=0.001
+    ):
+        self.log = log
+        log.debug("instansiating a new 'cosmology_table' object")
+        self.upperRedshiftLimit = float(upperRedshiftLimit)
+        self.pathToOutputDirectory = pathToOutputDirectory
+        self.redshiftStep = float(redshiftStep)
+
+        self.redshift = None
+        self.dl_mpc = None
+        self.dcmr_mpc = None
+
+        self._load_or_build_table()
+
+        return None
+
+    def luminosity_distance(
+            self,
+            redshift):
+        """
+        *the luminosity distance (Mpc) at the given redshift(s)*
+
+        **Key Arguments:**
+            - ``redshift`` -- a redshift or array of redshifts
+
+        **Return:**
+            - ``dl_mpc`` -- luminosity distance(s) in Mpc
+        """
+        self._check_range(redshift, self.redshift, "redshift")
+        return np.interp(redshift, self.redshift, self.dl_mpc)
+
+    def distance_modulus(
+            self,
+            redshift):
+        """
+        *the distance modulus at the given redshift(s)*
+
+        **Key Arguments:**
+            - ``redshift`` -- a redshift or array of redshifts (must be greater than zero)
+
+        **Return:**
+            - ``dmod`` -- distance modulus (or moduli)
+        """
+        return 5. * np.log10(self.luminosity_distance(redshift)) + 25.
+
+    def volume(
+            self,
+            redshift):
+        """
+        *the volume (Mpc^3) of the luminosity-distance sphere out to the given redshift(s) - this is the volume measure the simulation distributes transients within*
+
+        **Key Arguments:**
+            - ``redshift`` -- a redshift or array of redshifts
+
+        **Return:**
+            - ``volume`` -- volume(s) in Mpc^3
+        """
+        return (4. / 3.) * np.pi * self.luminosity_distance(redshift) ** 3
+
+    def comoving_volume(
+            self,
+            redshift):
+        """
+        *the comoving volume (Mpc^3) out to the given redshift(s)*
+
+        **Key Arguments:**
+            - ``redshift`` -- a redshift or array of redshifts
+
+        **Return:**
+            - ``volume`` -- comoving volume(s) in Mpc^3
+        """
+        self._check_range(redshift, self.redshift, "redshift")
+        dcmr_mpc = np.interp(redshift, self.redshift, self.dcmr_mpc)
+        return (4. / 3.) * np.pi * dcmr_mpc ** 3
+
+    def redshift_from_distance(
+            self,
+            dl_mpc):
+        """
+        *invert the table - the redshift(s) at the given luminosity distance(s)*
+
+        **Key Arguments:**
+            - ``dl_mpc`` -- a luminosity distance or array of luminosity distances (Mpc)
+
+        **Return:**
+            - ``redshift`` -- redshift(s)
+        """
+        self._check_range(dl_mpc, self.dl_mpc, "luminosity distance")
+        return np.interp(dl_mpc, self.dl_mpc, self.redshift)
+
+    def _check_range(
+            self,
+            values,
+            column,
+            quantity):
+        """
+        *raise a ValueError if any of the values fall outside a column of the table (np.interp would silently clamp them)*
+        """
+        values = np.asarray(values, dtype=float)
+        if values.size and (values.min() < column[0] or values.max() > column[-1]):
+            message = 'the %s range %s to %s falls outside the cosmology table (%s to %s) - build the table with a higher upperRedshiftLimit' % (
+                quantity, values.min(), values.max(), column[0], column[-1])
+            self.log.critical(message)
+            raise ValueError(message)
+        return None
+
+    def _load_or_build_table(
+            self):
+        """
+        *load a persisted table if it covers the redshift range requested, otherwise build (and persist) a new one*
+        """
+        self.log.debug('starting the ``_load_or_build_table`` method')
+
+        pathToTable = False
+        if self.pathToOutputDirectory:
+            pathToTable = self.pathToOutputDirectory + "/cosmology_table.npz"
+
+        if pathToTable and os.path.exists(pathToTable):
+            try:
+                table = np.load(pathToTable)
+                if float(table["redshiftStep"]) == self.redshiftStep and table["redshift"][-1] >= self.upperRedshiftLimit:
+                    self.redshift = table["redshift"]
+                    self.dl_mpc = table["dl_mpc"]
+                    self.dcmr_mpc = table["dcmr_mpc"]
+                    self.log.debug(
+                        'reusing the cosmology table found at %s' % (pathToTable,))
+                    return None
+            except Exception as e:
+                self.log.warning(
+                    "could not read the cosmology table %s - failed with this error: %s " % (pathToTable, str(e),))
+
+        self._build_table()
+
+        if pathToTable:
+            np.savez(
+                pathToTable,
+                redshift=self.redshift,
+                dl_mpc=self.dl_mpc,
+                dcmr_mpc=self.dcmr_mpc,
+                redshiftStep=self.redshiftStep)
+
+        self.log.debug('completed the ``_load_or_build_table`` method')
+        return None
+
+    def _build_table(
+            self):
+        """
+        *run the cosmology calculator once for every point of the redshift grid*
+        """
+        self.log.debug('starting the ``_build_table`` method')
+
+        import dryxPython.astrotools as da
+
+        # EXTEND ONE STEP BEYOND THE UPPER LIMIT SO THE LIMIT ITSELF IS
+        # ALWAYS INTERPOLATED, NEVER EXTRAPOLATED
+        tableLength = int(
+            np.ceil(self.upperRedshiftLimit / self.redshiftStep)) + 2
+        self.redshift = np.arange(tableLength) * self.redshiftStep
+        self.dl_mpc = np.zeros(tableLength)
+        self.dcmr_mpc = np.zeros(tableLength)
+
+        # z = 0 HAS ZERO DISTANCE -- DON'T ASK THE CALCULATOR FOR IT
+        for i in range(1, tableLength):
+            distanceDictionary = da.convert_redshift_to_distance(
+                self.redshift[i])
+            self.dl_mpc[i] = distanceDictionary["dl_mpc"]
+            self.dcmr_mpc[i] = distanceDictionary["dcmr_mpc"]
+
+        self.log.debug('completed the ``_build_table`` method')
+        return None
@@ -28,7 +28,7 @@ from .commonutils import *
 ###################################################################
 # PUBLIC FUNCTIONS                                                #
 ###################################################################
-# LAST MODIFIED : April 16, 2013
+# LAST MODIFIED : October 18, 2026
 # CREATED : April 16, 2013
 # AUTHOR : DRYX
 def generate_model_lightcurves(
@@ -38,11 +38,15 @@ def generate_model_lightcurves(
         pathToOutputPlotDirectory,
         explosionDaysFromSettings,
         extendLightCurveTail,
-        polyOrder
+        polyOrder,
+        photometryEngine="native",
+        plot=True
 ):
     """
     *Generate the lightcurve plots and polynomials by extracting the data from the provided spectra.*
 
+    The magnitudes of all of a model's spectra in every filter are measured together - one batched integration per wavelength grid the spectra share (see ``ab_photometry.magnitudes``). The lightcurves of every model and filter are extracted first and then fitted together - once to find the peak of each lightcurve and again once the times are normalised to that peak - each time with a single batched least-squares solve (see ``fit_lightcurve_polynomials``). The plots are rendered last, and only if requested.
+
     **Key Arguments:**
         - ``log`` -- logger
         - ``pathToSpectralDatabase`` -- path to the nested-folders and files spectral database (provided by the user)
@@ -51,134 +55,111 @@ def generate_model_lightcurves(
         - ``explosionDaysFromSettings`` -- explosion days for transients as set by the user in the settings file
         - ``extendLightCurveTail`` -- extend the tail of the lightcurve by extrapolating last two data points
         - ``polyOrder`` -- order of the polynomial used to fit the lightcurve
+        - ``photometryEngine`` -- the synthetic photometry engine, ``native`` or ``pysynphot``. Default *native*
+        - ``plot`` -- render a plot of each lightcurve and its polynomial? Default *True*
 
     **Return:**
         - None
     """
     ################ > IMPORTS ################
     ## STANDARD LIB ##
-    import glob
-    import os
     ## THIRD PARTY ##
     import yaml
     ## LOCAL APPLICATION ##
+    from .spectra import spectral_cache
+    from .photometry import ab_photometry, bandpass_cache_info
 
     ################ >ACTION(S) ################
-    # WRITE CODE HERE
-    pwd = os.getcwd()
-    pathToSpectralDatabase
-
-    spectralDatabase = {}
+    # EACH SPECTRUM IS PARSED ONCE AND REUSED FOR ALL FILTERS
+    spectra = spectral_cache(
+        log=log,
+        pathToSpectralDatabase=pathToSpectralDatabase
+    )
+    photometry = ab_photometry(
+        log=log,
+        engine=photometryEngine
+    )
 
-    basePath = pathToSpectralDatabase
-    for d in os.listdir(basePath):
-        if os.path.isdir(os.path.join(basePath, d)):
-            spectralDatabase[d] = os.path.join(basePath, d) + "/"
-
-    # spectralDatabase = {"he130": he130}
     filters = ['g', 'r', 'i', 'z']
-    # filters = ['g']
 
+    # EXTRACT THE LIGHTCURVES OF EVERY MODEL AND FILTER FROM THE SPECTRA
     extractedLightCurveDict = {}
-    for model, path in spectralDatabase.iteritems():
-        extractedLightCurveDict[model] = {}
-        os.chdir(path)
-        spectrumFiles = []
-        for thisFile in glob.glob("*.spec"):
-            thisFile = path + thisFile
-            spectrumFiles.append(thisFile)
+    lightCurves = []
+    obsmodes = []
+    for ffilter in filters:
+        if ffilter in ["g", "r", "i", "z"]:
+            obsmodes.append("sdss,%s" % (ffilter,))
+        else:
+            obsmodes.append(ffilter)
 
-        os.chdir(pwd)
+    for model in spectra.models():
+        extractedLightCurveDict[model] = {}
+        spectrumFiles = spectra.spectrum_files(model)
+        measuredMagnitudes = _spectra_magnitudes(
+            log,
+            spectrumFiles=spectrumFiles,
+            obsmodes=obsmodes,
+            spectralCache=spectra,
+            photometry=photometry)
 
-        # LIGHTCURVES PLOTTING CODE
-        peakDict = {}
-        for ffilter in filters:
+        for ffilter, obsmode in zip(filters, obsmodes):
             extractedLightCurveDict[model][ffilter] = {}
-            title = "%s - %s-band" % (model, ffilter)
-            # EXTRACT LIGHTCURVES FROM SPECTRA
-
-            if ffilter in ["g", "r", "i", "z"]:
-                obsmode = "sdss,%s" % (ffilter,)
-            else:
-                obsmode = ffilter
 
             magnitudes, times = extract_lightcurve(
                 log,
                 spectrumFiles,
                 userExplosionDay=explosionDaysFromSettings[model],
                 extendLightCurveTail=extendLightCurveTail[model],
-                obsmode=obsmode
-            )
-
-            filterDict = {}
-
-            # CREATE A FIRST POLY LIGHTCURVE TO EXTRACT MAX PEAK AND TIME
-            lightCurveList = [
-                [magnitudes, times, '%s-band data' % (ffilter,), ffilter, model, title], ]
-            curveDict = plotLightCurves(
-                log,
-                lightCurves=lightCurveList,
-                polyOrder=polyOrder,
-                pathToOutputDirectory=pathToOutputPlotDirectory
+                obsmode=obsmode,
+                spectralCache=spectra,
+                photometry=photometry,
+                measuredMagnitudes=measuredMagnitudes[obsmode]
             )
+            lightCurves.append((model, ffilter, magnitudes, times))
 
-            # log.debug('lightCurveList: %s' % (lightCurveList,))
-
-            wavelengthArray, fluxArray = extract_spectra_from_file(
-                log, pathToSpectrum=thisFile)
-            for k, v in curveDict.iteritems():
-                poly = v
+    # FIT A FIRST POLY LIGHTCURVE TO EXTRACT MAX PEAK AND TIME
+    polys = fit_lightcurve_polynomials(
+        log,
+        lightCurves=[(magnitudes, times)
+                     for model, ffilter, magnitudes, times in lightCurves],
+        polyOrder=polyOrder
+    )
 
-                if poly is None:
-                    log.warning(
-                        'could not generate a polynomial for %s in %s-band - enough data could not be extracted from spectra' % (model, ffilter))
-                    continue
-                start = int(min(times))
-                end = int(max(times))
-                log.debug('times: %s' % (times,))
-                log.debug('model, start, end: %s, %s, %s' %
-                          (model, start, end,))
-
-                if poly is not None:
-                    peakMag, peakTime, explosionMag, explosionDay = find_peak_magnitude(
-                        log,
-                        poly=poly,
-                        model=model,
-                        start=int(min(times)),
-                        end=int(max(times))
-                    )
-                else:
-                    peakMag, peakTime, explosionMag, explosionDay = None, None, None, None
-
-                if peakTime is not None:
-                    extractedLightCurveDict[model][
-                        ffilter]['Peak Magnitude'] = peakMag
-                    extractedLightCurveDict[model][ffilter][
-                        'Peak Time in Spectra'] = peakTime
-                    extractedLightCurveDict[model][ffilter][
-                        'Explosion Day Relative to Peak'] = - peakTime + explosionDay
-                    for i in range(len(times)):
-                        times[i] = times[i] - peakTime
-                else:
-                    extractedLightCurveDict[model][
-                        ffilter]['Peak Magnitude'] = None
-                    extractedLightCurveDict[model][
-                        ffilter]['Peak Time in Spectra'] = None
-                    extractedLightCurveDict[model][ffilter][
-                        'Explosion Day Relative to Peak'] = None
-
-            # CREATE A SECOND POLY LIGHTCURVE NORMALISED TO PEAK MAG AND TIME
-            lightCurveList = [
-                [magnitudes, times, '%s-band data' % (ffilter,), ffilter, model, title], ]
-            curveDict = plotLightCurves(
-                log,
-                lightCurves=lightCurveList,
-                polyOrder=polyOrder,
-                pathToOutputDirectory=pathToOutputPlotDirectory
-            )
+    for (model, ffilter, magnitudes, times), poly in zip(lightCurves, polys):
+        if poly is None:
+            log.warning(
+                'could not generate a polynomial for %s in %s-band - enough data could not be extracted from spectra' % (model, ffilter))
+            continue
+        log.debug('times: %s' % (times,))
+        log.debug('model, start, end: %s, %s, %s' %
+                  (model, int(min(times)), int(max(times)),))
 
-            for k, v in curveDict.iteritems():
-                extractedLightCurveDict[model][ffilter][k] = v
+        peakMag, peakTime, explosionMag, explosionDay = find_peak_magnitude(
+            log,
+            poly=poly,
+            model=model,
+            start=int(min(times)),
+            end=int(max(times))
+        )
+
+        extractedLightCurveDict[model][
+            ffilter]['Peak Magnitude'] = peakMag
+        extractedLightCurveDict[model][ffilter][
+            'Peak Time in Spectra'] = peakTime
+        extractedLightCurveDict[model][ffilter][
+            'Explosion Day Relative to Peak'] = - peakTime + explosionDay
+        for i in range(len(times)):
+            times[i] = times[i] - peakTime
+
+    # FIT A SECOND POLY LIGHTCURVE NORMALISED TO PEAK MAG AND TIME
+    polys = fit_lightcurve_polynomials(
+        log,
+        lightCurves=[(magnitudes, times)
+                     for model, ffilter, magnitudes, times in lightCurves],
+        polyOrder=polyOrder
+    )
+    for (model, ffilter, magnitudes, times), poly in zip(lightCurves, polys):
+        extractedLightCurveDict[model][ffilter]['poly'] = poly
 
     yamlDict = extractedLightCurveDict
     fileName = pathToOutputDirectory + "/transient_light_curves.yaml"
@@ -186,6 +167,22 @@ def generate_model_lightcurves(
     yaml.dump(yamlDict, stream, default_flow_style=False)
     stream.close()
 
+    log.info('bandpass cache: %(hits)s hits, %(misses)s misses' %
+             bandpass_cache_info())
+
+    # RENDER THE PLOTS ONCE ALL THE FITTING IS DONE
+    if plot:
+        for (model, ffilter, magnitudes, times), poly in zip(lightCurves, polys):
+            title = "%s - %s-band" % (model, ffilter)
+            plotLightCurves(
+                log,
+                lightCurves=[
+                    [magnitudes, times, '%s-band data' % (ffilter,), ffilter, model, title], ],
+                polyOrder=polyOrder,
+                pathToOutputDirectory=pathToOutputPlotDirectory,
+                polys=[poly]
+            )
+
     return extractedLightCurveDict
 
 
@@ -270,11 +267,11 @@ def plot_filter_transmissions(log, filterList):
     return
 
 
-# LAST MODIFIED : March 24, 2013
+# LAST MODIFIED : October 18, 2026
 # CREATED : March 24, 2013
 # AUTHOR : dryx
 # def calcphot(log, spectrum, filter):
-def calcphot(log, wavelengthArray, fluxArray, obsmode, extrapolate=False):
+def calcphot(log, wavelengthArray, fluxArray, obsmode, extrapolate=False, photometry=None):
     """
     *Run calcphot on single spectrum and filter.*
 
@@ -284,15 +281,25 @@ def calcphot(log, wavelengthArray, fluxArray, obsmode, extrapolate=False):
         - ``fluxArray`` -- the array contain the respective spectrum flux (as function of wavelength)
         - ``obsmode`` -- the observation mode (generally a filter system and filter type, e.g. "sdss,g")
         - ``extrapolate`` -- extrapolate spectra in database to cover the requested band-pass. Default *False*.
+        - ``photometry`` -- an ``ab_photometry`` engine to measure the magnitude with. Default *None* (use pysynphot directly)
 
     **Return:**
-        - None
+        - ``abMag`` -- the AB magnitude of the spectrum in the given band
     """
     ################ > IMPORTS ################
     ## STANDARD LIB ##
     ## THIRD PARTY ##
     import pysynphot as syn
     ## LOCAL APPLICATION ##
+    from .photometry import obs_bandpass
+
+    if photometry:
+        return photometry.magnitude(
+            wavelengthArray,
+            fluxArray,
+            obsmode=obsmode,
+            extrapolate=extrapolate
+        )
 
     if extrapolate:
         force = "extrapolate"
@@ -303,21 +310,87 @@ def calcphot(log, wavelengthArray, fluxArray, obsmode, extrapolate=False):
     # Read in a spectrum from a file
     sp = syn.ArraySpectrum(
         wave=wavelengthArray, flux=fluxArray, waveunits='angstrom', fluxunits='flam')
-    bp = syn.ObsBandpass(obsmode)
+    # THE BANDPASS IS BUILT ONCE PER PROCESS AND SHARED
+    bp = obs_bandpass(obsmode)
     obs = syn.Observation(sp, bp, force=force)
     abMag = obs.effstim('abmag')
 
     return abMag
 
 
-# LAST MODIFIED : March 25, 2013
+# LAST MODIFIED : October 18, 2026
+# CREATED : October 18, 2026
+# AUTHOR : DRYX
+def fit_lightcurve_polynomials(
+        log,
+        lightCurves,
+        polyOrder):
+    """
+    *fit a polynomial to each of a list of lightcurves with one batched least-squares solve*
+
+    Each lightcurve's Vandermonde design matrix is column-scaled exactly as ``np.polyfit`` does and zero-padded to the length of the longest lightcurve (a zero row adds nothing to a least-squares problem), so that every fit is solved at once with a single stacked SVD. The coefficients are the same as those ``np.polyfit`` returns for each lightcurve on its own.
+
+    **Key Arguments:**
+        - ``log`` -- logger
+        - ``lightCurves`` -- list of (magnitudes, times) pairs
+        - ``polyOrder`` -- order of polynomial used to fit the model lightcurves extracted from spectra
+
+    **Return:**
+        - ``polys`` -- list of the polynomial coefficients (highest power first) of each lightcurve, or *None* for lightcurves with fewer than 5 points
+    """
+    ################ > IMPORTS ################
+    ## STANDARD LIB ##
+    ## THIRD PARTY ##
+    import numpy as np
+    ## LOCAL APPLICATION ##
+
+    ################ >ACTION(S) ################
+    polys = [None] * len(lightCurves)
+
+    # CAUSE LIGHTCURVE GENERATION TO FAIL IF LESS THAN 5 POINTS EXTRACTED
+    # FROM THE SPECTRA
+    fitted = [i for i, (magnitudes, times) in enumerate(
+        lightCurves) if len(times) > 4]
+    if not len(fitted):
+        return polys
+
+    # STACK THE ZERO-PADDED DESIGN MATRICES AND MAGNITUDES
+    nPoints = np.array([len(lightCurves[i][1]) for i in fitted])
+    designMatrix = np.zeros((len(fitted), nPoints.max(), polyOrder + 1))
+    magnitudes = np.zeros((len(fitted), nPoints.max()))
+    for row, i in enumerate(fitted):
+        y, x = lightCurves[i]
+        designMatrix[row, :len(x)] = np.vander(
+            np.asarray(x, dtype=float), polyOrder + 1)
+        magnitudes[row, :len(y)] = y
+    scale = np.sqrt((designMatrix * designMatrix).sum(axis=1))
+    scale[scale == 0.] = 1.
+    designMatrix /= scale[:, np.newaxis, :]
+
+    # SOLVE EVERY FIT AT ONCE, DROPPING SINGULAR VALUES BELOW np.polyfit'S
+    # DEFAULT CUTOFF
+    u, singularValues, vt = np.linalg.svd(designMatrix, full_matrices=False)
+    cutoff = nPoints * np.finfo(float).eps * singularValues.max(axis=1)
+    keep = singularValues > cutoff[:, np.newaxis]
+    inverseValues = np.where(keep, 1. / np.where(keep, singularValues, 1.), 0.)
+    projection = np.einsum("kni,kn->ki", u, magnitudes) * inverseValues
+    coefficients = np.einsum("kij,ki->kj", vt, projection) / scale
+
+    for row, i in enumerate(fitted):
+        polys[i] = coefficients[row].copy()
+
+    return polys
+
+
+# LAST MODIFIED : October 18, 2026
 # CREATED : March 25, 2013
 # AUTHOR : DRYX
 def plotLightCurves(
         log,
         lightCurves,
         polyOrder,
-        pathToOutputDirectory):
+        pathToOutputDirectory,
+        polys=None):
     """
     *plot lightcurve(s) given an list of magnitude, time pairs*
 
@@ -326,9 +399,10 @@ def plotLightCurves(
         - ``lightCurves`` -- list of magnitude, time numPy arrays
         - ``polyOrder`` -- order of polynomial used to fit the model lightcurves extracted from spectra
         - ``pathToOutputDirectory`` -- path to the output directory
+        - ``polys`` -- the polynomial coefficients already fitted to each lightcurve (see ``fit_lightcurve_polynomials``). Default *None* (fit them here)
 
     **Return:**
-        - None
+        - ``curveDict`` -- dictionary holding the ``poly`` of the last lightcurve
     """
     ################ > IMPORTS ################
     ## STANDARD LIB ##
@@ -337,35 +411,26 @@ def plotLightCurves(
     import numpy as np
     ## LOCAL APPLICATION ##
 
-    resultsDict = {}
     ################ > VARIABLE SETTINGS ######
+    if polys is None:
+        polys = fit_lightcurve_polynomials(
+            log,
+            lightCurves=[(curve[0], curve[1]) for curve in lightCurves],
+            polyOrder=polyOrder
+        )
+
     ################ >ACTION(S) ################
     ax = plt.subplot(111)
     curveDict = {}
-    for curve in lightCurves:
+    for curve, poly in zip(lightCurves, polys):
         x = curve[1]
         y = curve[0]
 
-        # CAUSE LIGHTCURVE GENERATION TO FAIL IF LESS THAN 5 POINTS EXTRACTED
-        # FROM THE SPECTRA
-        if len(x) <= 4:
-            curveDict['poly'] = None
+        curveDict['poly'] = poly
+        if poly is None:
             continue
 
-        order = polyOrder
-        poly = np.polyfit(x, y, order)
-        curveDict['poly'] = poly
         pOrder = np.poly1d(poly)
-        polyString = "mxxx[i] = "
-        polyStringMd = "\\\\(mag = "
-        for i in range(0, order + 1):
-            if i > 0 and poly[i] > 0:
-                polyString += "+"
-                polyStringMd += "+"
-            polyString += """%s*pow(i,%s) """ % (poly[i], order - i)
-            polyStringMd += """%s*time^{%s} """ % (poly[i], order - i)
-        polyStringMd += "\\\\)"
-
         xp = np.arange(int(min(x)), int(max(x)), 0.2)
         ax.plot(x, y, '.', xp, pOrder(xp), '--')
 
@@ -383,15 +448,13 @@ def plotLightCurves(
     ax.invert_yaxis()
 
     fileName = pathToOutputDirectory + title.replace(" ", "_") + ".png"
-    # mdPlotLink = """![%s_plot]\n\n[%s_plot]: %s\n\n""" % (title.replace(" ", "_"), title.replace(" ", "_"), fileName,)
-    # curveDict['mdLink'] = mdPlotLink
     plt.savefig(fileName)
     plt.clf()  # clear figure
 
     return curveDict
 
 
-# LAST MODIFIED : March 25, 2013
+# LAST MODIFIED : October 18, 2026
 # CREATED : March 25, 2013
 # AUTHOR : DRYX
 def extract_lightcurve(
@@ -399,7 +462,10 @@ def extract_lightcurve(
         spectrumFiles,
         userExplosionDay,
         extendLightCurveTail,
-        obsmode):
+        obsmode,
+        spectralCache=None,
+        photometry=None,
+        measuredMagnitudes=None):
     """
     *Extract the requested lightcurve from list of spectrum files*
 
@@ -409,6 +475,9 @@ def extract_lightcurve(
         - ``userExplosionDay`` -- explosion day for transient as set by the user in the settings file
         - ``extendLightCurveTail`` -- extend the tail of the lightcurve by extrapolating last two data points
         - ``obsmode`` -- the observation mode (generally a filter system and filter type, e.g. "sdss,g")
+        - ``spectralCache`` -- a ``spectral_cache`` to read the spectra through. Default *None* (parse the files directly)
+        - ``photometry`` -- an ``ab_photometry`` engine to measure the magnitudes with. Default *None* (use pysynphot directly)
+        - ``measuredMagnitudes`` -- dictionary of { spectrumFile : magnitude } already measured in this filter (NaN where it could not be measured). Default *None* (measure each spectrum here)
 
     **Return:**
         - ``magnitudes`` -- numpy array of the magnitudes
@@ -437,14 +506,29 @@ def extract_lightcurve(
         thisTime = float(reTime.search(thisFile).group(1))
         fileNameTimes.append(thisTime)
         log.debug('time in %s is: %s' % (thisFile, thisTime))
-        wavelengthArray, fluxArray = extract_spectra_from_file(log, thisFile)
+        if measuredMagnitudes is not None:
+            thisMag = measuredMagnitudes[thisFile]
+            if thisMag != thisMag:
+                log.warning(
+                    "could not find the magnitude from spectrum %s using the filter %s" %
+                    (thisFile, obsmode,))
+                continue
+            magnitudes.append(thisMag)
+            times.append(thisTime)
+            continue
+        if spectralCache:
+            wavelengthArray, fluxArray = spectralCache.read(thisFile)
+        else:
+            wavelengthArray, fluxArray = extract_spectra_from_file(
+                log, thisFile)
         try:
             log.debug("attempting to find the magnitude from spectrum")
             thisMag = calcphot(
                 log,
                 wavelengthArray=wavelengthArray,
                 fluxArray=fluxArray,
-                obsmode=obsmode
+                obsmode=obsmode,
+                photometry=photometry
             )
             magnitudes.append(thisMag)
             times.append(thisTime)
@@ -525,7 +609,7 @@ def extract_lightcurve(
     return magnitudes, times
 
 
-# LAST MODIFIED : March 25, 2013
+# LAST MODIFIED : October 18, 2026
 # CREATED : March 25, 2013
 # AUTHOR : DRYX
 def find_peak_magnitude(
@@ -537,6 +621,8 @@ def find_peak_magnitude(
     """
     *Determine peakMag and time from an initial polynomial lightcurve*
 
+    The peak is found in closed form from the real roots of the polynomial's derivative that fall between ``start`` and ``end`` (and the two ends themselves), so the peak time is exact rather than quantised to a time grid. A dense grid is searched only if the roots cannot be found.
+
     **Key Arguments:**
         - ``log`` -- logger
         - ``poly`` -- initial polynomial lightcurve
@@ -547,6 +633,8 @@ def find_peak_magnitude(
     **Return:**
         - ``peakMag``
         - ``peakTime``
+        - ``explosionMag`` -- the magnitude at ``start``
+        - ``explosionDay`` -- ``start``
     """
     ################ > IMPORTS ################
     ## STANDARD LIB ##
@@ -557,40 +645,44 @@ def find_peak_magnitude(
     ################ > VARIABLE SETTINGS ######
 
     ################ >ACTION(S) ################
-    timeList = []
-    magnitudeList = []
-
-    # wavelengthArray, fluxArray, minWl, maxWl = extract_spectra_from_file(log, thisFile)
-    for time in range(start * 5, end * 5, 1):
-        time = time / 5.
-        thisTime = time
-        flatPoly = np.poly1d(poly)
-        magnitude = flatPoly(thisTime)
-        timeList.append(thisTime)
-        magnitudeList.append(magnitude)
-
-    magnitudeArray = np.array(magnitudeList)
-    timeArray = np.array(timeList)
-    magIndexMin = magnitudeArray.argmin()
-    magIndexMax = magnitudeArray.argmax()
-    timeIndexMin = timeArray.argmin()
-    timeIndexMax = timeArray.argmax()
-
-    peakMag = float(magnitudeArray[magIndexMin])
-    peakTime = float(timeList[magIndexMin])
-
-    explosionMag = float(magnitudeArray[timeIndexMin])
-    explosionDay = float(timeList[timeIndexMin])
+    flatPoly = np.poly1d(poly)
+    start = float(start)
+    end = float(end)
+
+    # THE PEAK (MINIMUM MAGNITUDE) IS AT A REAL ROOT OF THE DERIVATIVE WITHIN
+    # THE SPECTRAL TIME RANGE, OR AT ONE OF ITS ENDS
+    candidateTimes = np.array([start, end])
+    try:
+        roots = flatPoly.deriv().roots
+        realRoots = roots.real[np.abs(roots.imag) <=
+                               1e-8 * np.maximum(1., np.abs(roots.real))]
+        inRange = realRoots[(realRoots >= start) & (realRoots <= end)]
+        candidateTimes = np.append(candidateTimes, inRange)
+    except Exception as e:
+        # FALL BACK TO A DENSE GRID
+        log.warning(
+            'could not solve for the turning points of the %s lightcurve - searching a dense grid instead. Failed with this error: %s' % (model, str(e),))
+        candidateTimes = np.append(
+            candidateTimes, np.linspace(start, end, 10001))
+    candidateMags = flatPoly(candidateTimes)
+    if not np.all(np.isfinite(candidateMags)):
+        candidateTimes = np.linspace(start, end, 10001)
+        candidateMags = flatPoly(candidateTimes)
+
+    peakIndex = np.nanargmin(candidateMags)
+    peakMag = float(candidateMags[peakIndex])
+    peakTime = float(candidateTimes[peakIndex])
+
+    explosionMag = float(flatPoly(start))
+    explosionDay = start
 
     log.debug('start, end: %s, %s' % (start, end,))
-    log.debug('timeList: %s' % (timeList,))
-    log.debug('magnitudeArray: %s' % (magnitudeArray,))
     log.info(
         'MODEL: %s ... peakMag %s, peakTime %s, explosionMag %s, explosionDay %s' %
         (model, peakMag, peakTime, explosionMag, explosionDay))
     return peakMag, peakTime, explosionMag, explosionDay
 
-# LAST MODIFIED : March 25, 2013
+# LAST MODIFIED : October 18, 2026
 # CREATED : March 25, 2013
 # AUTHOR : DRYX
 
@@ -603,10 +695,14 @@ def generate_kcorrection_listing_database(
         temporalResolution=4.0,
         redshiftResolution=0.1,
         redshiftLower=0.0,
-        redshiftUpper=1.0):
+        redshiftUpper=1.0,
+        photometryEngine="native",
+        numberOfWorkers=1):
     """
     *Generate the Kg* k-corrections for a range of redshifts given a list of spectra*
 
+    The inputs of every (model, redshift) listing (the model's spectrum files, its peak time, the rest frame filter, the temporal resolution and the photometry engine) are recorded in the k-correction store. Listings whose inputs are unchanged since the last run are skipped, so adding a model or widening the redshift range only computes the new units.
+
     **Key Arguments:**
         - ``log`` -- logger
         - ``restFrameFilter`` -- the filter to generate the K-corrections against
@@ -616,20 +712,24 @@ def generate_kcorrection_listing_database(
         - ``redshiftResolution`` -- resolution of the k-correction database (at what redshift points do you want the k-corrections calculated)
         - ``redshiftLower`` -- lower redshift in range of k-corrections to be calculated
         - ``redshiftUpper`` -- upper redshift in range of k-corrections to be calculated
+        - ``photometryEngine`` -- the synthetic photometry engine, ``native`` or ``pysynphot``. Default *native*
+        - ``numberOfWorkers`` -- the number of processes to spread the (model, redshift) listings across. 0 uses every core. Default *1* (serial)
 
     **Return:**
-        - None
+        - ``failures`` -- list of the (model, redshift) work units that failed, with their errors
     """
     ################ > IMPORTS ################
 
     ## STANDARD LIB ##
     import re
     import os
-    import shutil
     ## THIRD PARTY ##
-    import pysynphot as syn
     import yaml
     ## LOCAL APPLICATION ##
+    from .photometry import bandpass_cache_info
+    from .workers import run_work_units
+    from .kcorrections import kcorrection_store
+    from .spectra import spectral_cache
 
     mul = 10000
     div = 10000.
@@ -638,30 +738,68 @@ def generate_kcorrection_listing_database(
     stream = file(fileName, 'r')
     generatedLCs = yaml.load(stream)
 
-    # REMOVE OLD DATABASE
-    try:
-        shutil.rmtree(pathToOutputDirectory + "/k_corrections")
-    except:
-        pass
-
+    # THE INPUTS OF EACH MODEL'S LISTINGS AND WHAT WAS USED LAST TIME
+    spectra = spectral_cache(
+        log=log,
+        pathToSpectralDatabase=pathToSpectralDatabase
+    )
+    store = kcorrection_store(
+        log=log,
+        pathToDatabase=pathToOutputDirectory + "/k_corrections.db"
+    )
+    # THE STORE ONLY EVER HOLDS THE K-CORRECTIONS OF ONE REST FRAME FILTER
+    removed = store.remove_other_rest_filters(restFrameFilter)
+    if removed:
+        log.info('removed %s k-correction rows anchored to a rest frame filter other than %s' %
+                 (removed, restFrameFilter,))
+    previousDigests = store.digests("listing")
+    store.close()
+
+    # EACH (MODEL, REDSHIFT) LISTING IS AN INDEPENDENT UNIT OF WORK WRITING
+    # ITS OWN ROWS OF THE K-CORRECTION STORE
+    workUnits = []
+    skipped = 0
     models = generatedLCs.keys()
     for model in models:
+        digest = _input_digest(
+            spectra.model_digest(model),
+            generatedLCs[model][restFrameFilter]['Peak Time in Spectra'],
+            restFrameFilter,
+            temporalResolution,
+            photometryEngine)
 
         for redshift in range(int(redshiftLower * mul), int(redshiftUpper * mul), int(redshiftResolution * mul)):
             redshift = redshift / div
-
-            generate_single_kcorrection_listing(
-                log,
-                pathToOutputDirectory=pathToOutputDirectory,
-                pathToSpectralDatabase=pathToSpectralDatabase,
-                model=model,
-                redshift=redshift,
-                restFrameFilter=restFrameFilter,
-                temporalResolution=temporalResolution)
-    return
-
-
-# LAST MODIFIED : April 15, 2013
+            if previousDigests.get((model, "%0.3f" % (redshift,))) == digest:
+                skipped += 1
+                continue
+            workUnits.append(
+                {"model": model, "redshift": redshift, "digest": digest})
+
+    log.info('%s k-correction listings are up-to-date and will be skipped' %
+             (skipped,))
+
+    failures = run_work_units(
+        log=log,
+        function=_kcorrection_listing_unit,
+        workUnits=workUnits,
+        commonArguments={
+            "pathToOutputDirectory": pathToOutputDirectory,
+            "pathToSpectralDatabase": pathToSpectralDatabase,
+            "restFrameFilter": restFrameFilter,
+            "temporalResolution": temporalResolution,
+            "photometryEngine": photometryEngine
+        },
+        numberOfWorkers=numberOfWorkers,
+        description="k-correction listings"
+    )
+
+    log.info('bandpass cache: %(hits)s hits, %(misses)s misses' %
+             bandpass_cache_info())
+    return failures
+
+
+# LAST MODIFIED : October 18, 2026
 # CREATED : April 15, 2013
 # AUTHOR : DRYX
 def generate_single_kcorrection_listing(
@@ -671,7 +809,10 @@ def generate_single_kcorrection_listing(
         model,
         restFrameFilter,
         redshift,
-        temporalResolution=4.0):
+        temporalResolution=4.0,
+        spectralCache=None,
+        photometry=None,
+        kCorrectionStore=None):
     """
     *Given a redshift generate a dictionary of k-correction polynomials for the MCS.*
 
@@ -683,20 +824,24 @@ def generate_single_kcorrection_listing(
         - ``restFrameFilter`` -- the filter to generate the K-corrections against
         - ``redshift`` -- the redshift at which to generate the k-corrections for
         - ``temporalResolution`` -- temporal resolution at which to calculate the k-correcions
+        - ``spectralCache`` -- a ``spectral_cache`` to read the spectra through. Default *None* (parse the model's spectra for this call only)
+        - ``photometry`` -- an ``ab_photometry`` engine to measure the magnitudes with. Default *None* (use pysynphot)
+        - ``kCorrectionStore`` -- the ``kcorrection_store`` to write the listing to. Default *None* (open ``k_corrections.db`` in the output directory)
 
     **Return:**
         - None
     """
     ################ > IMPORTS ################
     ## STANDARD LIB ##
-    import re
     import os
-    import glob
 
     ## THIRD PARTY ##
     import yaml
-    import pysynphot as syn
+    import numpy as np
     ## LOCAL APPLICATION ##
+    from .spectra import spectral_cache
+    from .photometry import ab_photometry
+    from .kcorrections import kcorrection_store
 
     ################ >ACTION(S) ################
     # GET THE PEAK MAGNITUDE DETAILS FROM YAML FILE
@@ -708,59 +853,31 @@ def generate_single_kcorrection_listing(
     peakTime = generatedLCs[model][restFrameFilter]['Peak Time in Spectra']
     stream.close()
 
-    pwd = os.getcwd()
-    path = pathToSpectralDatabase + "/" + model + "/"
-
+    if not spectralCache:
+        spectralCache = spectral_cache(
+            log=log,
+            pathToSpectralDatabase=pathToSpectralDatabase
+        )
+    if not photometry:
+        photometry = ab_photometry(
+            log=log,
+            engine="pysynphot"
+        )
+    if not kCorrectionStore:
+        kCorrectionStore = kcorrection_store(
+            log=log,
+            pathToDatabase=pathToOutputDirectory + "/k_corrections.db"
+        )
     title = "%s Objects" % (model,)
-    os.chdir(path)
-    spectrumFiles = []
-    for thisFile in glob.glob("*.spec"):
-
-        thisFile = path + thisFile
-        spectrumFiles.append(thisFile)
-
-    os.chdir(pwd)
-
-    ################ > VARIABLE SETTINGS ######
-    reTime = re.compile(r't((\+|\-)\d{3}\.\d{2})')
 
     ################ >ACTION(S) ################
-    # CREATE THE REQUIRED DIRECTORIES
     filters = ["g", "i", "r", "z"]
 
-    for thisFilter in filters:
-        strRed = "%0.3f" % (redshift,)
-        try:
-            log.debug("attempting to create directories")
-            dataDir = pathToOutputDirectory + \
-                "/k_corrections/%s/%s" % (model, thisFilter)
-            os.makedirs(dataDir)
-        except Exception as e:
-            log.debug(
-                "could not create directories - failed with this error: %s " % (str(e),))
-
-        try:
-            log.debug("attempting to clear the k-correction yaml file")
-            fileName = dataDir + "/z" + \
-                str(strRed).replace(".", "pt") + ".yaml"
-            stream = file(fileName, 'w')
-            stream.close()
-        except Exception as e:
-            log.critical(
-                "could not clear the k-correction yaml file - failed with this error: %s " % (str(e),))
-            return -1
-
-    timesList = []
-    fileDictionary = {}
-    for thisFile in spectrumFiles:
-        thisTime = float(reTime.search(thisFile).group(1))
-        fileDictionary[thisTime] = thisFile
-
-    import collections
-    ofileDictionary = collections.OrderedDict(sorted(fileDictionary.items()))
-
+    # THE LISTING IS COLLECTED IN MEMORY AND WRITTEN TO THE STORE IN ONE GO
+    listingRows = []
     nextTime = -999999999.9
-    for thisTime, thisFile in ofileDictionary.iteritems():
+    for thisTime, (wavelengthArray, fluxArray) in spectralCache.model_spectra(model).iteritems():
+        thisFile = "%s spectrum at t%+07.2f" % (model, thisTime)
         log.debug('thisTime: %(thisTime)s, thisFile: %(thisFile)s' % locals())
         if thisTime < nextTime:
             log.debug('skipping the file: %(thisFile)s' % locals())
@@ -768,10 +885,6 @@ def generate_single_kcorrection_listing(
         else:
             nextTime = thisTime + temporalResolution
             thisTime -= peakTime
-            wavelengthArray, fluxArray = extract_spectra_from_file(
-                log, thisFile)
-            spRest = syn.ArraySpectrum(
-                wave=wavelengthArray, flux=fluxArray, waveunits='angstrom', fluxunits='flam')
             try:
                 log.debug("attempting to determine the rest %s-magnitude" %
                           (restFrameFilter,))
@@ -783,7 +896,8 @@ def generate_single_kcorrection_listing(
                     log,
                     wavelengthArray=wavelengthArray,
                     fluxArray=fluxArray,
-                    obsmode=obsmode
+                    obsmode=obsmode,
+                    photometry=photometry
                 )
             except Exception as e:
                 if "Integrated flux is <= 0" in str(e):
@@ -802,69 +916,42 @@ def generate_single_kcorrection_listing(
                         (restFrameFilter, model, thisTime, thisFile, str(e),))
                 pass
 
+            # REDSHIFT THE SPECTRUM ONCE FOR THIS EPOCH AND MEASURE IT THROUGH
+            # EVERY FILTER TOGETHER
+            strRed = "%0.3f" % (redshift,)
+            obsmodes = []
             for thisFilter in filters:
-                strRed = "%0.3f" % (redshift,)
-                spRest.convert('photnu')
-                spObs = spRest.redshift(redshift)
-                spObs.convert('flam')
-                spRest.convert('flam')
-
-                dataDir = pathToOutputDirectory + \
-                    "/k_corrections/%s/%s" % (model, thisFilter)
-                try:
-                    log.debug(
-                        "attempting to open the yaml file to append k-correction data")
-                    fileName = dataDir + "/z" + \
-                        str(strRed).replace(".", "pt") + ".yaml"
-                    stream = file(fileName, 'a')
-                except Exception as e:
-                    log.critical(
-                        "could not open the yaml file to append k-correction data - failed with this error: %s " % (str(e),))
-                    return -1
-
-                try:
-                    log.debug(
-                        "attempting to determine the magnitude of the object using calcphot - redshift, filter, model %s, %s, %s" %
+                if thisFilter in ["g", "r", "i", "z"]:
+                    obsmodes.append("sdss,%s" % (thisFilter,))
+                else:
+                    obsmodes.append(thisFilter)
+            log.debug(
+                "attempting to determine the magnitudes of the object - redshift, model %s, %s" %
+                (strRed, model))
+            filterMags = photometry.redshifted_magnitudes(
+                wavelengthArray,
+                fluxArray,
+                redshifts=[redshift],
+                obsmodes=obsmodes
+            )[0]
+
+            for thisFilter, filterObs in zip(filters, filterMags):
+                if np.isnan(filterObs):
+                    log.warning(
+                        "could not determine the magnitude of the object - redshift, filter, model %s, %s, %s - the spectrum does not cover the bandpass or its integrated flux is <= 0" %
                         (strRed, thisFilter, model))
-                    if thisFilter in ["g", "r", "i", "z"]:
-                        obsmode = "sdss,%s" % (thisFilter,)
-                    else:
-                        obsmode = thisFilter
-                    filterObs = calcphot(
-                        log,
-                        wavelengthArray=spObs.wave,
-                        fluxArray=spObs.flux,
-                        obsmode=obsmode
-                    )
-                except Exception as e:
-                    if "Integrated flux is <= 0" in str(e):
-                        log.warning(
-                            "could not determine the magnitude of the object using calcphot - redshift, filter, model %s, %s, %s - failed with this error: %s " %
-                            (strRed, thisFilter, model, str(e),))
-                        continue
-                    elif "Spectrum and bandpass do not fully overlap" in str(e):
-                        log.warning(
-                            "could not determine the magnitude of the object using calcphot - redshift, filter, model %s, %s, %s - failed with this error: %s " %
-                            (strRed, thisFilter, model, str(e),))
-                        continue
-                    elif "disjoint" in str(e):
-                        log.warning(
-                            "could not determine the magnitude of the object using calcphot - redshift, filter, model %s, %s, %s - failed with this error: %s " %
-                            (strRed, thisFilter, model, str(e),))
-                        continue
-                    else:
-                        log.warning(
-                            "could not determine the magnitude of the object using calcphot - redshift, filter, model %s, %s, %s - failed with this error: %s " %
-                            (strRed, thisFilter, model, str(e),))
-                    pass
-                kCor = gRest - filterObs
-                kcName = 'K_%s%s' % (restFrameFilter, thisFilter,)
-                thisKcor = {}
-                thisKcor["Rest Frame Days"] = thisTime
-                thisKcor[kcName] = kCor
-                yamlList = [thisKcor]
-                yaml.dump(yamlList, stream, default_flow_style=False)
-                stream.close()
+                    continue
+                kCor = gRest - float(filterObs)
+                listingRows.append((thisFilter, thisTime, kCor))
+
+    try:
+        log.debug("attempting to write the k-correction listing to the store")
+        kCorrectionStore.write_listing(
+            model, restFrameFilter, redshift, listingRows)
+    except Exception as e:
+        log.critical(
+            "could not write the k-correction listing to the store - failed with this error: %s " % (str(e),))
+        return -1
 
     return
 
@@ -881,9 +968,10 @@ def generate_single_kcorrection_polynomial(
         restFrameFilter,
         kCorPolyOrder=3,
         kCorMinimumDataPoints=3,
-        plot=False):
+        plot=False,
+        kCorrectionStore=None):
     """
-    *Given a the k-correction lightcurve, convert it to a polynomial, plot if requested and dump to a separate file.*
+    *Given a the k-correction lightcurve, convert it to a polynomial, plot if requested and add it to the k-correction store.*
 
     **Key Arguments:**
         - ``log`` -- logger
@@ -895,6 +983,7 @@ def generate_single_kcorrection_polynomial(
         - ``kCorPolyOrder`` -- the order of the polynomial to fit
         - ``kCorMinimumDataPoints`` -- Minimum number of datapoints used to generate k-correction curve
         - ``plot`` -- plot the polynomial?
+        - ``kCorrectionStore`` -- the ``kcorrection_store`` holding the listing. Default *None* (open ``k_corrections.db`` in the output directory)
 
     **Return:**
         - None
@@ -903,48 +992,44 @@ def generate_single_kcorrection_polynomial(
     ## STANDARD LIB ##
     ## THIRD PARTY ##
     import numpy as np
-    import yaml
     ## LOCAL APPLICATION ##
     import dryxPython.plotting as dp
+    from .kcorrections import kcorrection_store
 
     ################ >ACTION(S) ################
+    if not kCorrectionStore:
+        kCorrectionStore = kcorrection_store(
+            log=log,
+            pathToDatabase=pathToOutputDirectory + "/k_corrections.db"
+        )
     strRed = "%0.3f" % (redshift,)
     dataDir = pathToOutputDirectory + "/k_corrections/%s/%s" % (model, ffilter)
-    pathToYaml = dataDir + "/z" + str(strRed).replace(".", "pt") + ".yaml"
-    fileName = pathToYaml
-    stream = file(fileName, 'r')
-    yamlList = yaml.load(stream)
-    thisKcor = 'K_%s%s' % (restFrameFilter, ffilter)
-    stream.close()
-
-    kCor = []
-    time = []
-
-    if not yamlList:
-        return
 
     try:
         log.debug(
-            "attempting to generate a k-correction polynomial plot from the file: %s" %
-            (fileName,))
-        for item in yamlList:
-            kCor.append(item[thisKcor])
-            time.append(item['Rest Frame Days'])
+            "attempting to read the K_%s%s listing of the %s model at z=%s" %
+            (restFrameFilter, ffilter, model, strRed))
+        timeArray, kCorArray = kCorrectionStore.read_listing(
+            model, restFrameFilter, ffilter, redshift)
     except Exception as e:
         log.warning(
-            "could not generate a k-correction polynomial plot from the file %s:  - failed with this error: %s " %
-            (fileName, str(e),))
+            "could not read the K_%s%s listing of the %s model at z=%s - failed with this error: %s " %
+            (restFrameFilter, ffilter, model, strRed, str(e),))
         return -1
 
-    if len(kCor) < kCorMinimumDataPoints:
-        basename = os.path.basename(fileName)
+    if not len(kCorArray):
+        kCorrectionStore.remove_polynomial(
+            model, restFrameFilter, ffilter, redshift)
+        return
+
+    if len(kCorArray) < kCorMinimumDataPoints:
         log.warning(
-            'the k-correction file %s contains less than %s datapoints to convert from %s restframe to %s observed frame for the %s model - polynomial shall not be generated' %
-            (basename, kCorMinimumDataPoints, restFrameFilter, ffilter, model))
+            'the k-correction listing at z=%s contains less than %s datapoints to convert from %s restframe to %s observed frame for the %s model - polynomial shall not be generated' %
+            (strRed, kCorMinimumDataPoints, restFrameFilter, ffilter, model))
+        kCorrectionStore.remove_polynomial(
+            model, restFrameFilter, ffilter, redshift)
         return
 
-    kCorArray = np.array(kCor)
-    timeArray = np.array(time)
     xMin = np.min(timeArray)
     xMax = np.max(timeArray)
 
@@ -972,6 +1057,11 @@ def generate_single_kcorrection_polynomial(
     title = "k_%s%s at z = %s" % (restFrameFilter, ffilter, redshift)
 
     if plot:
+        # OTHER WORKER PROCESSES MAY CREATE THE SAME DIRECTORY
+        try:
+            os.makedirs(dataDir)
+        except OSError:
+            pass
         fileName = plot_polynomial(
             log,
             title=title,
@@ -986,18 +1076,13 @@ def generate_single_kcorrection_polynomial(
 
         # mdLog.write("""![%s_plot]\n\n[%s_plot]: %s\n\n""" % (title.replace(" ", "_"), title.replace(" ", "_"), fileName,))
 
-    newFileName = dataDir + "/z" + \
-        str(strRed).replace(".", "pt") + "_poly.yaml"
-    stream = file(newFileName, 'w')
-    yamlContent = {'polyCoeffs': flatPoly.coeffs}
-    #log.debug('flatPoly.coeffs %s' % (flatPoly.coeffs,))
-    yaml.dump(yamlContent, stream, default_flow_style=True)
-    stream.close()
+    kCorrectionStore.write_polynomial(
+        model, restFrameFilter, ffilter, redshift, flatPoly.coeffs)
 
     return
 
 
-# LAST MODIFIED : March 25, 2013
+# LAST MODIFIED : October 18, 2026
 # CREATED : March 25, 2013
 # AUTHOR : DRYX
 def generate_kcorrection_polynomial_database(
@@ -1009,10 +1094,13 @@ def generate_kcorrection_polynomial_database(
         redshiftResolution=0.1,
         redshiftLower=0.0,
         redshiftUpper=1.0,
-        plot=False):
+        plot=False,
+        numberOfWorkers=1):
     """
     *Generate the Kg* k-correction polynoimal for a range of redshifts given a list of spectra*
 
+    Polynomials are only refitted where their listing or the fitting settings have changed since the last run - unless ``plot`` is set, when every polynomial is refitted so that each gets its plot.
+
     **Key Arguments:**
         - ``log`` -- logger
         - ``restFrameFilter`` -- the observed frame filter with which to calculate k-corrections with
@@ -1023,18 +1111,20 @@ def generate_kcorrection_polynomial_database(
         - ``redshiftLower`` -- lower redshift in range of k-corrections to be calculated
         - ``redshiftUpper`` -- upper redshift in range of k-corrections to be calculated
         - ``plot`` -- plot the polynomial?
+        - ``numberOfWorkers`` -- the number of processes to spread the (model, redshift) polynomials across. 0 uses every core. Default *1* (serial)
 
     **Return:**
-        - None
+        - ``failures`` -- list of the (model, redshift) work units that failed, with their errors
     """
     ################ > IMPORTS ################
     ## STANDARD LIB ##
     import re
     import os
     ## THIRD PARTY ##
-    import pysynphot as syn
     import yaml
     ## LOCAL APPLICATION ##
+    from .workers import run_work_units
+    from .kcorrections import kcorrection_store
 
     mul = 1000
     div = 1000.
@@ -1042,32 +1132,280 @@ def generate_kcorrection_polynomial_database(
     fileName = pathToOutputDirectory + "/transient_light_curves.yaml"
     stream = file(fileName, 'r')
     generatedLCs = yaml.load(stream)
+    store = kcorrection_store(
+        log=log,
+        pathToDatabase=pathToOutputDirectory + "/k_corrections.db"
+    )
+    listingDigests = store.digests("listing")
+    previousDigests = store.digests("polynomial")
+    store.close()
+
     models = generatedLCs.keys()
-    filters = ['g', 'r', 'i', 'z']
     # models = ["he130",]
+    workUnits = []
+    skipped = 0
     for model in models:
 
         for redshift in range(int(redshiftLower * mul), int(redshiftUpper * mul), int(redshiftResolution * mul)):
             redshift = redshift / div
-
-            for ffilter in filters:
-                generate_single_kcorrection_polynomial(
-                    log,
-                    model=model,
-                    pathToOutputDirectory=pathToOutputDirectory,
-                    redshift=redshift,
-                    ffilter=ffilter,
-                    restFrameFilter=restFrameFilter,
-                    kCorPolyOrder=kCorPolyOrder,
-                    kCorMinimumDataPoints=kCorMinimumDataPoints,
-                    plot=plot)
-
-    return
+            key = (model, "%0.3f" % (redshift,))
+            digest = _input_digest(
+                listingDigests.get(key), kCorPolyOrder, kCorMinimumDataPoints)
+            # UP-TO-DATE UNITS ARE ONLY SKIPPED WHEN NO PLOTS ARE WANTED
+            if not plot and key in listingDigests and previousDigests.get(key) == digest:
+                skipped += 1
+                continue
+            workUnits.append(
+                {"model": model, "redshift": redshift, "digest": digest})
+
+    log.info('%s k-correction polynomial sets are up-to-date and will be skipped' %
+             (skipped,))
+
+    failures = run_work_units(
+        log=log,
+        function=_kcorrection_polynomial_unit,
+        workUnits=workUnits,
+        commonArguments={
+            "pathToOutputDirectory": pathToOutputDirectory,
+            "restFrameFilter": restFrameFilter,
+            "kCorPolyOrder": kCorPolyOrder,
+            "kCorMinimumDataPoints": kCorMinimumDataPoints,
+            "plot": plot
+        },
+        numberOfWorkers=numberOfWorkers,
+        description="k-correction polynomial sets"
+    )
+
+    return failures
 
 
 ###################################################################
 # PRIVATE (HELPER) FUNCTIONS                                      #
 ###################################################################
+# THE SPECTRAL CACHE, PHOTOMETRY ENGINE AND K-CORRECTION STORE OF THIS
+# PROCESS - EACH WORKER PROCESS BUILDS ITS OWN ON ITS FIRST WORK UNIT AND
+# REUSES THEM AFTERWARDS (THE SPECTRAL CACHE ONLY FOR UNITS OF THE SAME MODEL)
+_processCaches = {}
+
+
+def _process_kcorrection_store(
+        log,
+        pathToOutputDirectory):
+    """
+    *this process' connection to the k-correction store (SQLite connections must not be shared across a fork)*
+    """
+    from .kcorrections import kcorrection_store
+
+    key = ("k-correction store", os.getpid(), pathToOutputDirectory)
+    if key not in _processCaches:
+        _processCaches[key] = kcorrection_store(
+            log=log,
+            pathToDatabase=pathToOutputDirectory + "/k_corrections.db"
+        )
+    return _processCaches[key]
+
+
+# LAST MODIFIED : October 18, 2026
+# CREATED : October 18, 2026
+# AUTHOR : DRYX
+def _kcorrection_listing_unit(
+        log,
+        model,
+        redshift,
+        digest,
+        pathToOutputDirectory,
+        pathToSpectralDatabase,
+        restFrameFilter,
+        temporalResolution,
+        photometryEngine):
+    """
+    *generate the k-correction listing of one model at one redshift, reusing this process' spectral cache and photometry engine*
+
+    **Key Arguments:**
+        - ``log`` -- logger
+        - ``model`` -- name of the model
+        - ``redshift`` -- the redshift of the listing
+        - ``digest`` -- the digest of the listing's inputs, recorded in the store once the listing is written
+        - ``pathToOutputDirectory`` -- path to the output directory
+        - ``pathToSpectralDatabase`` -- path to the spectral database
+        - ``restFrameFilter`` -- the filter to generate the k-corrections against
+        - ``temporalResolution`` -- temporal resolution at which to calculate the k-correcions
+        - ``photometryEngine`` -- the synthetic photometry engine, ``native`` or ``pysynphot``
+
+    **Return:**
+        - the return value of ``generate_single_kcorrection_listing``
+    """
+    ################ > IMPORTS ################
+    ## STANDARD LIB ##
+    ## THIRD PARTY ##
+    ## LOCAL APPLICATION ##
+    from .spectra import spectral_cache
+    from .photometry import ab_photometry
+
+    ################ >ACTION(S) ################
+    key = (pathToSpectralDatabase, photometryEngine)
+    if key not in _processCaches:
+        _processCaches[key] = (
+            spectral_cache(
+                log=log,
+                pathToSpectralDatabase=pathToSpectralDatabase
+            ),
+            ab_photometry(
+                log=log,
+                engine=photometryEngine
+            )
+        )
+    spectra, photometry = _processCaches[key]
+
+    # THE UNITS ARE QUEUED MODEL BY MODEL - HOLD ONLY THE CURRENT MODEL'S
+    # SPECTRA SO EACH WORKER NEVER KEEPS A COPY OF THE WHOLE SPECTRAL GRID
+    if _processCaches.get(("model in memory", key)) != model:
+        spectra.clear()
+        _processCaches[("model in memory", key)] = model
+    kCorrectionStore = _process_kcorrection_store(log, pathToOutputDirectory)
+
+    status = generate_single_kcorrection_listing(
+        log,
+        pathToOutputDirectory=pathToOutputDirectory,
+        pathToSpectralDatabase=pathToSpectralDatabase,
+        model=model,
+        redshift=redshift,
+        restFrameFilter=restFrameFilter,
+        temporalResolution=temporalResolution,
+        spectralCache=spectra,
+        photometry=photometry,
+        kCorrectionStore=kCorrectionStore)
+    if status != -1:
+        kCorrectionStore.record_digest("listing", model, redshift, digest)
+
+    return status
+
+
+# LAST MODIFIED : October 18, 2026
+# CREATED : October 18, 2026
+# AUTHOR : DRYX
+def _kcorrection_polynomial_unit(
+        log,
+        model,
+        redshift,
+        digest,
+        pathToOutputDirectory,
+        restFrameFilter,
+        kCorPolyOrder,
+        kCorMinimumDataPoints,
+        plot):
+    """
+    *fit the k-correction polynomials of one model at one redshift in every filter*
+
+    **Key Arguments:**
+        - ``log`` -- logger
+        - ``model`` -- name of the model
+        - ``redshift`` -- the redshift of the listings
+        - ``digest`` -- the digest of the polynomials' inputs, recorded in the store once they are fitted
+        - ``pathToOutputDirectory`` -- path to the output directory
+        - ``restFrameFilter`` -- the filter the k-corrections are anchored to
+        - ``kCorPolyOrder`` -- the order of the polynomials to fit
+        - ``kCorMinimumDataPoints`` -- minimum number of datapoints used to generate a k-correction curve
+        - ``plot`` -- plot the polynomials?
+
+    **Return:**
+        - ``-1`` if any of the filters failed, otherwise None
+    """
+    filters = ['g', 'r', 'i', 'z']
+    kCorrectionStore = _process_kcorrection_store(log, pathToOutputDirectory)
+    status = None
+    for ffilter in filters:
+        if generate_single_kcorrection_polynomial(
+                log,
+                model=model,
+                pathToOutputDirectory=pathToOutputDirectory,
+                redshift=redshift,
+                ffilter=ffilter,
+                restFrameFilter=restFrameFilter,
+                kCorPolyOrder=kCorPolyOrder,
+                kCorMinimumDataPoints=kCorMinimumDataPoints,
+                plot=plot,
+                kCorrectionStore=kCorrectionStore) == -1:
+            status = -1
+    if status != -1:
+        kCorrectionStore.record_digest("polynomial", model, redshift, digest)
+
+    return status
+
+
+# LAST MODIFIED : October 18, 2026
+# CREATED : October 18, 2026
+# AUTHOR : DRYX
+def _spectra_magnitudes(
+        log,
+        spectrumFiles,
+        obsmodes,
+        spectralCache,
+        photometry):
+    """
+    *the magnitudes of many spectra through many bandpasses, with one batched integration per wavelength grid the spectra share*
+
+    **Key Arguments:**
+        - ``log`` -- logger
+        - ``spectrumFiles`` -- list of the spectrum files
+        - ``obsmodes`` -- list of observation modes
+        - ``spectralCache`` -- the ``spectral_cache`` to read the spectra through
+        - ``photometry`` -- the ``ab_photometry`` engine to measure the magnitudes with
+
+    **Return:**
+        - ``measuredMagnitudes`` -- dictionary of { obsmode : { spectrumFile : magnitude } } - NaN where the magnitude could not be measured
+    """
+    ################ > IMPORTS ################
+    ## STANDARD LIB ##
+    ## THIRD PARTY ##
+    import numpy as np
+    ## LOCAL APPLICATION ##
+
+    ################ >ACTION(S) ################
+    # GROUP THE SPECTRA BY WAVELENGTH GRID
+    grids = {}
+    for thisFile in spectrumFiles:
+        wavelengthArray, fluxArray = spectralCache.read(thisFile)
+        wavelengthArray = np.asarray(wavelengthArray, dtype=float)
+        key = wavelengthArray.tostring()
+        if key not in grids:
+            grids[key] = (wavelengthArray, [], [])
+        grids[key][1].append(thisFile)
+        grids[key][2].append(fluxArray)
+
+    measuredMagnitudes = {}
+    for obsmode in obsmodes:
+        measuredMagnitudes[obsmode] = {}
+    for wavelengthArray, files, fluxArrays in grids.values():
+        abMags = photometry.magnitudes(
+            wavelengthArray, np.array(fluxArrays, dtype=float), obsmodes)
+        for j, obsmode in enumerate(obsmodes):
+            for thisFile, abMag in zip(files, abMags[:, j].tolist()):
+                measuredMagnitudes[obsmode][thisFile] = abMag
+
+    log.debug('measured %s spectra on %s wavelength grids' %
+              (len(spectrumFiles), len(grids),))
+    return measuredMagnitudes
+
+
+# LAST MODIFIED : October 18, 2026
+# CREATED : October 18, 2026
+# AUTHOR : DRYX
+def _input_digest(
+        *inputs):
+    """
+    *a digest of the inputs of a unit of work*
+
+    **Key Arguments:**
+        - ``inputs`` -- the inputs (strings and numbers)
+
+    **Return:**
+        - ``digest`` -- hex digest string
+    """
+    import hashlib
+    return hashlib.sha1(":".join([repr(i) for i in inputs]).encode("utf-8")).hexdigest()
+
+
 if __name__ == '__main__':
     main()
 
@@ -0,0 +1,324 @@
+#!/usr/local/bin/python
+# encoding: utf-8
+"""
+*A single SQLite store for the k-correction database - the raw k-corrections and the fitted polynomial coefficients of every model, filter pair and redshift*
+
+:Author:
+    David Young
+
+:Date Created:
+    October 18, 2026
+"""
+################# GLOBAL IMPORTS ####################
+import sys
+import os
+import sqlite3
+import numpy as np
+
+
+class kcorrection_store():
+    """
+    *The k-correction database of a run, held in one SQLite file*
+
+    Three tables replace the old tree of ``k_corrections/<model>/<filter>/zXpXXX.yaml`` and ``zXpXXX_poly.yaml`` files:
+
+    - ``kcorrections`` -- one row per (model, rest frame filter, observed frame filter, redshift, rest frame day) holding the k-correction
+    - ``polynomials`` -- one row per (model, rest frame filter, observed frame filter, redshift) holding the fitted polynomial coefficients (highest power first) as a float64 blob
+    - ``provenance`` -- one row per (stage, model, redshift) holding a digest of the inputs that produced that unit of work, so a rerun can skip the units whose inputs have not changed
+
+    Redshifts are keyed by their ``"%0.3f"`` string, exactly as the file names were. Each (model, redshift) listing and each polynomial is written in a single transaction and the whole polynomial set needed by a simulation is read with one query. Several processes can write to the store at once - SQLite serialises the transactions.
+
+    **Key Arguments:**
+        - ``log`` -- logger
+        - ``pathToDatabase`` -- path to the SQLite file (created if it does not exist)
+
+    **Usage:**
+
+        .. code-block:: python
+
+            from qubits.kcorrections import kcorrection_store
+            store = kcorrection_store(
+                log=log,
+                pathToDatabase=pathToOutputDirectory + "/k_corrections.db"
+            )
+            store.write_listing("SNOne", "g", 0.1, [("r", -10.0, 0.12), ("r", -9.0, 0.11)])
+            days, kCorrections = store.read_listing("SNOne", "g", "r", 0.1)
+            store.write_polynomial("SNOne", "g", "r", 0.1, coefficients)
+            polynomials = store.polynomials(models=["SNOne"])
+    """
+    # Initialisation
+
+    def __init__(
+            self,
+            log,
+            pathToDatabase
+    ):
+        self.log = log
+        log.debug("instansiating a new 'kcorrection_store' object")
+        self.pathToDatabase = pathToDatabase
+
+        self.connection = sqlite3.connect(pathToDatabase, timeout=600)
+        with self.connection:
+            self.connection.execute("""CREATE TABLE IF NOT EXISTS kcorrections (
+                model TEXT, restFilter TEXT, obsFilter TEXT, redshift TEXT,
+                restFrameDay REAL, kCorrection REAL)""")
+            self.connection.execute("""CREATE INDEX IF NOT EXISTS kcorrections_key
+                ON kcorrections (model, restFilter, obsFilter, redshift)""")
+            self.connection.execute("""CREATE TABLE IF NOT EXISTS polynomials (
+                model TEXT, restFilter TEXT, obsFilter TEXT, redshift TEXT,
+                coefficients BLOB,
+                PRIMARY KEY (model, restFilter, obsFilter, redshift))""")
+            self.connection.execute("""CREATE TABLE IF NOT EXISTS provenance (
+                stage TEXT, model TEXT, redshift TEXT, digest TEXT,
+                PRIMARY KEY (stage, model, redshift))""")
+
+        return None
+
+    def write_listing(
+            self,
+            model,
+            restFilter,
+            redshift,
+            rows):
+        """
+        *replace the k-correction listing of a model at a redshift, in one transaction*
+
+        **Key Arguments:**
+            - ``model`` -- name of the model
+            - ``restFilter`` -- the rest frame filter the k-corrections are anchored to
+            - ``redshift`` -- the redshift of the listing
+            - ``rows`` -- list of (obsFilter, restFrameDay, kCorrection) tuples
+
+        **Return:**
+            - None
+        """
+        strRed = "%0.3f" % (redshift,)
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM kcorrections WHERE model=? AND restFilter=? AND redshift=?",
+                (model, restFilter, strRed))
+            self.connection.executemany(
+                "INSERT INTO kcorrections VALUES (?, ?, ?, ?, ?, ?)",
+                [(model, restFilter, obsFilter, strRed, float(day), float(kCor)) for obsFilter, day, kCor in rows])
+
+        return None
+
+    def read_listing(
+            self,
+            model,
+            restFilter,
+            obsFilter,
+            redshift):
+        """
+        *the k-correction listing of a model, filter pair and redshift*
+
+        **Key Arguments:**
+            - ``model`` -- name of the model
+            - ``restFilter`` -- the rest frame filter
+            - ``obsFilter`` -- the observed frame filter
+            - ``redshift`` -- the redshift of the listing
+
+        **Return:**
+            - ``restFrameDays`` -- array of the rest frame days
+            - ``kCorrections`` -- array of the k-corrections
+        """
+        rows = self.connection.execute(
+            "SELECT restFrameDay, kCorrection FROM kcorrections WHERE model=? AND restFilter=? AND obsFilter=? AND redshift=? ORDER BY rowid",
+            (model, restFilter, obsFilter, "%0.3f" % (redshift,))).fetchall()
+        if not len(rows):
+            return np.zeros(0), np.zeros(0)
+        rows = np.array(rows, dtype=float)
+
+        return rows[:, 0], rows[:, 1]
+
+    def write_polynomial(
+            self,
+            model,
+            restFilter,
+            obsFilter,
+            redshift,
+            coefficients):
+        """
+        *store (or replace) the fitted k-correction polynomial of a model, filter pair and redshift*
+
+        **Key Arguments:**
+            - ``model`` -- name of the model
+            - ``restFilter`` -- the rest frame filter
+            - ``obsFilter`` -- the observed frame filter
+            - ``redshift`` -- the redshift of the polynomial
+            - ``coefficients`` -- the polynomial coefficients, highest power first
+
+        **Return:**
+            - None
+        """
+        blob = sqlite3.Binary(
+            np.asarray(coefficients, dtype=np.float64).tostring())
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO polynomials VALUES (?, ?, ?, ?, ?)",
+                (model, restFilter, obsFilter, "%0.3f" % (redshift,), blob))
+
+        return None
+
+    def remove_polynomial(
+            self,
+            model,
+            restFilter,
+            obsFilter,
+            redshift):
+        """
+        *remove the polynomial of a model, filter pair and redshift (e.g. when its listing no longer has enough points to fit)*
+
+        **Key Arguments:**
+            - ``model`` -- name of the model
+            - ``restFilter`` -- the rest frame filter
+            - ``obsFilter`` -- the observed frame filter
+            - ``redshift`` -- the redshift of the polynomial
+
+        **Return:**
+            - None
+        """
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM polynomials WHERE model=? AND restFilter=? AND obsFilter=? AND redshift=?",
+                (model, restFilter, obsFilter, "%0.3f" % (redshift,)))
+
+        return None
+
+    def remove_other_rest_filters(
+            self,
+            restFilter):
+        """
+        *delete the listings and polynomials anchored to any other rest frame filter, in one transaction*
+
+        The provenance of the (model, redshift) units those rows came from is deleted with them, so the units are rebuilt for the new rest frame filter.
+
+        **Key Arguments:**
+            - ``restFilter`` -- the rest frame filter to keep
+
+        **Return:**
+            - ``removed`` -- the number of listing and polynomial rows deleted
+        """
+        with self.connection:
+            self.connection.execute("""DELETE FROM provenance WHERE
+                EXISTS (SELECT 1 FROM kcorrections WHERE kcorrections.model=provenance.model
+                    AND kcorrections.redshift=provenance.redshift AND kcorrections.restFilter!=?)
+                OR EXISTS (SELECT 1 FROM polynomials WHERE polynomials.model=provenance.model
+                    AND polynomials.redshift=provenance.redshift AND polynomials.restFilter!=?)""",
+                                    (restFilter, restFilter))
+            removed = self.connection.execute(
+                "DELETE FROM kcorrections WHERE restFilter!=?", (restFilter,)).rowcount
+            removed += self.connection.execute(
+                "DELETE FROM polynomials WHERE restFilter!=?", (restFilter,)).rowcount
+
+        return removed
+
+    def digests(
+            self,
+            stage):
+        """
+        *the input digests recorded for every unit of work of a stage*
+
+        **Key Arguments:**
+            - ``stage`` -- the stage, e.g. ``listing`` or ``polynomial``
+
+        **Return:**
+            - ``digests`` -- dictionary of { (model, "%0.3f" redshift) : digest }
+        """
+        digests = {}
+        for model, strRed, digest in self.connection.execute(
+                "SELECT model, redshift, digest FROM provenance WHERE stage=?", (stage,)):
+            digests[(model, strRed)] = digest
+
+        return digests
+
+    def record_digest(
+            self,
+            stage,
+            model,
+            redshift,
+            digest):
+        """
+        *record the digest of the inputs that produced a unit of work*
+
+        **Key Arguments:**
+            - ``stage`` -- the stage, e.g. ``listing`` or ``polynomial``
+            - ``model`` -- name of the model
+            - ``redshift`` -- the redshift of the unit
+            - ``digest`` -- the digest of the unit's inputs
+
+        **Return:**
+            - None
+        """
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO provenance VALUES (?, ?, ?, ?)",
+                (stage, model, "%0.3f" % (redshift,), digest))
+
+        return None
+
+    def polynomials(
+            self,
+            models=None,
+            obsFilters=None,
+            redshifts=None,
+            restFilter=None):
+        """
+        *load the fitted k-correction polynomials with a single query*
+
+        The rest frame filter, models and observed frame filters are selected by the query itself, so only the rows needed are read (through the primary key index). The redshifts, which can be too many to pass as query parameters, are matched as the rows are read.
+
+        **Key Arguments:**
+            - ``models`` -- the models to load. Default *None* (all)
+            - ``obsFilters`` -- the observed frame filters to load. Default *None* (all)
+            - ``redshifts`` -- the redshifts to load. Default *None* (all)
+            - ``restFilter`` -- the rest frame filter to load. Default *None* (any - only safe once ``remove_other_rest_filters`` has been run)
+
+        **Return:**
+            - ``polynomials`` -- dictionary of { (model, obsFilter, "%0.3f" redshift) : numpy.poly1d }
+        """
+        clauses = []
+        parameters = []
+        if restFilter is not None:
+            clauses.append("restFilter=?")
+            parameters.append(restFilter)
+        for column, values in [("model", models), ("obsFilter", obsFilters)]:
+            if values is not None:
+                values = sorted(set(["%s" % (v,) for v in values]))
+                clauses.append("%s IN (%s)" %
+                               (column, ", ".join(["?"] * len(values))))
+                parameters.extend(values)
+        if redshifts is not None:
+            redshifts = set(["%0.3f" % (r,) for r in redshifts])
+
+        query = "SELECT model, obsFilter, redshift, coefficients FROM polynomials"
+        if len(clauses):
+            query += " WHERE " + " AND ".join(clauses)
+
+        polynomials = {}
+        for model, obsFilter, strRed, blob in self.connection.execute(query, parameters):
+            if redshifts is not None and strRed not in redshifts:
+                continue
+            polynomials[(model, obsFilter, strRed)] = np.poly1d(
+                np.frombuffer(bytes(blob), dtype=np.float64))
+
+        return polynomials
+
+    def clear(
+            self):
+        """
+        *delete every k-correction, polynomial and provenance record in the store*
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM kcorrections")
+            self.connection.execute("DELETE FROM polynomials")
+            self.connection.execute("DELETE FROM provenance")
+        return None
+
+    def close(
+            self):
+        """
+        *close the connection to the database file*
+        """
+        self.connection.close()
+        return None
@@ -0,0 +1,171 @@
+#!/usr/local/bin/python
+# encoding: utf-8
+"""
+*An array-backed store of the observed-frame lightcurves of every simulated transient*
+
+:Author:
+    David Young
+
+:Date Created:
+    October 18, 2026
+"""
+################# GLOBAL IMPORTS ####################
+import sys
+import os
+import numpy as np
+
+
+class lightcurve_array():
+    """
+    *A structure-of-arrays store of the observed-frame lightcurves of every simulated transient*
+
+    All transients of the same model placed at the same (grid-snapped) redshift share the *shape* of their lightcurve in each filter; they only differ by a constant magnitude offset (peak magnitude, distance modulus and extinction). The shapes are stored once per (model, redshift) bin as a matrix of polynomial coefficients per filter and each object carries a bin index and one offset per filter. Magnitudes for many objects are evaluated in a single batched Horner evaluation.
+
+    Indexing the store (``lightCurves[i]``) returns the old per-object dictionary (``lightCurves``, ``peakMags``, ``explosionDay`` and ``endOfLightcurveDay``) built on the fly, so code written against the list-of-dictionaries format keeps working.
+
+    **Key Arguments:**
+        - ``log`` -- logger
+        - ``filters`` -- the list of filters the lightcurves are given in
+        - ``coefficients`` -- dictionary of { filter : (nBins, order + 1) array of polynomial coefficients, highest power first }. Rows of NaNs flag bins with no lightcurve in that filter
+        - ``binIndex`` -- integer array giving the coefficient row used by each object
+        - ``offsets`` -- dictionary of { filter : array of per-object magnitude offsets }
+        - ``explosionDay`` -- array of the per-object explosion days relative to peak
+        - ``endOfLightcurveDay`` -- array of the per-object final days of the lightcurves relative to peak
+
+    **Usage:**
+
+        .. code-block:: python
+
+            from qubits.lightcurves import lightcurve_array
+            lightCurves = lightcurve_array(
+                log=log,
+                filters=['g', 'r', 'i', 'z'],
+                coefficients=coefficients,
+                binIndex=binIndex,
+                offsets=offsets,
+                explosionDay=explosionDay,
+                endOfLightcurveDay=endOfLightcurveDay
+            )
+            # MAGNITUDES OF EVERY OBJECT IN THE g-BAND AT 10 DAYS AFTER PEAK
+            mags = lightCurves.evaluate("g", np.ones(len(lightCurves)) * 10.)
+    """
+    # Initialisation
+
+    def __init__(
+            self,
+            log,
+            filters,
+            coefficients,
+            binIndex,
+            offsets,
+            explosionDay,
+            endOfLightcurveDay
+    ):
+        self.log = log
+        log.debug("instansiating a new 'lightcurve_array' object")
+        self.filters = filters
+        self.coefficients = coefficients
+        self.binIndex = np.asarray(binIndex)
+        self.offsets = offsets
+        self.explosionDay = np.asarray(explosionDay, dtype=float)
+        self.endOfLightcurveDay = np.asarray(endOfLightcurveDay, dtype=float)
+
+        return None
+
+    def __len__(self):
+        return len(self.binIndex)
+
+    def __getitem__(self, item):
+        lightCurves = {}
+        peakMags = {}
+        for ffilter in self.filters:
+            row = self.coefficients[ffilter][self.binIndex[item]]
+            if np.isnan(row[0]):
+                lightCurves[ffilter] = None
+                peakMags[ffilter] = None
+                continue
+            row = row.copy()
+            row[-1] += self.offsets[ffilter][item]
+            lightCurves[ffilter] = np.poly1d(row)
+            peakMags[ffilter] = lightCurves[ffilter](0)
+
+        return {
+            'lightCurves': lightCurves,
+            'peakMags': peakMags,
+            'explosionDay': self.explosionDay[item],
+            'endOfLightcurveDay': self.endOfLightcurveDay[item]}
+
+    def has_lightcurve(
+            self,
+            ffilter,
+            objects=None):
+        """
+        *which objects have a lightcurve in the given filter*
+
+        **Key Arguments:**
+            - ``ffilter`` -- the filter
+            - ``objects`` -- index (or boolean mask) of the objects to consider. Default *None* (all objects)
+
+        **Return:**
+            - ``hasLightCurve`` -- boolean array
+        """
+        binIndex = self.binIndex
+        if objects is not None:
+            binIndex = binIndex[objects]
+        return ~np.isnan(self.coefficients[ffilter][binIndex, 0])
+
+    def evaluate(
+            self,
+            ffilter,
+            times,
+            objects=None):
+        """
+        *evaluate the magnitudes of many objects at once*
+
+        **Key Arguments:**
+            - ``ffilter`` -- the filter
+            - ``times`` -- days relative to peak. Either one time per object (shape ``(nObjects,)``) or a row of times per object (shape ``(nObjects, nTimes)``)
+            - ``objects`` -- index (or boolean mask) of the objects to evaluate. Default *None* (all objects)
+
+        **Return:**
+            - ``magnitudes`` -- array the same shape as ``times`` (NaN for objects with no lightcurve in this filter)
+        """
+        binIndex = self.binIndex
+        offsets = self.offsets[ffilter]
+        if objects is not None:
+            binIndex = binIndex[objects]
+            offsets = offsets[objects]
+
+        times = np.asarray(times, dtype=float)
+        coefficients = self.coefficients[ffilter][binIndex]
+        if times.ndim == 2:
+            coefficients = coefficients[:, :, None]
+            offsets = offsets[:, None]
+
+        # HORNER'S METHOD ACROSS ALL OBJECTS AT ONCE
+        magnitudes = np.zeros(times.shape) + coefficients[:, 0]
+        for k in range(1, coefficients.shape[1]):
+            magnitudes = magnitudes * times + coefficients[:, k]
+
+        return magnitudes + offsets
+
+    def peak_magnitudes(
+            self,
+            ffilter,
+            objects=None):
+        """
+        *the magnitudes at peak (day zero) of many objects at once*
+
+        **Key Arguments:**
+            - ``ffilter`` -- the filter
+            - ``objects`` -- index (or boolean mask) of the objects to evaluate. Default *None* (all objects)
+
+        **Return:**
+            - ``peakMags`` -- array of peak magnitudes (NaN for objects with no lightcurve in this filter)
+        """
+        binIndex = self.binIndex
+        offsets = self.offsets[ffilter]
+        if objects is not None:
+            binIndex = binIndex[objects]
+            offsets = offsets[objects]
+        return self.coefficients[ffilter][binIndex, -1] + offsets
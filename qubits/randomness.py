@@ -0,0 +1,90 @@
+#!/usr/local/bin/python
+# encoding: utf-8
+"""
+*Seeded, independent random number streams for each stage of the simulation*
+
+:Author:
+    David Young
+
+:Date Created:
+    October 18, 2026
+"""
+################# GLOBAL IMPORTS ####################
+import sys
+import os
+import hashlib
+import numpy as np
+
+
+class random_streams():
+    """
+    *A family of reproducible random number streams, one per named stage of the simulation*
+
+    Every stream is a ``numpy.random.RandomState`` seeded from a hash of the run's seed and the stage name, so the streams are independent of each other and of the order the stages draw in. The same seed reproduces a run bit for bit, and work can be split across processes by giving each worker its own sub-stream.
+
+    **Key Arguments:**
+        - ``log`` -- logger
+        - ``seed`` -- the (integer) seed of the run. Default *None* (draw a fresh seed from the operating system - it is logged and kept in ``self.seed`` so the run can be repeated)
+
+    **Usage:**
+
+        .. code-block:: python
+
+            from qubits.randomness import random_streams
+            streams = random_streams(
+                log=log,
+                seed=42
+            )
+            redshiftState = streams.stream("redshifts")
+            values = redshiftState.random_sample(1000)
+            # ONE INDEPENDENT STREAM PER WORKER PROCESS
+            workerStates = streams.spawn("k-corrections", 8)
+    """
+    # Initialisation
+
+    def __init__(
+            self,
+            log,
+            seed=None
+    ):
+        self.log = log
+        log.debug("instansiating a new 'random_streams' object")
+        if seed is None or seed is False:
+            seed = int(np.frombuffer(os.urandom(4), dtype=np.uint32)[0])
+        self.seed = int(seed)
+        log.info('the random seed for this run is %s' % (self.seed,))
+
+        return None
+
+    def stream(
+            self,
+            stageName):
+        """
+        *the random number stream of a named stage*
+
+        **Key Arguments:**
+            - ``stageName`` -- the name of the simulation stage, e.g. ``redshifts``
+
+        **Return:**
+            - ``randomState`` -- a ``numpy.random.RandomState``
+        """
+        key = "%s:%s" % (self.seed, stageName)
+        digest = hashlib.sha256(key.encode("utf-8")).digest()
+        words = np.frombuffer(digest, dtype=np.uint32)
+        return np.random.RandomState(words)
+
+    def spawn(
+            self,
+            stageName,
+            number):
+        """
+        *independent sub-streams of a named stage, one for each parallel worker or chunk of work*
+
+        **Key Arguments:**
+            - ``stageName`` -- the name of the simulation stage
+            - ``number`` -- the number of sub-streams
+
+        **Return:**
+            - ``randomStates`` -- list of ``numpy.random.RandomState``
+        """
+        return [self.stream("%s/%s" % (stageName, i)) for i in range(number)]
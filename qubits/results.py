@@ -499,7 +499,8 @@ def determine_sn_rate(
         pathToOutputPlotFolder,
         lowerRedshiftLimit=0.01,
         upperRedshiftLimit=1.0,
-        redshiftResolution=0.1
+        redshiftResolution=0.1,
+        cosmology=False
 ):
     """
     *Plot the SFR History as a function of redshift*
@@ -520,6 +521,7 @@ def determine_sn_rate(
         - ``lowerRedshiftLimit`` -- the lower redshist limit out to which to determine the rate
         - ``upperRedshiftLimit`` -- the redshist limit out to which to determine the rate
         - ``redshiftResolution`` -- the redshist resolution ued to determine the rate
+        - ``cosmology`` -- the run's shared ``cosmology_table``. Default *False* (build a table for this call only)
 
     **Return:**
         - ``imageLink`` -- MD link to the output plot
@@ -530,12 +532,18 @@ def determine_sn_rate(
     ## THIRD PARTY ##
     import numpy as np
     ## LOCAL APPLICATION ##
-    import dryxPython.astrotools as da
     import dryxPython.plotting as dp
+    from .cosmology import cosmology_table
 
     ################ >ACTION(S) ################
     filters = ['g', 'r', 'i', 'z']
 
+    if not cosmology:
+        cosmology = cosmology_table(
+            log=log,
+            upperRedshiftLimit=max(upperRedshiftLimit, redshiftResolution)
+        )
+
     sdssArea = 5713.
     sdssSFRupperRedshiftLimit = 0.033
     sdssSFR = 14787.21
@@ -549,8 +557,7 @@ def determine_sn_rate(
     areaRatio = surveyArea / sdssArea
     #log.info('normaiseSFR %s' % (normaiseSFR,))
 
-    anchorVolume = da.convert_redshift_to_distance(redshiftResolution)[
-        'dl_mpc']**3
+    anchorVolume = cosmology.luminosity_distance(redshiftResolution)**3
     #log.info('anchorVolume %s' % (anchorVolume,))
     xRange = [lowerRedshiftLimit, upperRedshiftLimit, redshiftResolution]
 
@@ -586,11 +593,10 @@ def determine_sn_rate(
         if shellRedshift == 0.:
             shellVolume = 9.
         elif shellRedshift > shellWidth:
-            shellVolume = da.convert_redshift_to_distance(shellRedshift)[
-                'dl_mpc']**3 - da.convert_redshift_to_distance(shellRedshift - shellWidth)['dl_mpc']**3
+            shellVolume = cosmology.luminosity_distance(
+                shellRedshift)**3 - cosmology.luminosity_distance(shellRedshift - shellWidth)**3
         else:
-            shellVolume = da.convert_redshift_to_distance(shellRedshift)[
-                'dl_mpc']**3
+            shellVolume = cosmology.luminosity_distance(shellRedshift)**3
         shellSFRDensity = (SFH / anchor) * normaiseSFR * \
             (shellVolume / anchorVolume)
         shelltransientRateDensity = shellSFRDensity * transientRateFraction
@@ -967,7 +973,7 @@ def calculate_fraction_of_sn_discovered(
     **Key Arguments:**
         - ``log`` -- logger
         - ``surveyCadenceSettings`` -- the cadence settings for the survey
-        - ``snSurveyDiscoveryTimes`` -- the discovery times of the SN relative to the survey year
+        - ``snSurveyDiscoveryTimes`` -- the discovery times of the SN relative to the start of the survey
         - ``redshifts`` -- redshifts of the sne
         - ``peakAppMagList`` -- list of the SN peak magnitude in each filter
         - ``snCampaignLengthList`` -- a list of campaign lengths in each filter
@@ -1013,16 +1019,19 @@ def calculate_fraction_of_sn_discovered(
                             shortCampaignDayList.append(
                                 snSurveyDiscoveryTimes[item][ffilter])
                         else:
-                            if (surveyYear * observableFraction - snSurveyDiscoveryTimes[item][ffilter]) > extraSurveyConstraints['Observable for at least ? number of days']:
+                            # THE DAY OF THE SURVEY YEAR OF THE DISCOVERY
+                            discoveryDayOfYear = snSurveyDiscoveryTimes[
+                                item][ffilter] % surveyYear
+                            if (surveyYear * observableFraction - discoveryDayOfYear) > extraSurveyConstraints['Observable for at least ? number of days']:
                                 discoveryDayList.append(
                                     snSurveyDiscoveryTimes[item][ffilter])
                             # elif ((surveyYear*observableFraction -
                             # snSurveyDiscoveryTimes[item][ffilter]) <
                             # snSurveyDiscoveryTimes[item][ffilter] <
                             # surveyYear*observableFraction):
-                            elif (snCampaignLengthList[item][ffilter] - (surveyYear - snSurveyDiscoveryTimes[item][ffilter])) > extraSurveyConstraints['Observable for at least ? number of days']:
+                            elif (snCampaignLengthList[item][ffilter] - (surveyYear - discoveryDayOfYear)) > extraSurveyConstraints['Observable for at least ? number of days']:
                                 lcTail = snCampaignLengthList[item][
-                                    ffilter] - (surveyYear - snSurveyDiscoveryTimes[item][ffilter])
+                                    ffilter] - (surveyYear - discoveryDayOfYear)
                                 discoveryDayList.append(
                                     snSurveyDiscoveryTimes[item][ffilter])
                             else:
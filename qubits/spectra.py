@@ -0,0 +1,313 @@
+#!/usr/local/bin/python
+# encoding: utf-8
+"""
+*An in-memory cache of the spectral database - each model's spectra are parsed once and shared by the lightcurve and k-correction stages. The text database can also be compiled into one memory-mapped binary array per model*
+
+:Author:
+    David Young
+
+:Date Created:
+    October 18, 2026
+"""
+################# GLOBAL IMPORTS ####################
+import sys
+import os
+import re
+import glob
+import hashlib
+import collections
+import numpy as np
+
+
+class spectral_cache():
+    """
+    *An in-memory cache of the nested-folder spectral database*
+
+    The first request for a model parses all of that model's ``.spec`` files and keeps the wavelength and flux arrays in memory, keyed by the epoch parsed from the ``t±NNN.NN`` part of the filenames. Every later request (another filter, another redshift) is served from memory.
+
+    If the database has been compiled (``qubits compile-db`` or the ``compile`` method) the spectra are instead served as zero-copy views into a memory-mapped ``.npy`` array per model, kept in a hidden ``.compiled`` folder at the root of the database. A compiled model is only used while the names, modification times and sizes of its ``.spec`` files match those recorded when it was compiled - otherwise the text files are parsed as before.
+
+    **Key Arguments:**
+        - ``log`` -- logger
+        - ``pathToSpectralDatabase`` -- path to the nested-folders and files spectral database
+
+    **Usage:**
+
+        .. code-block:: python
+
+            from qubits.spectra import spectral_cache
+            spectra = spectral_cache(
+                log=log,
+                pathToSpectralDatabase="/path/to/qubits_spectral_database"
+            )
+            for epoch, (wavelengthArray, fluxArray) in spectra.model_spectra("SNOne").iteritems():
+                print epoch, len(wavelengthArray)
+
+            # PACK EVERY MODEL INTO A MEMORY-MAPPED BINARY ARRAY
+            spectra.compile()
+    """
+    # Initialisation
+
+    def __init__(
+            self,
+            log,
+            pathToSpectralDatabase
+    ):
+        self.log = log
+        log.debug("instansiating a new 'spectral_cache' object")
+        self.pathToSpectralDatabase = pathToSpectralDatabase
+
+        self.reTime = re.compile(r't((\+|\-)\d{3}\.\d{2})')
+        self.pathToCompiledDatabase = os.path.join(
+            pathToSpectralDatabase, ".compiled")
+        self._models = {}
+        self._files = {}
+        self._compiled = {}
+
+        return None
+
+    def models(
+            self):
+        """
+        *the names of the models (sub-folders) in the spectral database*
+
+        **Return:**
+            - ``models`` -- sorted list of model names
+        """
+        basePath = self.pathToSpectralDatabase
+        return sorted([d for d in os.listdir(basePath) if os.path.isdir(os.path.join(basePath, d)) and d[0] != "."])
+
+    def spectrum_files(
+            self,
+            model):
+        """
+        *the paths to the spectrum files of a model*
+
+        **Key Arguments:**
+            - ``model`` -- name of the model
+
+        **Return:**
+            - ``spectrumFiles`` -- list of paths to the model's ``.spec`` files
+        """
+        path = os.path.join(self.pathToSpectralDatabase, model) + "/"
+        return sorted(glob.glob(path + "*.spec"))
+
+    def model_spectra(
+            self,
+            model):
+        """
+        *all the spectra of a model, parsed on first request*
+
+        **Key Arguments:**
+            - ``model`` -- name of the model
+
+        **Return:**
+            - ``spectra`` -- ordered dictionary of { epoch : (wavelengthArray, fluxArray) } sorted by epoch
+        """
+        if model in self._models:
+            return self._models[model]
+
+        compiled = self._compiled_model(model)
+        if compiled:
+            self._models[model] = collections.OrderedDict(
+                sorted(compiled.values(), key=lambda x: x[0]))
+            return self._models[model]
+
+        self.log.debug('parsing the spectra of the %s model' % (model,))
+        spectra = {}
+        for pathToSpectrum in self.spectrum_files(model):
+            wavelengthArray, fluxArray = self.read(pathToSpectrum)
+            spectra[self.epoch(pathToSpectrum)] = (wavelengthArray, fluxArray)
+        self._models[model] = collections.OrderedDict(sorted(spectra.items()))
+
+        return self._models[model]
+
+    def read(
+            self,
+            pathToSpectrum):
+        """
+        *the wavelength and flux arrays of a single spectrum file, parsed on first request (or served from the compiled database)*
+
+        **Key Arguments:**
+            - ``pathToSpectrum`` -- path to the spectrum file
+
+        **Return:**
+            - ``wavelengthArray`` -- the wavelength array
+            - ``fluxArray`` -- the flux array
+        """
+        from .datagenerator import extract_spectra_from_file
+
+        if pathToSpectrum in self._files:
+            return self._files[pathToSpectrum]
+
+        # SERVE A VIEW OF THE COMPILED MODEL IF IT IS UP-TO-DATE
+        model = os.path.basename(os.path.dirname(pathToSpectrum))
+        compiled = self._compiled_model(model)
+        if compiled and os.path.basename(pathToSpectrum) in compiled:
+            self._files[pathToSpectrum] = compiled[
+                os.path.basename(pathToSpectrum)][1]
+        else:
+            self._files[pathToSpectrum] = extract_spectra_from_file(
+                self.log, pathToSpectrum)
+
+        return self._files[pathToSpectrum]
+
+    def epoch(
+            self,
+            pathToSpectrum):
+        """
+        *the epoch (days) of a spectrum parsed from its filename*
+
+        **Key Arguments:**
+            - ``pathToSpectrum`` -- path to the spectrum file
+
+        **Return:**
+            - ``epoch`` -- the epoch as a float
+        """
+        return float(self.reTime.search(os.path.basename(pathToSpectrum)).group(1))
+
+    def model_digest(
+            self,
+            model):
+        """
+        *a digest of the names and contents of a model's spectrum files - it changes whenever a spectrum is added, removed or edited*
+
+        **Key Arguments:**
+            - ``model`` -- name of the model
+
+        **Return:**
+            - ``digest`` -- hex digest string
+        """
+        digest = hashlib.sha1()
+        for pathToSpectrum in self.spectrum_files(model):
+            digest.update(os.path.basename(pathToSpectrum).encode("utf-8"))
+            with open(pathToSpectrum, "rb") as stream:
+                digest.update(hashlib.sha1(stream.read()).digest())
+
+        return digest.hexdigest()
+
+    def compile(
+            self,
+            models=None):
+        """
+        *pack each model's spectra into one contiguous binary array, memory-mapped by later runs*
+
+        For each model a ``(2, nPoints)`` float array of the concatenated wavelengths (row 0) and fluxes (row 1) of all its spectra is written to ``.compiled/<model>.npy``, alongside a ``.compiled/<model>.index.npz`` holding each spectrum's filename, epoch, start and stop columns and the modification time and size of its source file.
+
+        **Key Arguments:**
+            - ``models`` -- list of the models to compile. Default *None* (every model in the database)
+
+        **Return:**
+            - ``compiledModels`` -- list of the models compiled
+        """
+        from .datagenerator import extract_spectra_from_file
+
+        if models is None:
+            models = self.models()
+        if not os.path.exists(self.pathToCompiledDatabase):
+            os.makedirs(self.pathToCompiledDatabase)
+
+        for model in models:
+            self.log.info('compiling the spectra of the %s model' % (model,))
+            spectrumFiles = self.spectrum_files(model)
+            if not len(spectrumFiles):
+                message = 'the %s model has no spectrum files to compile' % (
+                    model,)
+                self.log.critical(message)
+                raise ValueError(message)
+
+            spectra = [extract_spectra_from_file(self.log, f)
+                       for f in spectrumFiles]
+            lengths = np.array([len(w) for w, f in spectra])
+            stops = np.cumsum(lengths)
+            data = np.empty((2, stops[-1]), dtype=float)
+            for (wavelengthArray, fluxArray), start, stop in zip(spectra, stops - lengths, stops):
+                data[0, start:stop] = wavelengthArray
+                data[1, start:stop] = fluxArray
+            fileStats = [os.stat(f) for f in spectrumFiles]
+
+            # WRITE TO TEMPORARY FILES AND RENAME SO A HALF-WRITTEN MODEL IS
+            # NEVER READ
+            pathToData, pathToIndex = self._compiled_paths(model)
+            with open(pathToData + ".tmp", "wb") as stream:
+                np.save(stream, data)
+            with open(pathToIndex + ".tmp", "wb") as stream:
+                np.savez(
+                    stream,
+                    filenames=np.array([os.path.basename(f)
+                                        for f in spectrumFiles]),
+                    epochs=np.array([self.epoch(f) for f in spectrumFiles]),
+                    starts=stops - lengths,
+                    stops=stops,
+                    mtimes=np.array([s.st_mtime for s in fileStats]),
+                    sizes=np.array([s.st_size for s in fileStats])
+                )
+            os.rename(pathToData + ".tmp", pathToData)
+            os.rename(pathToIndex + ".tmp", pathToIndex)
+            self._compiled.pop(model, None)
+            self._models.pop(model, None)
+
+        return models
+
+    def clear(
+            self):
+        """
+        *drop all cached spectra*
+        """
+        self._models = {}
+        self._files = {}
+        self._compiled = {}
+        return None
+
+    def _compiled_paths(
+            self,
+            model):
+        """
+        *the paths to the compiled data array and index of a model*
+        """
+        base = os.path.join(self.pathToCompiledDatabase, model)
+        return base + ".npy", base + ".index.npz"
+
+    def _compiled_model(
+            self,
+            model):
+        """
+        *the spectra of a compiled model as views into its memory-mapped array, or None if the model is not compiled or its source files have changed*
+
+        **Key Arguments:**
+            - ``model`` -- name of the model
+
+        **Return:**
+            - ``compiled`` -- dictionary of { filename : (epoch, (wavelengthArray, fluxArray)) } or None
+        """
+        if model in self._compiled:
+            return self._compiled[model]
+
+        self._compiled[model] = None
+        pathToData, pathToIndex = self._compiled_paths(model)
+        if not os.path.exists(pathToData) or not os.path.exists(pathToIndex):
+            return None
+
+        npz = np.load(pathToIndex)
+        index = dict((k, npz[k]) for k in npz.files)
+        npz.close()
+        spectrumFiles = self.spectrum_files(model)
+        filenames = [os.path.basename(f) for f in spectrumFiles]
+        fileStats = [os.stat(f) for f in spectrumFiles]
+        if filenames != list(index["filenames"]) or \
+                [s.st_mtime for s in fileStats] != list(index["mtimes"]) or \
+                [s.st_size for s in fileStats] != list(index["sizes"]):
+            self.log.warning(
+                'the compiled spectra of the %s model are out-of-date and will be ignored - rerun `qubits compile-db` to rebuild them' % (model,))
+            return None
+
+        self.log.debug(
+            'memory-mapping the compiled spectra of the %s model' % (model,))
+        data = np.load(pathToData, mmap_mode="r")
+        compiled = {}
+        for filename, epoch, start, stop in zip(filenames, index["epochs"], index["starts"], index["stops"]):
+            compiled[filename] = (
+                float(epoch), (data[0, start:stop], data[1, start:stop]))
+        self._compiled[model] = compiled
+
+        return compiled
@@ -28,7 +28,7 @@ from commonutils import *
 ###################################################################
 # PUBLIC FUNCTIONS                                                #
 ###################################################################
-# LAST MODIFIED : April 12, 2013
+# LAST MODIFIED : October 18, 2026
 # CREATED : April 12, 2013
 # AUTHOR : DRYX
 def survey_cadence_arrays(
@@ -36,19 +36,23 @@ def survey_cadence_arrays(
         surveyCadenceSettings,
         pathToOutputDirectory,
         pathToOutputPlotDirectory,
-        plot=False):
+        plot=False,
+        randomState=None):
     """
     *Generate the survey cadence arrays for each filter*
 
+    Each filter's cadence is the intersection of boolean masks over the nights of the survey: the nights the moon is down, the observable season of each survey year, the nights not lost to the weather (one batched random draw for every night of the seasons) and the nights falling on the filter's ``repeat every ? days`` stride. Every survey year starts its season and its stride afresh on its own ``day of year of first scheduled observation``. The survey runs for ``Survey Length (years)`` survey years and each filter can be observed several times a night (``visits per night``, ``hours between visits`` apart).
+
     **Key Arguments:**
         - ``log`` -- logger
         - ``surveyCadenceSettings`` -- the survey cadence parameters as set in the simulation settings file
         - ``pathToOutputDirectory`` -- path to the output directory (provided by the user)
         - ``pathToOutputPlotDirectory`` -- path to add plots to
         - ``plot`` -- generate plot?
+        - ``randomState`` -- the ``numpy.random.RandomState`` to draw from. Default *None* (the global numpy random state)
 
     **Return:**
-        - ``cadenceDictionary`` -- a dictionary of { band : observedDayList }
+        - ``cadenceDictionary`` -- a dictionary of { band : observedDayList } - days since the start of the survey
     """
     ################ > IMPORTS ################
     ## STANDARD LIB ##
@@ -61,47 +65,53 @@ def survey_cadence_arrays(
     lunarMonth = 29.3
     surveyYear = 12. * lunarMonth
     ################ >ACTION(S) ################
+    if randomState is None:
+        randomState = np.random
+
     cadenceDictionary = {}
     obsFraction = surveyCadenceSettings['Observable Fraction of Year']
     lossFraction = surveyCadenceSettings[
         'Fraction of Year Lost to Weather etc']
+    numberOfYears = surveyCadenceSettings.get('Survey Length (years)', 1)
+    surveyLength = surveyYear * numberOfYears
     for thisFilter in surveyCadenceSettings['Filters']:
         # READ THE CADENCE PARAMETERS
         band = thisFilter['band']
         firstDay = thisFilter['day of year of first scheduled observation']
         repeatEvery = thisFilter['repeat every ? days']
         moonFraction = thisFilter['Fraction of Lunar Month Lost to Moon']
+        visitsPerNight = thisFilter.get('visits per night', 1)
+        hoursBetweenVisits = thisFilter.get('hours between visits', 1.)
+
+        # EVERY NIGHT OF EACH SURVEY YEAR FROM THAT YEAR'S FIRST SCHEDULED
+        # OBSERVATION
+        nightsPerYear = max(0, int(np.ceil(surveyYear - firstDay)))
+        yearStarts = np.repeat(
+            np.arange(numberOfYears) * surveyYear, nightsPerYear)
+        dayOfYear = np.tile(firstDay + np.arange(nightsPerYear), numberOfYears)
+        days = yearStarts + dayOfYear
 
         # DETERMINE DAYS LOST DUE TO MOON CYCLE
-        finalObsDayOfMonth = lunarMonth * (1. - moonFraction)
-        monthCount = 0
-        day = 1
-        monthDay = 1
-        moonDayList = []
-        while day < surveyYear:
-            while monthDay < int(lunarMonth):
-                if monthDay <= finalObsDayOfMonth:
-                    moonDayList.append(day)
-                monthDay += 1
-                day += 1
-            monthCount += 1
-            day = int(lunarMonth * monthCount)
-            # log.debug('month # %s starts on day %s' % (monthCount, day))
-            monthDay = 0
-
-        # DETERMINE THE DAYS THE TELESCOPE OBSERVES IN THIS FILTER
-        day = firstDay
-        nextObs = firstDay
-        obsDaysList = []
-        finalObsDayOfYear = obsFraction * surveyYear
-        while day <= finalObsDayOfYear:
-            randNum = np.random.rand()
-            if day == nextObs:
-                if day in moonDayList and randNum > lossFraction:
-                    obsDaysList.append(day)
-                nextObs = day + repeatEvery
-            day += 1
-            # log.debug('day # %s' % (day,))
+        moonMask = _moon_dark_mask(days, lunarMonth, moonFraction)
+
+        # THE OBSERVABLE SEASON OF EACH YEAR, AND THE DAYS OF IT NOT LOST TO
+        # THE WEATHER - ONE DRAW FOR EVERY DAY OF THE SEASONS
+        seasonMask = dayOfYear <= obsFraction * surveyYear
+        weatherMask = np.zeros(len(days), dtype=bool)
+        weatherMask[seasonMask] = randomState.rand(
+            seasonMask.sum()) > lossFraction
+
+        # THE DAYS THE TELESCOPE IS SCHEDULED TO OBSERVE IN THIS FILTER
+        strideMask = (dayOfYear - firstDay) % repeatEvery == 0
+
+        obsDays = days[moonMask & seasonMask & weatherMask & strideMask]
+
+        # REPEAT VISITS DURING EACH NIGHT
+        if visitsPerNight > 1:
+            obsDays = (obsDays[:, None] + np.arange(visitsPerNight)[
+                       None, :] * hoursBetweenVisits / 24.).ravel()
+            obsDays = obsDays[obsDays < surveyLength]
+        obsDaysList = obsDays.tolist()
 
         # ADD THE BAND & OBS ARRAY TO THE DICTIONARY
         cadenceDictionary[band] = obsDaysList
@@ -176,7 +186,67 @@ def survey_cadence_arrays(
     return cadenceDictionary
 
 
-# LAST MODIFIED : April 17, 2013
+# LAST MODIFIED : October 18, 2026
+# CREATED : October 18, 2026
+# AUTHOR : DRYX
+def survey_epoch_depths(
+        log,
+        cadenceDictionary,
+        limitingMags,
+        surveyCadenceSettings,
+        randomState=None):
+    """
+    *the limiting magnitude of each epoch of a synthetic survey cadence*
+
+    Each filter's limiting magnitude is made shallower by up to ``limiting magnitude loss at full moon`` magnitudes with the illumination of the moon, and scattered by ``limiting magnitude scatter from seeing`` magnitudes (one batched normal draw per filter).
+
+    **Key Arguments:**
+        - ``log`` -- logger
+        - ``cadenceDictionary`` -- a dictionary of { band : observedDayList }
+        - ``limitingMags`` -- the limiting magnitudes of the survey
+        - ``surveyCadenceSettings`` -- the survey cadence parameters as set in the simulation settings file
+        - ``randomState`` -- the ``numpy.random.RandomState`` to draw from. Default *None* (the global numpy random state)
+
+    **Return:**
+        - ``depthDictionary`` -- a dictionary of { band : array of the limiting magnitudes of the epochs }, or *None* if no filter's depth varies between epochs
+    """
+    ################ > IMPORTS ################
+    ## STANDARD LIB ##
+    ## THIRD PARTY ##
+    import numpy as np
+    ## LOCAL APPLICATION ##
+
+    ################ > VARIABLE SETTINGS ######
+    lunarMonth = 29.3
+    ################ >ACTION(S) ################
+    if randomState is None:
+        randomState = np.random
+
+    depthDictionary = {}
+    for thisFilter in surveyCadenceSettings['Filters']:
+        band = thisFilter['band']
+        moonLoss = thisFilter.get('limiting magnitude loss at full moon', 0.)
+        seeingScatter = thisFilter.get(
+            'limiting magnitude scatter from seeing', 0.)
+        if not moonLoss and not seeingScatter:
+            continue
+
+        days = np.asarray(cadenceDictionary[band], dtype=float)
+        depths = limitingMags[band] - moonLoss * \
+            _lunar_illumination(days, lunarMonth)
+        if seeingScatter:
+            depths += randomState.normal(0., seeingScatter, len(days))
+        depthDictionary[band] = depths
+        log.info('the %s-band epochs reach limiting magnitudes of %0.2f-%0.2f' %
+                 (band, depths.min() if len(depths) else np.nan, depths.max() if len(depths) else np.nan))
+
+    if not depthDictionary:
+        return None
+
+    return depthDictionary
+
+
+# LAST MODIFIED : October 18, 2026
 # CREATED : April 17, 2013
 # AUTHOR : DRYX
 def determine_if_sne_are_discoverable(
@@ -193,6 +263,7 @@ def determine_if_sne_are_discoverable(
     **Key Arguments:**
         - ``log`` -- logger
         - ``redshiftArray`` -- the array of random redshifts
+        - ``limitingMags`` -- the limiting magnitudes of the survey. When the epochs have their own depths, pass the deepest epoch of each filter
         - ``observedFrameLightCurveInfo`` -- the observed franme lightcurve info (dictionary)
         - ``pathToOutputDirectory`` -- path to the output directory (provided by the user)
         - ``pathToOutputPlotDirectory`` -- path to add plots to
@@ -262,7 +333,7 @@ def determine_if_sne_are_discoverable(
     return discoverableList
 
 
-# LAST MODIFIED : April 18, 2013
+# LAST MODIFIED : October 18, 2026
 # CREATED : April 18, 2013
 # AUTHOR : DRYX
 def determine_when_sne_are_ripe_for_discovery(
@@ -275,10 +346,13 @@ def determine_when_sne_are_ripe_for_discovery(
     """
     *Given the observe frame lightcurve, determine if the SNe are discoverable by the survey or not.*
 
+    The first time each SN rises brighter than the limiting magnitude (between explosion and peak) is found for all SNe at once: the lightcurves are evaluated on a coarse grid to bracket the first crossing and the bracket is then refined by a batched bisection.
+
     **Key Arguments:**
         - ``log`` -- logger
         - ``redshiftArray`` -- the array of random redshifts
-        - ``observedFrameLightCurveInfo`` -- the observed franme lightcurve info (dictionary)
+        - ``limitingMags`` -- the limiting magnitudes of the survey. When the epochs have their own depths, pass the deepest epoch of each filter
+        - ``observedFrameLightCurveInfo`` -- the observed frame lightcurves (a ``lightcurve_array``)
         - ``discoverableList`` -- a list of dictionaries describing if the object is discoverable in each filter and finally if it is discoverable in any filter.
         - ``plot`` -- generate plots?
 
@@ -287,68 +361,44 @@ def determine_when_sne_are_ripe_for_discovery(
     """
     ################ > IMPORTS ################
     ## STANDARD LIB ##
-    import math
     ## THIRD PARTY ##
+    import numpy as np
     ## LOCAL APPLICATION ##
 
     ################ >ACTION(S) ################
     filters = ['g', 'r', 'i', 'z']
-    models = ['he80', 'he100', 'he130']
+    numberOfObjects = len(redshiftArray)
+
+    # NaN FLAGS SNE THAT ARE NOT RIPE IN A FILTER
+    ripeDays = {}
+    for ffilter in filters:
+        discoverable = np.array([d[ffilter]
+                                 for d in discoverableList], dtype=bool)
+        objects = np.where(
+            discoverable & observedFrameLightCurveInfo.has_lightcurve(ffilter))[0]
+        ripeDays[ffilter] = np.ones(numberOfObjects) * np.nan
+        ripeDays[ffilter][objects] = _first_crossing_days(
+            lightCurves=observedFrameLightCurveInfo,
+            ffilter=ffilter,
+            limitingMag=limitingMags[ffilter],
+            objects=objects)
+        ripeDays[ffilter] = np.round(ripeDays[ffilter], 3).tolist()
 
     ripeDayList = []
-    for item in range(len(redshiftArray)):
-        #log.info("I AM HERE %s" % (item,))
+    for item in range(numberOfObjects):
         ripeDayDict = {}
-        if not discoverableList[item]["any"]:
-            ripeDayDict["any"] = False
-            for ffilter in filters:
-                ripeDayDict[ffilter] = False
-        else:
-            for ffilter in filters:
-                if not discoverableList[item][ffilter]:
-                    ripeDayDict[ffilter] = False
-                elif observedFrameLightCurveInfo[item]['lightCurves'][ffilter] is None:
-                    ripeDayDict[ffilter] = False
-                else:
-                    explosionDay = observedFrameLightCurveInfo[
-                        item]['explosionDay']
-                    lowerLimit = explosionDay
-                    upperLimit = 0.
-                    ripeDay = lowerLimit
-                    magGuess = observedFrameLightCurveInfo[
-                        item]['lightCurves'][ffilter](ripeDay)
-                    magDiff = limitingMags[ffilter] - magGuess
-
-                    if magGuess > limitingMags[ffilter]:
-                        while math.fabs(magDiff) > 0.01:
-                            if magGuess > limitingMags[ffilter]:
-                                #log.info('item %s ripeDay %s magGuess %s - going higher' % (item, ripeDay, magGuess))
-                                lowerLimit = ripeDay
-                                ripeDay = lowerLimit + \
-                                    (upperLimit - lowerLimit) / 2.
-                                magGuess = observedFrameLightCurveInfo[
-                                    item]['lightCurves'][ffilter](ripeDay)
-                            elif magGuess < limitingMags[ffilter]:
-                                #log.info('item %s ripeDay %s' % (item, ripeDay))
-                                upperLimit = ripeDay
-                                ripeDay = lowerLimit + \
-                                    (upperLimit - lowerLimit) / 2.
-                                magGuess = observedFrameLightCurveInfo[
-                                    item]['lightCurves'][ffilter](ripeDay)
-                            magDiff = limitingMags[ffilter] - magGuess
-
-                    ripeDay = float("%5.3f" % (ripeDay,))
-                    # log.info('SN#%s, filter %s, ripeDay %s' % (item, ffilter,
-                    # ripeDay,))
-                    ripeDayDict[ffilter] = ripeDay
-            ripeDayDict["any"] = False
+        for ffilter in filters:
+            ripeDay = ripeDays[ffilter][item]
+            if ripeDay != ripeDay:
+                ripeDay = False
+            ripeDayDict[ffilter] = ripeDay
+        ripeDayDict["any"] = False
+        if discoverableList[item]["any"]:
             for ffilter in filters:
                 if ripeDayDict[ffilter]:
                     ripeDayDict["any"] = True
         ripeDayList.append(ripeDayDict)
 
-    # log.info('ripeDayList %s' % (ripeDayList,))
-
     return ripeDayList
 
 
@@ -449,7 +499,7 @@ def determine_when_discovered_sne_disappear(
     return disappearDayList
 
 
-# LAST MODIFIED : April 18, 2013
+# LAST MODIFIED : October 18, 2026
 # CREATED : April 18, 2013
 # AUTHOR : DRYX
 def determine_if_sne_are_discovered(
@@ -459,18 +509,28 @@ def determine_if_sne_are_discovered(
         cadenceDictionary,
         observedFrameLightCurveInfo,
         extraSurveyConstraints,
-        plot=True):
+        plot=True,
+        randomState=None,
+        surveyLength=1,
+        limitingMagsPerEpoch=None):
     """
     *Generate a list of dictionaries which describe if and when a SN is discovered in each and any filter.*
 
+    Each filter is handled for all SNe at once: the first observation after each SN becomes visible is found with a binary search of the cadence and the campaign length is read off the magnitudes of each discovered SN at all of its following observations. The SNe become visible uniformly throughout the ``surveyLength`` years of the survey.
+
+    If ``limitingMagsPerEpoch`` is given (read from an observation log or from ``survey_epoch_depths``) each observation is compared against its own limiting magnitude rather than the filter's ``limitingMags`` value: the ripe days should then be found against the deepest epoch of each filter and an SN is discovered at the first observation from the one following its ripe day that is deep enough to detect it. The magnitudes of each SN at its following observations are compared against the depths of those observations in a single array comparison.
+
     **Key Arguments:**
         - ``log`` -- logger
         - ``limitingMags`` -- the limiting magnitudes of the survey
         - ``ripeDayList`` -- a list of dictionaries describing the time relative to peak that the SN reaches the limiting mag of the survey
         - ``cadenceDictionary``  -- a dictionary of { band : observedDayList }
-        - ``observedFrameLightCurveInfo`` -- the observed franme lightcurve info (dictionary)
+        - ``observedFrameLightCurveInfo`` -- the observed frame lightcurves (a ``lightcurve_array``)
         - ``extraConstraints`` -- some extra constraints
         - ``plot`` -- generate plots?
+        - ``randomState`` -- the ``numpy.random.RandomState`` to draw from. Default *None* (the global numpy random state)
+        - ``surveyLength`` -- the number of survey years the cadence spans. Default *1*
+        - ``limitingMagsPerEpoch`` -- a dictionary of { band : limitingMagList } giving the limiting magnitude of each epoch in ``cadenceDictionary``. Default *None*
 
     **Return:**
         - ``discoveredList`` -- a list of dictionaries which describe if and when a SN is discovered in each and any filter.
@@ -480,25 +540,248 @@ def determine_if_sne_are_discovered(
     ## THIRD PARTY ##
     import numpy as np
     ## LOCAL APPLICATION ##
+    from .cadence import cadence_index
 
     ################ >ACTION(S) ################
     filters = ['g', 'r', 'i', 'z']
-    models = ['he80', 'he100', 'he130']
     lunarMonth = 29.3
     surveyYear = 12. * lunarMonth
+    numberOfObjects = len(ripeDayList)
+    log.info('ripeDayList %s' % (numberOfObjects,))
+
+    if randomState is None:
+        randomState = np.random
+
+    # THE DAY OF THE SURVEY EACH SN BECOMES VISIBLE - ONE DRAW FOR ALL SNE
+    # SO THE STREAM DOES NOT DEPEND ON WHICH SNE ARE RIPE
+    visibleDays = randomState.random_sample(
+        numberOfObjects) * surveyYear * surveyLength
+
+    cadence = cadence_index(
+        log=log,
+        cadenceDictionary=cadenceDictionary,
+        surveyYear=surveyYear,
+        numberOfYears=surveyLength,
+        depthDictionary=limitingMagsPerEpoch
+    )
+    anyRipe = np.array([bool(d["any"]) for d in ripeDayList], dtype=bool)
+
+    # NaN FLAGS SNE THAT ARE NOT RIPE OR NOT DISCOVERED IN A FILTER
+    discoveries = _empty_discoveries(numberOfObjects, len(filters))
+    for column, ffilter in enumerate(filters):
+        ripeDays = np.array([d[ffilter] or np.nan for d in ripeDayList])
+        objects = np.where(anyRipe & ~np.isnan(ripeDays))[0]
+        discoveries["ripeDay"][objects, column] = ripeDays[objects]
+        surveyDays, lightCurveDays, campaignLengths, epochIndex = _discover_in_filter(
+            lightCurves=observedFrameLightCurveInfo,
+            cadence=cadence,
+            ffilter=ffilter,
+            limitingMag=limitingMags[ffilter],
+            objects=objects,
+            ripeDays=ripeDays[objects],
+            visibleDays=visibleDays[objects])
+        discoveries["surveyDiscoveryDay"][objects, column] = surveyDays
+        discoveries["lightCurveDiscoveryDay"][objects, column] = lightCurveDays
+        discoveries["campaignLength"][objects, column] = campaignLengths
+        if surveyLength > 1:
+            log.info('%s-band discoveries in each survey year: %s' % (ffilter, np.bincount(
+                cadence.survey_year(ffilter, epochIndex[~np.isnan(surveyDays)]), minlength=surveyLength).tolist(),))
+
+    return discovery_lists(log, discoveries, filters=filters)
+
+
+# LAST MODIFIED : October 18, 2026
+# CREATED : October 18, 2026
+# AUTHOR : DRYX
+def determine_sn_discoveries(
+        log,
+        redshiftArray,
+        limitingMags,
+        cadenceDictionary,
+        observedFrameLightCurveInfo,
+        pathToOutputPlotDirectory,
+        plot=True,
+        randomState=None,
+        surveyLength=1,
+        limitingMagsPerEpoch=None,
+        chunkSize=100000):
+    """
+    *Determine if each SN is discoverable, when it is ripe for discovery, if and when it is discovered and how long its campaign lasts - in every filter, in a single pass over the SNe.*
+
+    This fuses ``determine_if_sne_are_discoverable``, ``determine_when_sne_are_ripe_for_discovery`` and ``determine_if_sne_are_discovered``. The SNe are handled ``chunkSize`` at a time and each chunk runs through every stage in every filter before the next chunk starts, so no intermediate array spans the whole sample and no per-SN dictionaries are built between the stages. With the same random state the results match those of the three stages run in turn; ``discovery_lists`` converts them to the dictionaries written to the results file.
+
+    If ``limitingMagsPerEpoch`` is given an SN is discoverable (and ripe) once it is brighter than the deepest epoch of the filter and each observation is compared against its own depth.
+
+    **Key Arguments:**
+        - ``log`` -- logger
+        - ``redshiftArray`` -- the array of random redshifts (only used for the plot)
+        - ``limitingMags`` -- the limiting magnitudes of the survey
+        - ``cadenceDictionary``  -- a dictionary of { band : observedDayList }
+        - ``observedFrameLightCurveInfo`` -- the observed frame lightcurves (a ``lightcurve_array``)
+        - ``pathToOutputPlotDirectory`` -- path to add plots to
+        - ``plot`` -- generate plots?
+        - ``randomState`` -- the ``numpy.random.RandomState`` to draw the days the SNe become visible from. Default *None* (the global numpy random state)
+        - ``surveyLength`` -- the number of survey years the cadence spans. Default *1*
+        - ``limitingMagsPerEpoch`` -- a dictionary of { band : limitingMagList } giving the limiting magnitude of each epoch in ``cadenceDictionary``. Default *None*
+        - ``chunkSize`` -- the number of SNe handled in each pass (bounds the memory used). Default *100000*
+
+    **Return:**
+        - ``discoveries`` -- a structured array of shape (SNe, filters), the filters being g, r, i and z in that order, with the fields ``discoverable`` (bool), ``ripeDay``, ``surveyDiscoveryDay``, ``lightCurveDiscoveryDay`` and ``campaignLength`` (NaN where the SN is not ripe, or not discovered, in the filter)
+    """
+    ################ > IMPORTS ################
+    ## STANDARD LIB ##
+    ## THIRD PARTY ##
+    import numpy as np
+    ## LOCAL APPLICATION ##
+    from .cadence import cadence_index
+
+    ################ >ACTION(S) ################
+    filters = ['g', 'r', 'i', 'z']
+    lunarMonth = 29.3
+    surveyYear = 12. * lunarMonth
+    lightCurves = observedFrameLightCurveInfo
+    numberOfObjects = len(lightCurves)
+
+    if randomState is None:
+        randomState = np.random
+
+    # THE DAY OF THE SURVEY EACH SN BECOMES VISIBLE - ONE DRAW FOR ALL SNE
+    # SO THE STREAM DOES NOT DEPEND ON THE CHUNKING
+    visibleDays = randomState.random_sample(
+        numberOfObjects) * surveyYear * surveyLength
+
+    cadence = cadence_index(
+        log=log,
+        cadenceDictionary=cadenceDictionary,
+        surveyYear=surveyYear,
+        numberOfYears=surveyLength,
+        depthDictionary=limitingMagsPerEpoch
+    )
+
+    # WHEN EACH EPOCH HAS ITS OWN DEPTH AN SN IS DISCOVERABLE (AND RIPE)
+    # ONCE IT IS BRIGHTER THAN THE DEEPEST EPOCH OF THE FILTER
+    deepestLimitingMags = dict(limitingMags)
+    for band, depths in cadence.depths.iteritems():
+        if len(depths):
+            deepestLimitingMags[band] = float(np.max(depths))
+
+    discoveries = _empty_discoveries(numberOfObjects, len(filters))
+    yearCounts = {}
+    for ffilter in filters:
+        yearCounts[ffilter] = np.zeros(surveyLength, dtype=int)
+
+    for start in range(0, numberOfObjects, chunkSize):
+        chunk = np.arange(start, min(start + chunkSize, numberOfObjects))
+        log.debug('determining the discoveries of SNe %s to %s' %
+                  (start, chunk[-1],))
+
+        for column, ffilter in enumerate(filters):
+            # DISCOVERABLE UNLESS FAINTER THAN THE LIMIT AT PEAK (SNE WITH NO
+            # LIGHTCURVE HAVE A NaN PEAK AND COUNT AS DISCOVERABLE, AS IN THE
+            # DICTIONARIES)
+            with np.errstate(invalid="ignore"):
+                discoverable = ~(lightCurves.peak_magnitudes(
+                    ffilter, objects=chunk) > deepestLimitingMags[ffilter])
+            discoveries["discoverable"][chunk, column] = discoverable
+
+            # THE FIRST DAY EACH DISCOVERABLE SN RISES ABOVE THE LIMIT - A
+            # RIPE DAY OF ZERO DOES NOT COUNT, AS IN THE DICTIONARIES
+            objects = chunk[discoverable & lightCurves.has_lightcurve(
+                ffilter, objects=chunk)]
+            ripeDays = np.round(_first_crossing_days(
+                lightCurves=lightCurves,
+                ffilter=ffilter,
+                limitingMag=deepestLimitingMags[ffilter],
+                objects=objects), 3)
+            ripe = ~np.isnan(ripeDays) & (ripeDays != 0)
+            objects, ripeDays = objects[ripe], ripeDays[ripe]
+            discoveries["ripeDay"][objects, column] = ripeDays
+
+            # IF, WHEN AND FOR HOW LONG THE RIPE SNE ARE DISCOVERED
+            surveyDays, lightCurveDays, campaignLengths, epochIndex = _discover_in_filter(
+                lightCurves=lightCurves,
+                cadence=cadence,
+                ffilter=ffilter,
+                limitingMag=limitingMags[ffilter],
+                objects=objects,
+                ripeDays=ripeDays,
+                visibleDays=visibleDays[objects])
+            discoveries["surveyDiscoveryDay"][objects, column] = surveyDays
+            discoveries["lightCurveDiscoveryDay"][
+                objects, column] = lightCurveDays
+            discoveries["campaignLength"][objects, column] = campaignLengths
+            if surveyLength > 1:
+                yearCounts[ffilter] += np.bincount(cadence.survey_year(
+                    ffilter, epochIndex[~np.isnan(surveyDays)]), minlength=surveyLength)
+
+    if surveyLength > 1:
+        for ffilter in filters:
+            log.info('%s-band discoveries in each survey year: %s' %
+                     (ffilter, yearCounts[ffilter].tolist(),))
+
+    if plot:
+        anyDiscoverable = discoveries["discoverable"].any(axis=1)
+        dataDictionary = {'Discoverable': np.asarray(redshiftArray)[anyDiscoverable],
+                          'Undiscoverable': np.asarray(redshiftArray)[~anyDiscoverable]}
+        plot_polar(
+            log,
+            title="Discoverable SN Redshift Distribution",
+            dataDictionary=dataDictionary,
+            pathToOutputPlotsFolder=pathToOutputPlotDirectory,
+            dataRange=False,
+            ylabel=False,
+            radius=np.max(redshiftArray) * 1.1,
+            circumference=False,
+            prependNum=False)
+
+    return discoveries
+
+
+# LAST MODIFIED : October 18, 2026
+# CREATED : October 18, 2026
+# AUTHOR : DRYX
+def discovery_lists(
+        log,
+        discoveries,
+        filters=['g', 'r', 'i', 'z']):
+    """
+    *Convert the structured discovery array into the lists of dictionaries which describe if and when each SN is discovered in each and any filter.*
+
+    An SN is ripe if it has a ripe day in any filter; the dictionaries of SNe that are not ripe are all *False*.
+
+    **Key Arguments:**
+        - ``log`` -- logger
+        - ``discoveries`` -- the structured array of shape (SNe, filters) returned by ``determine_sn_discoveries``
+        - ``filters`` -- the filters of the columns of ``discoveries``. Default *['g', 'r', 'i', 'z']*
+
+    **Return:**
+        - ``lightCurveDiscoveryDayList`` -- a list of dictionaries of the lightcurve day (relative to peak) each SN is discovered in each filter
+        - ``surveyDiscoveryDayList`` -- a list of dictionaries of the day of the survey each SN is discovered in each filter
+        - ``snCampaignLengthList`` -- a list of dictionaries of each SN's campaign length in each filter and the longest of them (``max``)
+    """
+    ################ > IMPORTS ################
+    ## STANDARD LIB ##
+    ## THIRD PARTY ##
+    import numpy as np
+    ## LOCAL APPLICATION ##
+
+    ################ >ACTION(S) ################
+    ripeDays = discoveries["ripeDay"]
+    anyRipe = np.any(~np.isnan(ripeDays) & (ripeDays != 0), axis=1)
+
+    # PLAIN PYTHON FLOATS FOR THE RESULTS FILE
+    surveyDiscoveryDays = discoveries["surveyDiscoveryDay"].tolist()
+    lightCurveDiscoveryDays = discoveries["lightCurveDiscoveryDay"].tolist()
+    campaignLengths = discoveries["campaignLength"].tolist()
 
     surveyDiscoveryDayList = []
     lightCurveDiscoveryDayList = []
     snCampaignLengthList = []
-    log.info('ripeDayList %s' % (len(ripeDayList),))
-    for item in range(len(ripeDayList)):
-        lightCurveEndDay = observedFrameLightCurveInfo[
-            item]['endOfLightcurveDay']
-        visibleDay = np.random.rand() * surveyYear
+    for item in range(len(discoveries)):
         surveyDiscoveryDayDict = {}
         lightCurveDiscoverDayDict = {}
         snCampaignLengthDict = {}
-        if not ripeDayList[item]["any"]:
+        if not anyRipe[item]:
             surveyDiscoveryDayDict["any"] = False
             lightCurveDiscoverDayDict["any"] = False
             snCampaignLengthDict["any"] = False
@@ -506,89 +789,577 @@ def determine_if_sne_are_discovered(
                 lightCurveDiscoverDayDict[ffilter] = False
                 surveyDiscoveryDayDict[ffilter] = False
                 snCampaignLengthDict[ffilter] = False
-            # log.info('NOTHING SEEN IN ANY FILTER FOR ITEM %s' % (item,))
-            lightCurveDiscoveryDayList.append(lightCurveDiscoverDayDict)
-            surveyDiscoveryDayList.append(surveyDiscoveryDayDict)
-            snCampaignLengthList.append(snCampaignLengthDict)
         else:
-            for ffilter in filters:
-                if not ripeDayList[item][ffilter]:
-                    surveyDiscoveryDayDict[ffilter] = False
-                    lightCurveDiscoverDayDict[ffilter] = False
-                    snCampaignLengthDict[ffilter] = False
-                    # log.info('item %s, filter %s, NOT DISCOVERED' % (item, ffilter))
-                else:
-                    if visibleDay > max(cadenceDictionary[ffilter]):
-                        waitingTime = surveyYear + \
-                            min(cadenceDictionary[ffilter]) - visibleDay
-                        surveyDiscoveryDayDict[ffilter] = min(
-                            cadenceDictionary[ffilter])
-                        cdIndex = 0
-                    else:
-                        cdIndex = -1
-                        for day in cadenceDictionary[ffilter]:
-                            cdIndex += 1
-                            if day > visibleDay:
-                                waitingTime = day - visibleDay
-                                surveyDiscoveryDayDict[ffilter] = day
-                                break
-
-                    lightCurveDiscoverDayDict[ffilter] = ripeDayList[
-                        item][ffilter] + waitingTime
-                    if observedFrameLightCurveInfo[item]['lightCurves'][ffilter](lightCurveDiscoverDayDict[ffilter]) > limitingMags[ffilter]:
-                        lightCurveDiscoverDayDict[ffilter] = False
-                        surveyDiscoveryDayDict[ffilter] = False
-                        snCampaignLengthDict[ffilter] = False
-                    else:
-                        snCampaignLengthDict[ffilter] = 0
-                        lcDay = lightCurveDiscoverDayDict[ffilter]
-                        cdIndex += 1
-                        while 1 > 0:
-                            if cdIndex >= len(cadenceDictionary[ffilter]):
-                                log.info('item: %s. NEXT YEAR: cdIndex %s, len(cadenceDictionary[ffilter]) %s' % (
-                                    item, cdIndex, len(cadenceDictionary[ffilter])))
-                                nextLcDay = lcDay + surveyYear + \
-                                    min(cadenceDictionary[
-                                        ffilter]) - max(cadenceDictionary[ffilter])
-                                cdIndex = 1
-                            else:
-                                log.info('item: %s. SAME YEAR: cdIndex %s, len(cadenceDictionary[ffilter]) %s' % (
-                                    item, cdIndex, len(cadenceDictionary[ffilter])))
-                                nextLcDay = lcDay + \
-                                    cadenceDictionary[ffilter][
-                                        cdIndex] - cadenceDictionary[ffilter][cdIndex - 1]
-                                cdIndex += 1
-                            if observedFrameLightCurveInfo[item]['lightCurves'][ffilter](nextLcDay) < limitingMags[ffilter] and (lightCurveEndDay > nextLcDay):
-                                snCampaignLengthDict[
-                                    ffilter] += nextLcDay - lcDay
-                                log.info('campaign length %s, filter %s' % (
-                                    snCampaignLengthDict[ffilter], ffilter))
-                                lcDay = nextLcDay
-                            else:
-                                break
-
             surveyDiscoveryDayDict['any'] = False
             lightCurveDiscoverDayDict['any'] = False
             snCampaignLengthDict['max'] = 0
-            for ffilter in filters:
-                if surveyDiscoveryDayDict[ffilter]:
+            for column, ffilter in enumerate(filters):
+                surveyDiscoveryDay = surveyDiscoveryDays[item][column]
+                if surveyDiscoveryDay != surveyDiscoveryDay:
+                    surveyDiscoveryDayDict[ffilter] = False
+                    lightCurveDiscoverDayDict[ffilter] = False
+                    snCampaignLengthDict[ffilter] = False
+                    continue
+                surveyDiscoveryDayDict[ffilter] = surveyDiscoveryDay
+                lightCurveDiscoverDayDict[
+                    ffilter] = lightCurveDiscoveryDays[item][column]
+                snCampaignLengthDict[ffilter] = campaignLengths[item][column]
+                if surveyDiscoveryDay:
                     surveyDiscoveryDayDict['any'] = True
                     lightCurveDiscoverDayDict['any'] = True
                 if snCampaignLengthDict[ffilter] > snCampaignLengthDict['max']:
                     snCampaignLengthDict['max'] = snCampaignLengthDict[ffilter]
-            lightCurveDiscoveryDayList.append(lightCurveDiscoverDayDict)
-            surveyDiscoveryDayList.append(surveyDiscoveryDayDict)
-            snCampaignLengthList.append(snCampaignLengthDict)
-
-    # log.info('surveyDiscoveryDayList %s' % (len(surveyDiscoveryDayList),))
-    # log.info('lightCurveDiscoveryDayList %s' % (len(lightCurveDiscoveryDayList),))
-    # log.info('snCampaignLengthList %s' % (len(snCampaignLengthList),))
+        lightCurveDiscoveryDayList.append(lightCurveDiscoverDayDict)
+        surveyDiscoveryDayList.append(surveyDiscoveryDayDict)
+        snCampaignLengthList.append(snCampaignLengthDict)
 
     return lightCurveDiscoveryDayList, surveyDiscoveryDayList, snCampaignLengthList
 
 ###################################################################
 # PRIVATE (HELPER) FUNCTIONS                                      #
 ###################################################################
+# LAST MODIFIED : October 18, 2026
+# CREATED : October 18, 2026
+# AUTHOR : DRYX
+def _moon_dark_mask(
+        days,
+        lunarMonth,
+        moonFraction):
+    """
+    *which days can be observed given the phase of the moon*
+
+    Lunar month ``n`` starts on day ``int(n * lunarMonth)`` (the first on day 1) and the first ``(1 - moonFraction)`` of each month is dark time.
+
+    **Key Arguments:**
+        - ``days`` -- array of days of the survey (a fractional day belongs to the night it falls in)
+        - ``lunarMonth`` -- the length of the lunar month (days)
+        - ``moonFraction`` -- the fraction of the lunar month lost to the moon
+
+    **Return:**
+        - ``moonMask`` -- boolean array, True for the days the moon is down
+    """
+    ################ > IMPORTS ################
+    ## STANDARD LIB ##
+    ## THIRD PARTY ##
+    import numpy as np
+    ## LOCAL APPLICATION ##
+
+    ################ >ACTION(S) ################
+    nights = np.floor(np.asarray(days, dtype=float))
+    dayOfMonth = _day_of_lunar_month(nights, lunarMonth)
+
+    return (nights >= 1) & \
+        (dayOfMonth < int(lunarMonth)) & \
+        (dayOfMonth <= lunarMonth * (1. - moonFraction))
+
+
+# LAST MODIFIED : October 18, 2026
+# CREATED : October 18, 2026
+# AUTHOR : DRYX
+def _lunar_illumination(
+        days,
+        lunarMonth):
+    """
+    *the illuminated fraction of the moon on each given day - new at the start of each lunar month (the dark time) and full half-way through*
+
+    **Key Arguments:**
+        - ``days`` -- array of days of the survey
+        - ``lunarMonth`` -- the length of the lunar month (days)
+
+    **Return:**
+        - ``illumination`` -- array of illuminated fractions between 0 and 1
+    """
+    ################ > IMPORTS ################
+    ## STANDARD LIB ##
+    ## THIRD PARTY ##
+    import numpy as np
+    ## LOCAL APPLICATION ##
+
+    ################ >ACTION(S) ################
+    nights = np.floor(np.asarray(days, dtype=float))
+    phase = _day_of_lunar_month(nights, lunarMonth) / lunarMonth
+
+    return 0.5 * (1. - np.cos(2. * np.pi * phase))
+
+
+# LAST MODIFIED : October 18, 2026
+# CREATED : October 18, 2026
+# AUTHOR : DRYX
+def _day_of_lunar_month(
+        nights,
+        lunarMonth):
+    """
+    *the day of the lunar month of each night - lunar month ``n`` starts on night ``int(n * lunarMonth)``*
+
+    **Key Arguments:**
+        - ``nights`` -- array of whole nights of the survey
+        - ``lunarMonth`` -- the length of the lunar month (days)
+
+    **Return:**
+        - ``dayOfMonth`` -- array of the days since the start of each night's lunar month
+    """
+    ################ > IMPORTS ################
+    ## STANDARD LIB ##
+    ## THIRD PARTY ##
+    import numpy as np
+    ## LOCAL APPLICATION ##
+
+    ################ >ACTION(S) ################
+    if not len(nights):
+        return np.zeros(0)
+
+    monthStarts = np.floor(
+        np.arange(int(nights.max() / lunarMonth) + 2) * lunarMonth)
+    month = np.searchsorted(monthStarts, nights, side="right") - 1
+
+    return nights - monthStarts[np.maximum(month, 0)]
+
+
+# LAST MODIFIED : October 18, 2026
+# CREATED : October 18, 2026
+# AUTHOR : DRYX
+def _first_crossing_days(
+        lightCurves,
+        ffilter,
+        limitingMag,
+        objects,
+        gridPoints=64,
+        tolerance=1e-4,
+        chunkSize=50000):
+    """
+    *the first day (between explosion and peak) each object becomes brighter than the limiting magnitude*
+
+    The lightcurves are evaluated on a grid of ``gridPoints`` days from explosion to day zero. The first grid day at or brighter than the limit brackets the crossing with the (fainter) grid day before it and that bracket is refined by bisection. A lightcurve that only dips brighter than the limit between two grid days is not seen.
+
+    **Key Arguments:**
+        - ``lightCurves`` -- the observed frame lightcurves (a ``lightcurve_array``)
+        - ``ffilter`` -- the filter
+        - ``limitingMag`` -- the limiting magnitude in this filter
+        - ``objects`` -- index of the objects to solve for
+        - ``gridPoints`` -- number of points of the coarse grid used to bracket the first crossing. Default *64*
+        - ``tolerance`` -- the width (days) the brackets are refined to. Default *1e-4*
+        - ``chunkSize`` -- number of objects handled in each batch (bounds the memory of the grid). Default *50000*
+
+    **Return:**
+        - ``ripeDays`` -- array of days relative to peak, one per object (NaN for objects never brighter than the limit on the grid)
+    """
+    ################ > IMPORTS ################
+    ## STANDARD LIB ##
+    ## THIRD PARTY ##
+    import numpy as np
+    ## LOCAL APPLICATION ##
+
+    ################ >ACTION(S) ################
+    objects = np.asarray(objects)
+    ripeDays = np.zeros(len(objects))
+    fractions = np.linspace(0., 1., gridPoints)
+
+    for start in range(0, len(objects), chunkSize):
+        chunk = objects[start:start + chunkSize]
+        rows = np.arange(len(chunk))
+
+        # COARSE GRID FROM EXPLOSION (FRACTION 0) TO PEAK (FRACTION 1)
+        explosionDay = lightCurves.explosionDay[chunk]
+        grid = explosionDay[:, None] * (1. - fractions[None, :])
+        bright = lightCurves.evaluate(
+            ffilter, grid, objects=chunk) <= limitingMag
+        crosses = bright.any(axis=1)
+        first = np.argmax(bright, axis=1)
+        ripe = np.where(crosses, grid[rows, first], np.nan)
+
+        # SNE ALREADY BRIGHT ENOUGH AT EXPLOSION ARE RIPE ON THAT DAY - REFINE
+        # THE [FAINT, BRIGHT] BRACKET OF ALL OTHERS BY BISECTION
+        refine = np.where(crosses & (first > 0))[0]
+        if len(refine):
+            lower = grid[refine, first[refine] - 1]
+            upper = ripe[refine]
+            maxWidth = np.max(upper - lower)
+            iterations = int(
+                np.ceil(np.log2(max(maxWidth, tolerance) / tolerance)))
+            for i in range(iterations):
+                middle = 0.5 * (lower + upper)
+                faint = lightCurves.evaluate(
+                    ffilter, middle, objects=chunk[refine]) > limitingMag
+                lower = np.where(faint, middle, lower)
+                upper = np.where(faint, upper, middle)
+            ripe[refine] = 0.5 * (lower + upper)
+
+        ripeDays[start:start + chunkSize] = ripe
+
+    return ripeDays
+
+
+# LAST MODIFIED : October 18, 2026
+# CREATED : April 18, 2013
+# AUTHOR : DRYX
+def _ripe_days_by_bisection(
+        log,
+        limitingMags,
+        observedFrameLightCurveInfo,
+        discoverableList):
+    """
+    *the original per-object, per-filter bisection for the day each SN becomes ripe for discovery - kept to validate and benchmark the batched solver*
+
+    **Key Arguments:**
+        - ``log`` -- logger
+        - ``limitingMags`` -- the limiting magnitudes of the survey
+        - ``observedFrameLightCurveInfo`` -- the observed frame lightcurves
+        - ``discoverableList`` -- a list of dictionaries describing if the object is discoverable in each filter and finally if it is discoverable in any filter.
+
+    **Return:**
+        - ``ripeDayList`` -- a list of dictionaries describing the time relative to peak that the SN reaches the limiting mag of the survey
+    """
+    ################ > IMPORTS ################
+    ## STANDARD LIB ##
+    import math
+    ## THIRD PARTY ##
+    ## LOCAL APPLICATION ##
+
+    ################ >ACTION(S) ################
+    filters = ['g', 'r', 'i', 'z']
+
+    ripeDayList = []
+    for item in range(len(discoverableList)):
+        ripeDayDict = {}
+        if not discoverableList[item]["any"]:
+            ripeDayDict["any"] = False
+            for ffilter in filters:
+                ripeDayDict[ffilter] = False
+        else:
+            lightCurveInfo = observedFrameLightCurveInfo[item]
+            for ffilter in filters:
+                if not discoverableList[item][ffilter]:
+                    ripeDayDict[ffilter] = False
+                elif lightCurveInfo['lightCurves'][ffilter] is None:
+                    ripeDayDict[ffilter] = False
+                else:
+                    lightCurve = lightCurveInfo['lightCurves'][ffilter]
+                    lowerLimit = lightCurveInfo['explosionDay']
+                    upperLimit = 0.
+                    ripeDay = lowerLimit
+                    magGuess = lightCurve(ripeDay)
+                    magDiff = limitingMags[ffilter] - magGuess
+
+                    if magGuess > limitingMags[ffilter]:
+                        while math.fabs(magDiff) > 0.01:
+                            if magGuess > limitingMags[ffilter]:
+                                lowerLimit = ripeDay
+                            elif magGuess < limitingMags[ffilter]:
+                                upperLimit = ripeDay
+                            ripeDay = lowerLimit + \
+                                (upperLimit - lowerLimit) / 2.
+                            magGuess = lightCurve(ripeDay)
+                            magDiff = limitingMags[ffilter] - magGuess
+
+                    ripeDayDict[ffilter] = float("%5.3f" % (ripeDay,))
+            ripeDayDict["any"] = False
+            for ffilter in filters:
+                if ripeDayDict[ffilter]:
+                    ripeDayDict["any"] = True
+        ripeDayList.append(ripeDayDict)
+
+    return ripeDayList
+
+
+# LAST MODIFIED : October 18, 2026
+# CREATED : October 18, 2026
+# AUTHOR : DRYX
+def _first_detections(
+        lightCurves,
+        cadence,
+        ffilter,
+        objects,
+        firstDays,
+        epochIndex,
+        maxElements=4000000):
+    """
+    *the first observation, from the given one onwards, at which each SN is brighter than that observation's limiting magnitude*
+
+    **Key Arguments:**
+        - ``lightCurves`` -- the observed frame lightcurves (a ``lightcurve_array``)
+        - ``cadence`` -- the survey's ``cadence_index`` (with per-epoch depths for this filter)
+        - ``ffilter`` -- the filter
+        - ``objects`` -- index of the objects
+        - ``firstDays`` -- the lightcurve day (relative to peak) of each object at its first observation
+        - ``epochIndex`` -- the index of each object's first observation in the filter's sorted cadence
+        - ``maxElements`` -- the largest (objects x observations) magnitude grid evaluated at once. Default *4000000*
+
+    **Return:**
+        - ``detected`` -- boolean array, True for the objects detected before their lightcurves end
+        - ``detectionDays`` -- the lightcurve day (relative to peak) of each detection
+        - ``detectionIndex`` -- the index of each detecting observation in the filter's sorted cadence
+    """
+    ################ > IMPORTS ################
+    ## STANDARD LIB ##
+    ## THIRD PARTY ##
+    import numpy as np
+    ## LOCAL APPLICATION ##
+
+    ################ >ACTION(S) ################
+    objects = np.asarray(objects)
+    firstDays = np.asarray(firstDays, dtype=float)
+    epochIndex = np.asarray(epochIndex)
+    detected = np.zeros(len(objects), dtype=bool)
+    detectionDays = firstDays.copy()
+    detectionIndex = epochIndex.copy()
+    lightCurveEndDays = lightCurves.endOfLightcurveDay[objects]
+
+    # THE FIRST OBSERVATION AND THOSE FOLLOWING IT BEFORE THE LIGHTCURVE ENDS
+    counts = 1 + cadence.count_within(
+        ffilter, epochIndex, lightCurveEndDays - firstDays)
+
+    # SIZE THE CHUNKS SO THE MAGNITUDE GRID STAYS WITHIN maxElements
+    for chunk in _grid_chunks(counts, maxElements):
+        rows = chunk.stop - chunk.start
+        numberOfEpochs = counts[chunk].max()
+
+        offsets = np.hstack([np.zeros((rows, 1)), cadence.future_offsets(
+            ffilter, epochIndex[chunk], numberOfEpochs - 1)])
+        depths = np.hstack([cadence.epoch_depths(ffilter, epochIndex[chunk], None)[:, None], cadence.future_depths(
+            ffilter, epochIndex[chunk], numberOfEpochs - 1, None)])
+        lightCurveDays = firstDays[chunk][:, None] + offsets
+
+        # THE FIRST OBSERVATION ALWAYS COUNTS, LATER ONES ONLY BEFORE THE END
+        # OF THE LIGHTCURVE
+        inLightCurve = lightCurveDays < lightCurveEndDays[chunk][:, None]
+        inLightCurve[:, 0] = True
+        hits = (lightCurves.evaluate(ffilter, lightCurveDays, objects=objects[chunk]) <= depths) & \
+            inLightCurve
+        firstHit = np.argmax(hits, axis=1)
+        rowIndex = np.arange(rows)
+        detected[chunk] = hits[rowIndex, firstHit]
+        detectionDays[chunk] = lightCurveDays[rowIndex, firstHit]
+        detectionIndex[chunk] = (
+            epochIndex[chunk] + firstHit) % len(cadence.epochs[ffilter])
+
+    return detected, detectionDays, detectionIndex
+
+
+# LAST MODIFIED : October 18, 2026
+# CREATED : October 18, 2026
+# AUTHOR : DRYX
+def _empty_discoveries(
+        numberOfObjects,
+        numberOfFilters):
+    """
+    *a structured (objects x filters) discovery array with nothing discoverable, ripe or discovered*
+
+    **Key Arguments:**
+        - ``numberOfObjects`` -- the number of SNe
+        - ``numberOfFilters`` -- the number of filters
+
+    **Return:**
+        - ``discoveries`` -- the structured array, its flags False and its days and campaign lengths NaN
+    """
+    ################ > IMPORTS ################
+    ## STANDARD LIB ##
+    ## THIRD PARTY ##
+    import numpy as np
+    ## LOCAL APPLICATION ##
+
+    ################ >ACTION(S) ################
+    discoveries = np.zeros((numberOfObjects, numberOfFilters), dtype=[
+        ("discoverable", bool),
+        ("ripeDay", float),
+        ("surveyDiscoveryDay", float),
+        ("lightCurveDiscoveryDay", float),
+        ("campaignLength", float)])
+    for field in ["ripeDay", "surveyDiscoveryDay", "lightCurveDiscoveryDay", "campaignLength"]:
+        discoveries[field] = np.nan
+
+    return discoveries
+
+
+# LAST MODIFIED : October 18, 2026
+# CREATED : October 18, 2026
+# AUTHOR : DRYX
+def _discover_in_filter(
+        lightCurves,
+        cadence,
+        ffilter,
+        limitingMag,
+        objects,
+        ripeDays,
+        visibleDays):
+    """
+    *if and when the ripe SNe are discovered in one filter, and how long each stays detected*
+
+    **Key Arguments:**
+        - ``lightCurves`` -- the observed frame lightcurves (a ``lightcurve_array``)
+        - ``cadence`` -- the survey's ``cadence_index``
+        - ``ffilter`` -- the filter
+        - ``limitingMag`` -- the limiting magnitude in this filter (used if the cadence has no per-epoch depths)
+        - ``objects`` -- index of the objects ripe in this filter
+        - ``ripeDays`` -- the day (relative to peak) each object becomes ripe for discovery
+        - ``visibleDays`` -- the day of the survey each object becomes visible
+
+    **Return:**
+        - ``surveyDiscoveryDays`` -- the day of the survey each object is discovered (NaN if it is not)
+        - ``lightCurveDiscoveryDays`` -- the lightcurve day (relative to peak) of each discovery (NaN if not discovered)
+        - ``campaignLengths`` -- the campaign length of each object (NaN if not discovered)
+        - ``epochIndex`` -- the index of each object's discovery observation in the filter's sorted cadence
+    """
+    ################ > IMPORTS ################
+    ## STANDARD LIB ##
+    ## THIRD PARTY ##
+    import numpy as np
+    ## LOCAL APPLICATION ##
+
+    ################ >ACTION(S) ################
+    objects = np.asarray(objects)
+    ripeDays = np.asarray(ripeDays, dtype=float)
+    surveyDiscoveryDays = np.ones(len(objects)) * np.nan
+    lightCurveDiscoveryDays = np.ones(len(objects)) * np.nan
+    campaignLengths = np.ones(len(objects)) * np.nan
+
+    # THE FIRST OBSERVATION AFTER EACH SN BECOMES VISIBLE
+    observationDays, waitingTimes, epochIndex = cadence.next_observation(
+        ffilter, visibleDays)
+    candidates = np.where(epochIndex >= 0)[0]
+    lightCurveDays = ripeDays[candidates] + waitingTimes[candidates]
+
+    if ffilter in cadence.depths:
+        # EACH EPOCH HAS ITS OWN DEPTH - DISCOVERED AT THE FIRST
+        # OBSERVATION FROM THEN ON THAT IS DEEP ENOUGH
+        seen, lightCurveDays, detectionIndex = _first_detections(
+            lightCurves=lightCurves,
+            cadence=cadence,
+            ffilter=ffilter,
+            objects=objects[candidates],
+            firstDays=lightCurveDays,
+            epochIndex=epochIndex[candidates])
+        epochIndex[candidates] = detectionIndex
+        observationDays[candidates] = cadence.epochs[ffilter][detectionIndex]
+    else:
+        # DISCOVERED IF STILL BRIGHTER THAN THE LIMIT AT THAT OBSERVATION
+        seen = lightCurves.evaluate(
+            ffilter, lightCurveDays, objects=objects[candidates]) <= limitingMag
+    discovered = candidates[seen]
+    surveyDiscoveryDays[discovered] = observationDays[discovered]
+    lightCurveDiscoveryDays[discovered] = lightCurveDays[seen]
+    campaignLengths[discovered] = _campaign_lengths(
+        lightCurves=lightCurves,
+        cadence=cadence,
+        ffilter=ffilter,
+        limitingMag=limitingMag,
+        objects=objects[discovered],
+        discoveryDays=lightCurveDays[seen],
+        epochIndex=epochIndex[discovered])
+
+    return surveyDiscoveryDays, lightCurveDiscoveryDays, campaignLengths, epochIndex
+
+
+# LAST MODIFIED : October 18, 2026
+# CREATED : October 18, 2026
+# AUTHOR : DRYX
+def _campaign_lengths(
+        lightCurves,
+        cadence,
+        ffilter,
+        limitingMag,
+        objects,
+        discoveryDays,
+        epochIndex,
+        maxElements=4000000):
+    """
+    *how long (days) each discovered SN stays brighter than the limiting magnitude at the survey's following observations*
+
+    Each observation is compared against its own depth if the cadence carries per-epoch limiting magnitudes.
+
+    **Key Arguments:**
+        - ``lightCurves`` -- the observed frame lightcurves (a ``lightcurve_array``)
+        - ``cadence`` -- the survey's ``cadence_index``
+        - ``ffilter`` -- the filter
+        - ``limitingMag`` -- the limiting magnitude in this filter (used if the cadence has no per-epoch depths)
+        - ``objects`` -- index of the discovered objects
+        - ``discoveryDays`` -- the lightcurve day (relative to peak) of each object's discovery
+        - ``epochIndex`` -- the index of each object's discovery observation in the filter's sorted cadence
+        - ``maxElements`` -- the largest (objects x observations) magnitude grid evaluated at once. Default *4000000*
+
+    **Return:**
+        - ``campaignLengths`` -- array of the days between discovery and the last observation at which each SN is still detected
+    """
+    ################ > IMPORTS ################
+    ## STANDARD LIB ##
+    ## THIRD PARTY ##
+    import numpy as np
+    ## LOCAL APPLICATION ##
+
+    ################ >ACTION(S) ################
+    objects = np.asarray(objects)
+    campaignLengths = np.zeros(len(objects))
+    lightCurveEndDays = lightCurves.endOfLightcurveDay[objects]
+
+    # ONLY OBSERVATIONS BEFORE THE END OF THE LIGHTCURVE CAN EXTEND THE CAMPAIGN
+    counts = cadence.count_within(
+        ffilter, epochIndex, lightCurveEndDays - discoveryDays)
+
+    # SIZE THE CHUNKS SO THE MAGNITUDE GRID STAYS WITHIN maxElements
+    for chunk in _grid_chunks(counts, maxElements):
+        numberOfEpochs = counts[chunk].max()
+        if numberOfEpochs < 1:
+            continue
+
+        lightCurveDays = discoveryDays[chunk][:, None] + cadence.future_offsets(
+            ffilter, epochIndex[chunk], numberOfEpochs)
+        depths = cadence.future_depths(
+            ffilter, epochIndex[chunk], numberOfEpochs, limitingMag)
+        detected = (lightCurves.evaluate(ffilter, lightCurveDays, objects=objects[chunk]) < depths) & (
+            lightCurveDays < lightCurveEndDays[chunk][:, None])
+
+        # THE CAMPAIGN ENDS AT THE LAST OBSERVATION BEFORE THE FIRST MISS
+        detected = np.hstack(
+            [detected, np.zeros((len(detected), 1), dtype=bool)])
+        firstMiss = np.argmax(~detected, axis=1)
+        lastDetection = lightCurveDays[
+            np.arange(len(firstMiss)), np.maximum(firstMiss - 1, 0)]
+        campaignLengths[chunk] = np.where(
+            firstMiss > 0, lastDetection - discoveryDays[chunk], 0.)
+
+    return campaignLengths
+
+
+# LAST MODIFIED : October 18, 2026
+# CREATED : October 18, 2026
+# AUTHOR : DRYX
+def _grid_chunks(
+        counts,
+        maxElements):
+    """
+    *split the objects into consecutive chunks whose (objects x epochs) grids each hold at most maxElements elements*
+
+    Each chunk's grid is as wide as the largest count in the chunk, so the chunk grows only while its number of rows times the running maximum of the counts stays within ``maxElements``. A single object wider than ``maxElements`` gets a chunk of its own.
+
+    **Key Arguments:**
+        - ``counts`` -- the number of epochs (grid columns) each object needs
+        - ``maxElements`` -- the largest grid allowed
+
+    **Return:**
+        - ``chunks`` -- list of slices covering the objects in order
+    """
+    ################ > IMPORTS ################
+    ## STANDARD LIB ##
+    ## THIRD PARTY ##
+    import numpy as np
+    ## LOCAL APPLICATION ##
+
+    ################ >ACTION(S) ################
+    counts = np.maximum(np.asarray(counts, dtype=int), 1)
+    chunks = []
+    start = 0
+    while start < len(counts):
+        # NO CHUNK CAN HOLD MORE ROWS THAN ITS FIRST OBJECT ALLOWS
+        window = counts[start:start + max(1, maxElements // counts[start])]
+        gridSizes = np.maximum.accumulate(
+            window) * np.arange(1, len(window) + 1)
+        tooBig = gridSizes > maxElements
+        rows = np.argmax(tooBig) if tooBig.any() else len(window)
+        rows = max(1, rows)
+        chunks.append(slice(start, start + rows))
+        start += rows
+
+    return chunks
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,67 @@
+import os
+import nose
+import unittest
+import numpy as np
+import dryxPython.astrotools as da
+from qubits.cosmology import cosmology_table
+from qubits.utKit import utKit
+
+# SETUP AND TEARDOWN FIXTURE FUNCTIONS FOR THE ENTIRE MODULE
+moduleDirectory = os.path.dirname(__file__)
+utKit = utKit(moduleDirectory)
+log, dbConn, pathToInputDir, pathToOutputDir = utKit.setupModule()
+utKit.tearDownModule()
+
+# Recursively create missing directories
+if not os.path.exists(pathToOutputDir):
+    os.makedirs(pathToOutputDir)
+
+
+class test_cosmology(unittest.TestCase):
+
+    def test_cosmology_table_function(self):
+        pathToTable = pathToOutputDir + "/cosmology_table.npz"
+        if os.path.exists(pathToTable):
+            os.remove(pathToTable)
+        cosmo = cosmology_table(
+            log=log,
+            upperRedshiftLimit=0.5,
+            pathToOutputDirectory=pathToOutputDir,
+            redshiftStep=0.01
+        )
+
+        # THE INTERPOLATED DISTANCE MODULI MATCH THE CALCULATOR
+        redshifts = [0.013, 0.1, 0.237, 0.5]
+        dmods = cosmo.distance_modulus(redshifts)
+        for redshift, dmod in zip(redshifts, dmods):
+            dl_mpc = da.convert_redshift_to_distance(redshift)["dl_mpc"]
+            assert abs(dmod - (5. * np.log10(dl_mpc) + 25.)) < 1e-3
+
+        # THE INVERSE LOOKUP ROUND-TRIPS
+        dl_mpc = cosmo.luminosity_distance(redshifts)
+        assert np.allclose(cosmo.redshift_from_distance(dl_mpc), redshifts)
+
+        # A PERSISTED TABLE COVERING THE RANGE IS REUSED, NOT REBUILT ...
+        modified = os.path.getmtime(pathToTable)
+        reused = cosmology_table(
+            log=log,
+            upperRedshiftLimit=0.3,
+            pathToOutputDirectory=pathToOutputDir,
+            redshiftStep=0.01
+        )
+        assert os.path.getmtime(pathToTable) == modified
+        assert np.array_equal(reused.dl_mpc, cosmo.dl_mpc)
+
+        # ... AND ONE THAT IS TOO SHORT IS EXTENDED
+        extended = cosmology_table(
+            log=log,
+            upperRedshiftLimit=0.8,
+            pathToOutputDirectory=pathToOutputDir,
+            redshiftStep=0.01
+        )
+        assert extended.redshift[-1] >= 0.8
+
+        # LOOKUPS BEYOND THE TABLE ARE REFUSED RATHER THAN CLAMPED
+        self.assertRaises(ValueError, cosmo.distance_modulus, [0.1, 2.0])
+        self.assertRaises(ValueError, cosmo.redshift_from_distance,
+                          cosmo.dl_mpc[-1] * 2.)
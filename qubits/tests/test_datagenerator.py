@@ -0,0 +1,114 @@
+import os
+import nose
+import unittest
+import numpy as np
+from qubits import datagenerator
+from qubits.utKit import utKit
+
+# SETUP AND TEARDOWN FIXTURE FUNCTIONS FOR THE ENTIRE MODULE
+moduleDirectory = os.path.dirname(__file__)
+utKit = utKit(moduleDirectory)
+log, dbConn, pathToInputDir, pathToOutputDir = utKit.setupModule()
+utKit.tearDownModule()
+
+
+class test_datagenerator(unittest.TestCase):
+
+    def test_spectra_magnitudes_function(self):
+        from qubits.photometry import ab_photometry
+        from qubits.spectra import spectral_cache
+        spectra = spectral_cache(
+            log=log,
+            pathToSpectralDatabase=moduleDirectory + "/input/test_spectral_database")
+        # TOP-HAT BANDPASSES SO NO PYSYNPHOT DATA IS NEEDED
+        photometry = ab_photometry(log=log, engine="native")
+        obsmodes = ["sdss,g", "sdss,r", "sdss,i", "sdss,z"]
+        for obsmode, (lower, upper) in zip(obsmodes, [(4000., 5000.), (5500., 6500.), (7000., 8000.), (8500., 9000.)]):
+            photometry._bandpasses[obsmode] = (
+                np.array([lower - 10., lower, upper, upper + 10.]), np.array([0., 1., 1., 0.]))
+
+        model = spectra.models()[0]
+        spectrumFiles = spectra.spectrum_files(model)
+        measuredMagnitudes = datagenerator._spectra_magnitudes(
+            log,
+            spectrumFiles=spectrumFiles,
+            obsmodes=obsmodes,
+            spectralCache=spectra,
+            photometry=photometry)
+
+        # THE BATCHED MAGNITUDES MATCH THOSE OF ONE SPECTRUM AND BAND AT A TIME
+        for obsmode in obsmodes:
+            assert sorted(measuredMagnitudes[obsmode].keys()) == sorted(spectrumFiles)
+            for thisFile in spectrumFiles:
+                wavelengthArray, fluxArray = spectra.read(thisFile)
+                try:
+                    abMag = photometry.magnitude(
+                        wavelengthArray, fluxArray, obsmode=obsmode)
+                except ValueError:
+                    abMag = np.nan
+                batched = measuredMagnitudes[obsmode][thisFile]
+                if np.isnan(abMag):
+                    assert np.isnan(batched)
+                else:
+                    assert abs(batched - abMag) < 1e-9
+
+    def test_find_peak_magnitude_function(self):
+        # A PEAK BETWEEN THE 0.2 DAY GRID POINTS OF THE OLD SEARCH
+        poly = np.poly1d([0.01, -2 * 0.01 * 3.37, 0.01 * 3.37**2 + 17.])
+        peakMag, peakTime, explosionMag, explosionDay = datagenerator.find_peak_magnitude(
+            log,
+            poly=poly.coeffs,
+            model="SNOne",
+            start=-20,
+            end=60
+        )
+        assert abs(peakTime - 3.37) < 1e-8
+        assert abs(peakMag - 17.) < 1e-8
+        assert explosionDay == -20.
+        assert abs(explosionMag - poly(-20.)) < 1e-10
+
+        # A HIGHER ORDER LIGHTCURVE AGREES WITH A DENSE GRID SEARCH
+        poly = np.poly1d(np.polyfit(
+            [-20., -10., 0., 15., 40., 60.], [22., 19., 17.2, 17.9, 19.5, 21.], 5))
+        peakMag, peakTime, explosionMag, explosionDay = datagenerator.find_peak_magnitude(
+            log,
+            poly=poly.coeffs,
+            model="SNOne",
+            start=-20,
+            end=60
+        )
+        grid = np.linspace(-20., 60., 800001)
+        assert peakMag <= poly(grid).min() + 1e-9
+        assert abs(peakTime - grid[poly(grid).argmin()]) < 1e-3
+
+        # A MONOTONIC LIGHTCURVE PEAKS AT THE END OF THE RANGE
+        peakMag, peakTime, explosionMag, explosionDay = datagenerator.find_peak_magnitude(
+            log,
+            poly=[-0.1, 20.],
+            model="SNOne",
+            start=-20,
+            end=60
+        )
+        assert peakTime == 60.
+
+    def test_fit_lightcurve_polynomials_function(self):
+        # LIGHTCURVES OF DIFFERENT LENGTHS AND SAMPLING ARE FITTED IN ONE
+        # SOLVE AND MATCH np.polyfit
+        randomState = np.random.RandomState(7)
+        lightCurves = []
+        for i, n in enumerate([12, 20, 7, 3]):
+            times = np.sort(randomState.uniform(-20., 80., n)) + i
+            magnitudes = 17. + 0.002 * (times - 5.)**2 + \
+                randomState.normal(0., 0.05, n)
+            lightCurves.append((list(magnitudes), list(times)))
+        polys = datagenerator.fit_lightcurve_polynomials(
+            log,
+            lightCurves=lightCurves,
+            polyOrder=6
+        )
+        assert polys[3] is None
+        for (magnitudes, times), poly in zip(lightCurves[:3], polys[:3]):
+            expected = np.polyfit(times, magnitudes, 6)
+            grid = np.linspace(min(times), max(times), 50)
+            assert np.allclose(np.polyval(poly, grid),
+                               np.polyval(expected, grid), atol=1e-6)
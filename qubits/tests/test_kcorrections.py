@@ -0,0 +1,100 @@
+import os
+import nose
+import unittest
+import numpy as np
+from qubits.kcorrections import kcorrection_store
+from qubits.utKit import utKit
+
+# SETUP AND TEARDOWN FIXTURE FUNCTIONS FOR THE ENTIRE MODULE
+moduleDirectory = os.path.dirname(__file__)
+utKit = utKit(moduleDirectory)
+log, dbConn, pathToInputDir, pathToOutputDir = utKit.setupModule()
+utKit.tearDownModule()
+
+# Recursively create missing directories
+if not os.path.exists(pathToOutputDir):
+    os.makedirs(pathToOutputDir)
+
+
+class test_kcorrections(unittest.TestCase):
+
+    def test_kcorrection_store_function(self):
+        pathToDatabase = pathToOutputDir + "/test_k_corrections.db"
+        if os.path.exists(pathToDatabase):
+            os.remove(pathToDatabase)
+        store = kcorrection_store(
+            log=log,
+            pathToDatabase=pathToDatabase
+        )
+
+        rows = [("r", -10., 0.12), ("r", -9., 0.11), ("i", -10., 0.3)]
+        store.write_listing("SNOne", "g", 0.1, rows)
+        days, kCorrections = store.read_listing("SNOne", "g", "r", 0.1)
+        assert list(days) == [-10., -9.]
+        assert list(kCorrections) == [0.12, 0.11]
+
+        # REWRITING A LISTING REPLACES IT
+        store.write_listing("SNOne", "g", 0.1, rows[:1])
+        days, kCorrections = store.read_listing("SNOne", "g", "r", 0.1)
+        assert list(days) == [-10.]
+        days, kCorrections = store.read_listing("SNOne", "g", "i", 0.1)
+        assert len(days) == 0
+
+        coefficients = np.array([1e-5, -2e-3, 0.1, 0.25])
+        store.write_polynomial("SNOne", "g", "r", 0.1, coefficients)
+        store.write_polynomial("SNOne", "g", "r", 0.2, coefficients * 2.)
+        store.write_polynomial("SNTwo", "g", "i", 0.1, coefficients)
+        store.close()
+
+        # READ EVERYTHING A SIMULATION NEEDS WITH A SINGLE OPEN
+        store = kcorrection_store(
+            log=log,
+            pathToDatabase=pathToDatabase
+        )
+        polynomials = store.polynomials(
+            models=["SNOne"], obsFilters=["r", "i"], redshifts=[0.1, 0.2])
+        assert sorted(polynomials.keys()) == [
+            ("SNOne", "r", "0.100"), ("SNOne", "r", "0.200")]
+        assert np.all(polynomials[("SNOne", "r", "0.100")].coeffs == coefficients)
+        assert len(store.polynomials()) == 3
+        assert list(store.polynomials(obsFilters=["i"]).keys()) == [
+            ("SNTwo", "i", "0.100")]
+        assert store.polynomials(models=[]) == {}
+
+        store.clear()
+        assert store.polynomials() == {}
+        store.close()
+
+    def test_provenance_function(self):
+        pathToDatabase = pathToOutputDir + "/test_k_corrections_provenance.db"
+        if os.path.exists(pathToDatabase):
+            os.remove(pathToDatabase)
+        store = kcorrection_store(
+            log=log,
+            pathToDatabase=pathToDatabase
+        )
+        store.record_digest("listing", "SNOne", 0.1, "abc")
+        store.record_digest("listing", "SNOne", 0.1, "def")
+        store.record_digest("polynomial", "SNOne", 0.2, "ghi")
+        assert store.digests("listing") == {("SNOne", "0.100"): "def"}
+        assert store.digests("polynomial") == {("SNOne", "0.200"): "ghi"}
+
+        store.write_polynomial("SNOne", "g", "r", 0.1, [1., 2.])
+        store.remove_polynomial("SNOne", "g", "r", 0.1)
+        assert store.polynomials() == {}
+
+        # SWITCHING REST FRAME FILTER DROPS THE OLD FILTER'S ROWS AND THE
+        # PROVENANCE OF THEIR UNITS
+        store.write_listing("SNOne", "g", 0.1, [("r", -10., 0.12)])
+        store.write_polynomial("SNOne", "g", "r", 0.1, [1., 2.])
+        store.write_polynomial("SNOne", "r", "r", 0.3, [3., 4.])
+        store.record_digest("polynomial", "SNOne", 0.3, "jkl")
+        assert list(store.polynomials(restFilter="r").keys()) == [
+            ("SNOne", "r", "0.300")]
+        assert store.remove_other_rest_filters("r") == 2
+        assert list(store.polynomials().keys()) == [("SNOne", "r", "0.300")]
+        assert len(store.read_listing("SNOne", "g", "r", 0.1)[0]) == 0
+        assert store.digests("listing") == {}
+        assert store.digests("polynomial") == {
+            ("SNOne", "0.200"): "ghi", ("SNOne", "0.300"): "jkl"}
+        store.close()
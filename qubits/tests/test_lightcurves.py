@@ -0,0 +1,56 @@
+import os
+import nose
+import unittest
+import numpy as np
+from qubits.lightcurves import lightcurve_array
+from qubits.utKit import utKit
+
+# SETUP AND TEARDOWN FIXTURE FUNCTIONS FOR THE ENTIRE MODULE
+moduleDirectory = os.path.dirname(__file__)
+utKit = utKit(moduleDirectory)
+log, dbConn, pathToInputDir, pathToOutputDir = utKit.setupModule()
+utKit.tearDownModule()
+
+
+class test_lightcurves(unittest.TestCase):
+
+    def setUp(self):
+        nan = np.nan
+        coefficients = {
+            "g": np.array([[0.01, -0.2, 1.], [0., 0.05, 2.]]),
+            "r": np.array([[0.02, 0.1, 0.5], [nan, nan, nan]])
+        }
+        self.lightCurves = lightcurve_array(
+            log=log,
+            filters=["g", "r"],
+            coefficients=coefficients,
+            binIndex=np.array([0, 1, 1, 0]),
+            offsets={
+                "g": np.array([20., 21., 22., 23.]),
+                "r": np.array([19., 20., 21., 22.])
+            },
+            explosionDay=np.array([-20., -15., -15., -20.]),
+            endOfLightcurveDay=np.array([300., 250., 250., 300.])
+        )
+
+    def test_evaluate_function(self):
+        times = np.array([-5., 0., 10., 30.])
+        mags = self.lightCurves.evaluate("g", times)
+        # COMPARE TO THE PER-OBJECT POLYNOMIALS
+        for i in range(len(self.lightCurves)):
+            poly = self.lightCurves[i]['lightCurves']["g"]
+            assert abs(mags[i] - poly(times[i])) < 1e-10
+
+        grid = np.tile(np.arange(-10., 10.), (4, 1))
+        mags = self.lightCurves.evaluate("g", grid)
+        assert mags.shape == grid.shape
+        assert abs(mags[3, 4] - self.lightCurves[3]['lightCurves']["g"](-6.)) < 1e-10
+
+    def test_missing_lightcurve_function(self):
+        assert list(self.lightCurves.has_lightcurve("r")) == [
+            True, False, False, True]
+        assert self.lightCurves[1]['lightCurves']["r"] is None
+        assert self.lightCurves[1]['peakMags']["r"] is None
+        peakMags = self.lightCurves.peak_magnitudes("r")
+        assert np.isnan(peakMags[2])
+        assert peakMags[3] == 22.5
@@ -0,0 +1,132 @@
+import os
+import nose
+import unittest
+import time
+import pytest
+import numpy as np
+from qubits.photometry import ab_photometry
+from qubits.spectra import spectral_cache
+from qubits.utKit import utKit
+
+# SETUP AND TEARDOWN FIXTURE FUNCTIONS FOR THE ENTIRE MODULE
+moduleDirectory = os.path.dirname(__file__)
+utKit = utKit(moduleDirectory)
+log, dbConn, pathToInputDir, pathToOutputDir = utKit.setupModule()
+utKit.tearDownModule()
+
+pathToSpectralDatabase = moduleDirectory + "/input/test_spectral_database"
+
+
+def _top_hat_photometry():
+    "an engine with a top-hat `sdss,g` bandpass so no pysynphot data is needed"
+    photometry = ab_photometry(
+        log=log,
+        engine="native"
+    )
+    bandWave = np.array([3990., 4000., 4500., 5000., 5010.])
+    throughput = np.array([0., 1., 1., 1., 0.])
+    photometry._bandpasses["sdss,g"] = (bandWave, throughput)
+    return photometry
+
+
+class test_photometry(unittest.TestCase):
+
+    def test_flat_fnu_spectrum_function(self):
+        photometry = _top_hat_photometry()
+        wavelengthArray = np.arange(3000., 8000., 5.)
+        # A FLAT f_nu SPECTRUM HAS THE SAME AB MAGNITUDE IN EVERY BAND
+        fnu = 10**(-0.4 * (20. + 48.60))
+        fluxArray = fnu * 2.99792458e18 / wavelengthArray**2
+        abMag = photometry.magnitude(
+            wavelengthArray, fluxArray, obsmode="sdss,g")
+        assert abs(abMag - 20.) < 1e-6
+
+        # THE BATCHED MAGNITUDES MATCH THE SINGLE-SPECTRUM ONES
+        fluxArrays = np.array([fluxArray, fluxArray * 10., -fluxArray])
+        abMags = photometry.magnitudes(
+            wavelengthArray, fluxArrays, obsmodes=["sdss,g"])
+        assert abMags.shape == (3, 1)
+        assert abs(abMags[0, 0] - 20.) < 1e-6
+        assert abs(abMags[1, 0] - 17.5) < 1e-6
+        assert np.isnan(abMags[2, 0])
+
+    def test_photometry_errors_function(self):
+        photometry = _top_hat_photometry()
+        wavelengthArray = np.arange(3000., 8000., 5.)
+        fluxArray = np.ones(len(wavelengthArray))
+        with self.assertRaisesRegexp(ValueError, "Integrated flux is <= 0"):
+            photometry.magnitude(
+                wavelengthArray, -fluxArray, obsmode="sdss,g")
+        with self.assertRaisesRegexp(ValueError, "do not fully overlap"):
+            photometry.magnitude(
+                wavelengthArray[300:], fluxArray[300:], obsmode="sdss,g")
+        with self.assertRaisesRegexp(ValueError, "disjoint"):
+            photometry.magnitude(
+                wavelengthArray[600:], fluxArray[600:], obsmode="sdss,g")
+        with self.assertRaises(ValueError):
+            ab_photometry(log=log, engine="synphot")
+
+    @pytest.mark.slow
+    def test_native_against_pysynphot_benchmark(self):
+        native = ab_photometry(log=log, engine="native")
+        legacy = ab_photometry(log=log, engine="pysynphot")
+        spectra = spectral_cache(
+            log=log,
+            pathToSpectralDatabase=pathToSpectralDatabase
+        )
+        nativeTime = 0.
+        legacyTime = 0.
+        worst = 0.
+        for model in spectra.models():
+            for epoch, (wavelengthArray, fluxArray) in spectra.model_spectra(model).iteritems():
+                for obsmode in native.nativeObsmodes:
+                    try:
+                        start = time.time()
+                        legacyMag = legacy.magnitude(
+                            wavelengthArray, fluxArray, obsmode)
+                        legacyTime += time.time() - start
+                    except Exception:
+                        continue
+                    start = time.time()
+                    nativeMag = native.magnitude(
+                        wavelengthArray, fluxArray, obsmode)
+                    nativeTime += time.time() - start
+                    worst = max(worst, abs(nativeMag - legacyMag))
+        print "\nnative (s)  pysynphot (s)  worst difference (mag)"
+        print "%10.3f  %13.3f  %22.4f" % (nativeTime, legacyTime, worst)
+        # THE DOCUMENTED TOLERANCE
+        assert worst < 0.01
+
+    def test_bandpass_cache_function(self):
+        from qubits import photometry
+        photometry.clear_bandpass_cache()
+        photometry._bandpassCache["sdss,g"] = "a cached bandpass"
+        assert photometry.obs_bandpass("sdss,g") == "a cached bandpass"
+        assert photometry.obs_bandpass("sdss,g") == "a cached bandpass"
+        info = photometry.bandpass_cache_info()
+        assert info["hits"] == 2
+        assert info["misses"] == 0
+        assert info["obsmodes"] == ["sdss,g"]
+
+        photometry.clear_bandpass_cache()
+        info = photometry.bandpass_cache_info()
+        assert info == {"hits": 0, "misses": 0, "obsmodes": []}
+
+    def test_redshifted_magnitudes_function(self):
+        photometry = _top_hat_photometry()
+        wavelengthArray = np.arange(2000., 8000., 5.)
+        fluxArray = 1e-15 * (1. + np.sin(wavelengthArray / 300.)**2)
+        redshifts = np.array([0., 0.1, 0.25, 1.5])
+        abMags = photometry.redshifted_magnitudes(
+            wavelengthArray, fluxArray, redshifts=redshifts, obsmodes=["sdss,g"])
+        assert abMags.shape == (4, 1)
+
+        # COMPARE TO REDSHIFTING EACH SPECTRUM ONE AT A TIME (f_lambda SCALES
+        # BY (1+z)^-3 FOR A SPECTRUM REDSHIFTED IN photnu UNITS)
+        for z, abMag in zip(redshifts[:3], abMags[:3, 0]):
+            expected = photometry.magnitude(
+                wavelengthArray * (1. + z), fluxArray * (1. + z)**-3, obsmode="sdss,g")
+            assert abs(abMag - expected) < 1e-8
+
+        # AT z=1.5 THE SPECTRUM NO LONGER COVERS THE BANDPASS
+        assert np.isnan(abMags[3, 0])
@@ -0,0 +1,42 @@
+import os
+import nose
+import unittest
+import numpy as np
+from qubits.randomness import random_streams
+from qubits.utKit import utKit
+
+# SETUP AND TEARDOWN FIXTURE FUNCTIONS FOR THE ENTIRE MODULE
+moduleDirectory = os.path.dirname(__file__)
+utKit = utKit(moduleDirectory)
+log, dbConn, pathToInputDir, pathToOutputDir = utKit.setupModule()
+utKit.tearDownModule()
+
+
+class test_randomness(unittest.TestCase):
+
+    def test_random_streams_function(self):
+        first = random_streams(log=log, seed=42)
+        second = random_streams(log=log, seed=42)
+
+        # SAME SEED, SAME STAGE -> BIT-FOR-BIT THE SAME NUMBERS
+        a = first.stream("redshifts").random_sample(100)
+        b = second.stream("redshifts").random_sample(100)
+        assert np.all(a == b)
+
+        # DIFFERENT STAGES AND DIFFERENT SEEDS -> DIFFERENT NUMBERS
+        c = first.stream("sn types").random_sample(100)
+        d = random_streams(log=log, seed=43).stream(
+            "redshifts").random_sample(100)
+        assert not np.all(a == c)
+        assert not np.all(a == d)
+
+    def test_random_streams_spawn_function(self):
+        streams = random_streams(log=log)
+        workers = streams.spawn("k-corrections", 4)
+        draws = [w.random_sample(10) for w in workers]
+        assert len(set([tuple(x) for x in draws])) == 4
+
+        # A FRESH SEED IS RECORDED SO THE RUN CAN BE REPEATED
+        again = random_streams(log=log, seed=streams.seed).spawn(
+            "k-corrections", 4)
+        assert np.all(again[2].random_sample(10) == draws[2])
@@ -0,0 +1,92 @@
+import os
+import nose
+import unittest
+import numpy as np
+from qubits.spectra import spectral_cache
+from qubits.utKit import utKit
+
+# SETUP AND TEARDOWN FIXTURE FUNCTIONS FOR THE ENTIRE MODULE
+moduleDirectory = os.path.dirname(__file__)
+utKit = utKit(moduleDirectory)
+log, dbConn, pathToInputDir, pathToOutputDir = utKit.setupModule()
+utKit.tearDownModule()
+
+pathToSpectralDatabase = moduleDirectory + "/input/test_spectral_database"
+
+
+class test_spectra(unittest.TestCase):
+
+    def test_spectral_cache_function(self):
+        spectra = spectral_cache(
+            log=log,
+            pathToSpectralDatabase=pathToSpectralDatabase
+        )
+        assert "SNTwo" in spectra.models()
+
+        modelSpectra = spectra.model_spectra("SNTwo")
+        epochs = modelSpectra.keys()
+        assert epochs == sorted(epochs)
+        assert 49.0 in epochs
+
+        # THE SAME ARRAYS ARE SERVED ON EVERY LATER REQUEST
+        pathToSpectrum = pathToSpectralDatabase + "/SNTwo/t+049.00.spec"
+        wavelengthArray, fluxArray = spectra.read(pathToSpectrum)
+        assert wavelengthArray is modelSpectra[49.0][0]
+        assert spectra.model_spectra("SNTwo") is modelSpectra
+
+        data = np.genfromtxt(pathToSpectrum, usecols=(0, 1))
+        assert np.all(data[:, 0] == wavelengthArray)
+        assert np.all(data[:, 1] == fluxArray)
+
+    def test_compiled_database_function(self):
+        import shutil
+        pathToCopy = pathToOutputDir + "/compiled_spectral_database"
+        if os.path.exists(pathToCopy):
+            shutil.rmtree(pathToCopy)
+        shutil.copytree(pathToSpectralDatabase, pathToCopy)
+
+        spectra = spectral_cache(
+            log=log,
+            pathToSpectralDatabase=pathToCopy
+        )
+        parsed = spectra.model_spectra("SNTwo")
+        assert spectra.compile() == spectra.models()
+        assert ".compiled" not in spectra.models()
+
+        # A NEW CACHE SERVES VIEWS OF THE MEMORY-MAPPED ARRAY
+        spectra = spectral_cache(
+            log=log,
+            pathToSpectralDatabase=pathToCopy
+        )
+        compiled = spectra.model_spectra("SNTwo")
+        assert compiled.keys() == parsed.keys()
+        for epoch in parsed.keys():
+            assert np.all(compiled[epoch][0] == parsed[epoch][0])
+            assert np.all(compiled[epoch][1] == parsed[epoch][1])
+        wavelengthArray, fluxArray = spectra.read(
+            pathToCopy + "/SNTwo/t+049.00.spec")
+        assert isinstance(wavelengthArray.base, np.memmap) or isinstance(
+            wavelengthArray, np.memmap)
+        assert wavelengthArray is compiled[49.0][0]
+
+        # TOUCHING A SOURCE FILE INVALIDATES THE COMPILED MODEL
+        pathToSpectrum = pathToCopy + "/SNTwo/t+049.00.spec"
+        stat = os.stat(pathToSpectrum)
+        os.utime(pathToSpectrum, (stat.st_atime, stat.st_mtime + 10))
+        spectra = spectral_cache(
+            log=log,
+            pathToSpectralDatabase=pathToCopy
+        )
+        wavelengthArray, fluxArray = spectra.read(pathToSpectrum)
+        assert not isinstance(wavelengthArray, np.memmap)
+        assert not isinstance(wavelengthArray.base, np.memmap)
+        assert np.all(wavelengthArray == parsed[49.0][0])
+
+    def test_model_digest_function(self):
+        spectra = spectral_cache(
+            log=log,
+            pathToSpectralDatabase=pathToSpectralDatabase
+        )
+        digest = spectra.model_digest("SNTwo")
+        assert digest == spectra.model_digest("SNTwo")
+        assert digest != spectra.model_digest("SNOne")
@@ -0,0 +1,483 @@
+import os
+import nose
+import unittest
+import time
+import pytest
+import numpy as np
+from qubits import surveysim
+from qubits.lightcurves import lightcurve_array
+from qubits.utKit import utKit
+
+# SETUP AND TEARDOWN FIXTURE FUNCTIONS FOR THE ENTIRE MODULE
+moduleDirectory = os.path.dirname(__file__)
+utKit = utKit(moduleDirectory)
+log, dbConn, pathToInputDir, pathToOutputDir = utKit.setupModule()
+utKit.tearDownModule()
+
+# Recursively create missing directories
+if not os.path.exists(pathToOutputDir):
+    os.makedirs(pathToOutputDir)
+
+filters = ['g', 'r', 'i', 'z']
+limitingMags = {'g': 23.0, 'r': 23.0, 'i': 23.0, 'z': 22.4}
+
+
+def _parabolic_lightcurves(sampleNumber, seed=1):
+    # A PARABOLIC RISE TO PEAK - PEAK MAGS SPREAD EITHER SIDE OF THE LIMITS,
+    # SOME SNE ARE ALREADY BRIGHTER THAN THE LIMIT AT EXPLOSION
+    randomState = np.random.RandomState(seed)
+    nan = np.nan
+    coefficients = {}
+    offsets = {}
+    for ffilter in filters:
+        coefficients[ffilter] = np.array(
+            [[0.005, 0., 0.], [0.003, 0.01, 0.]])
+        offsets[ffilter] = randomState.uniform(4., 24., sampleNumber)
+    coefficients['z'] = np.array([[nan, nan, nan], [0.003, 0.01, 0.]])
+    lightCurves = lightcurve_array(
+        log=log,
+        filters=filters,
+        coefficients=coefficients,
+        binIndex=randomState.randint(0, 2, sampleNumber),
+        offsets=offsets,
+        explosionDay=np.ones(sampleNumber) * -60.,
+        endOfLightcurveDay=np.ones(sampleNumber) * 300.
+    )
+    discoverableList = surveysim.determine_if_sne_are_discoverable(
+        log,
+        redshiftArray=np.zeros(sampleNumber),
+        limitingMags=limitingMags,
+        observedFrameLightCurveInfo=lightCurves,
+        pathToOutputDirectory=pathToOutputDir,
+        pathToOutputPlotDirectory=pathToOutputDir,
+        plot=False)
+    return lightCurves, discoverableList
+
+
+class test_surveysim(unittest.TestCase):
+
+    def test_determine_when_sne_are_ripe_for_discovery_function(self):
+        lightCurves, discoverableList = _parabolic_lightcurves(2000)
+        ripeDayList = surveysim.determine_when_sne_are_ripe_for_discovery(
+            log,
+            redshiftArray=np.zeros(2000),
+            limitingMags=limitingMags,
+            observedFrameLightCurveInfo=lightCurves,
+            discoverableList=discoverableList,
+            plot=False)
+        bisectionList = surveysim._ripe_days_by_bisection(
+            log,
+            limitingMags=limitingMags,
+            observedFrameLightCurveInfo=lightCurves,
+            discoverableList=discoverableList)
+
+        # THE BISECTION ONLY STOPS WITHIN 0.01 MAG OF THE LIMIT, SO ON THE
+        # SHALLOW PART OF A CURVE ITS DAY CAN BE WELL OFF THE CROSSING - CHECK
+        # THE BATCHED DAYS AGAINST THE LIMIT ITSELF
+        for item, (new, old) in enumerate(zip(ripeDayList, bisectionList)):
+            assert new["any"] == old["any"]
+            lightCurve = lightCurves[item]
+            for ffilter in filters:
+                assert (new[ffilter] is False) == (old[ffilter] is False)
+                if new[ffilter] is False:
+                    continue
+                mag = lightCurve['lightCurves'][ffilter](new[ffilter])
+                if new[ffilter] == lightCurve['explosionDay']:
+                    # ALREADY BRIGHTER THAN THE LIMIT AT EXPLOSION
+                    assert mag <= limitingMags[ffilter]
+                else:
+                    assert abs(mag - limitingMags[ffilter]) < 0.01
+
+    @pytest.mark.slow
+    def test_determine_when_sne_are_ripe_for_discovery_benchmark(self):
+        print "\nsampleNumber  batched (s)  bisection (s)"
+        for sampleNumber in [10**5, 10**6]:
+            lightCurves, discoverableList = _parabolic_lightcurves(
+                sampleNumber)
+            start = time.time()
+            surveysim.determine_when_sne_are_ripe_for_discovery(
+                log,
+                redshiftArray=np.zeros(sampleNumber),
+                limitingMags=limitingMags,
+                observedFrameLightCurveInfo=lightCurves,
+                discoverableList=discoverableList,
+                plot=False)
+            batched = time.time() - start
+            start = time.time()
+            surveysim._ripe_days_by_bisection(
+                log,
+                limitingMags=limitingMags,
+                observedFrameLightCurveInfo=lightCurves,
+                discoverableList=discoverableList)
+            bisection = time.time() - start
+            print "%12s  %11.3f  %13.3f" % (sampleNumber, batched, bisection)
+
+    def test_survey_cadence_arrays_function(self):
+        surveyCadenceSettings = {
+            'Observable Fraction of Year': 0.5,
+            'Fraction of Year Lost to Weather etc': 0.4,
+            'Filters': [
+                {'band': ffilter, 'day of year of first scheduled observation': first,
+                 'repeat every ? days': repeat, 'Fraction of Lunar Month Lost to Moon': 0.27}
+                for ffilter, first, repeat in zip(filters, [1, 1, 2, 3], [3, 3, 3, 7])]
+        }
+        cadenceDictionary = surveysim.survey_cadence_arrays(
+            log,
+            surveyCadenceSettings,
+            pathToOutputDirectory=pathToOutputDir,
+            pathToOutputPlotDirectory=pathToOutputDir,
+            plot=False,
+            randomState=np.random.RandomState(5))
+
+        # THE DAY-BY-DAY LOOP THE MASKS REPLACED, WITH THE SAME RANDOM STREAM
+        randomState = np.random.RandomState(5)
+        lunarMonth = 29.3
+        surveyYear = 12. * lunarMonth
+        for thisFilter in surveyCadenceSettings['Filters']:
+            finalObsDayOfMonth = lunarMonth * (1. - 0.27)
+            monthCount, day, monthDay, moonDayList = 0, 1, 1, []
+            while day < surveyYear:
+                while monthDay < int(lunarMonth):
+                    if monthDay <= finalObsDayOfMonth:
+                        moonDayList.append(day)
+                    monthDay += 1
+                    day += 1
+                monthCount += 1
+                day = int(lunarMonth * monthCount)
+                monthDay = 0
+            day = nextObs = thisFilter['day of year of first scheduled observation']
+            obsDaysList = []
+            while day <= 0.5 * surveyYear:
+                randNum = randomState.rand()
+                if day == nextObs:
+                    if day in moonDayList and randNum > 0.4:
+                        obsDaysList.append(day)
+                    nextObs = day + thisFilter['repeat every ? days']
+                day += 1
+            assert cadenceDictionary[thisFilter['band']] == obsDaysList
+
+    def test_cadence_index_function(self):
+        from qubits.cadence import cadence_index
+        cadence = cadence_index(
+            log=log,
+            cadenceDictionary={'g': [1, 4, 7, 300], 'r': []},
+            surveyYear=351.6)
+        visibleDays = np.array([0.5, 4., 5.5, 299.9, 300., 350.])
+        days, waits, index = cadence.next_observation('g', visibleDays)
+        assert days.tolist() == [1., 7., 7., 300., 1., 1.]
+        assert index.tolist() == [0, 2, 2, 3, 0, 0]
+        assert np.allclose(waits, [0.5, 3., 1.5, 0.1, 52.6, 2.6])
+
+        days, waits, index = cadence.next_observation('r', visibleDays)
+        assert np.all(index == -1)
+
+    def test_multi_year_cadence_function(self):
+        surveyYear = 12. * 29.3
+        surveyCadenceSettings = {
+            'Observable Fraction of Year': 0.5,
+            'Fraction of Year Lost to Weather etc': 0.4,
+            'Survey Length (years)': 3,
+            'Filters': [
+                {'band': 'g', 'day of year of first scheduled observation': 1,
+                 'repeat every ? days': 3, 'Fraction of Lunar Month Lost to Moon': 0.27,
+                 'visits per night': 3, 'hours between visits': 2.}]
+        }
+        cadenceDictionary = surveysim.survey_cadence_arrays(
+            log,
+            surveyCadenceSettings,
+            pathToOutputDirectory=pathToOutputDir,
+            pathToOutputPlotDirectory=pathToOutputDir,
+            plot=False,
+            randomState=np.random.RandomState(5))
+        epochs = np.array(cadenceDictionary['g'])
+
+        # THREE VISITS A NIGHT, TWO HOURS APART, IN EACH YEAR'S SEASON
+        assert len(epochs) % 3 == 0
+        nights = epochs.reshape(-1, 3)
+        assert np.allclose(np.diff(nights, axis=1), 2. / 24.)
+        assert np.all(nights[:, 0] % surveyYear <= 0.5 * surveyYear)
+        years = np.floor(nights[:, 0] / surveyYear).astype(int)
+        assert set(years) == set([0, 1, 2])
+
+        # EVERY YEAR RESTARTS ITS SEASON AND STRIDE ON THE FIRST SCHEDULED DAY
+        surveyCadenceSettings['Fraction of Year Lost to Weather etc'] = 0.
+        surveyCadenceSettings['Filters'] = [
+            {'band': 'z', 'day of year of first scheduled observation': 3,
+             'repeat every ? days': 3, 'Fraction of Lunar Month Lost to Moon': 0.}]
+        cadenceDictionary = surveysim.survey_cadence_arrays(
+            log,
+            surveyCadenceSettings,
+            pathToOutputDirectory=pathToOutputDir,
+            pathToOutputPlotDirectory=pathToOutputDir,
+            plot=False,
+            randomState=np.random.RandomState(5))
+        epochs = np.array(cadenceDictionary['z'])
+        years = np.floor(epochs / surveyYear).astype(int)
+        dayOfYear = epochs - years * surveyYear
+        assert np.allclose(dayOfYear, np.round(dayOfYear))
+        assert np.all(np.round(dayOfYear) >= 3)
+        assert np.all(np.round(dayOfYear) % 3 == 0)
+        for year in range(3):
+            scheduled = year * surveyYear + 3. + 3. * np.arange(20)
+            scheduled = scheduled[surveysim._moon_dark_mask(
+                scheduled, 29.3, 0.)]
+            assert abs(epochs[years == year][0] - scheduled[0]) < 1e-9
+
+        from qubits.cadence import cadence_index
+        cadence = cadence_index(
+            log=log,
+            cadenceDictionary=cadenceDictionary,
+            surveyYear=surveyYear,
+            numberOfYears=3)
+        assert np.array_equal(cadence.survey_year(
+            'g', np.arange(len(epochs))), np.repeat(years, 3))
+
+        # THE SURVEY WRAPS AFTER THREE YEARS, NOT ONE
+        days, waits, index = cadence.next_observation('g', [epochs[-1] + 0.01])
+        assert index[0] == 0
+        assert abs(waits[0] - (3 * surveyYear - epochs[-1] - 0.01 + epochs[0])) < 1e-9
+        offsets = cadence.future_offsets('g', [len(epochs) - 1], 1)
+        assert abs(offsets[0, 0] - (3 * surveyYear - epochs[-1] + epochs[0])) < 1e-9
+        assert cadence.count_within('g', [0], [3 * surveyYear])[0] == len(epochs)
+
+    def test_read_observation_log_function(self):
+        from qubits.cadence import read_observation_log, cadence_index
+        pathToLog = pathToOutputDir + "/observation_log.csv"
+        with open(pathToLog, "w") as stream:
+            stream.write("mjd,band,limitingMag\n# A COMMENT\n")
+            stream.write("56001.25,r,22.5\n56000.5, g, 23.1\n\n")
+            stream.write("56000.75,g,22.9\n56400.1,i,21.0\n")
+
+        # TINY CHUNKS SO LINES ARE SPLIT ACROSS READS
+        cadenceDictionary, depthDictionary, numberOfYears = read_observation_log(
+            log,
+            pathToObservationLog=pathToLog,
+            chunkSize=7)
+        assert np.allclose(cadenceDictionary['g'], [0.5, 0.75])
+        assert np.allclose(depthDictionary['g'], [23.1, 22.9])
+        assert np.allclose(cadenceDictionary['r'], [1.25])
+        assert np.allclose(cadenceDictionary['i'], [400.1])
+        assert len(cadenceDictionary['z']) == 0
+        assert numberOfYears == 2
+
+        cadence = cadence_index(
+            log=log,
+            cadenceDictionary=cadenceDictionary,
+            surveyYear=12. * 29.3,
+            numberOfYears=numberOfYears,
+            depthDictionary=depthDictionary)
+        days, waits, index = cadence.next_observation('g', [0.6, 0.1])
+        assert np.allclose(cadence.epoch_depths('g', index, 20.), [22.9, 23.1])
+        assert np.allclose(cadence.future_depths(
+            'g', [1], 2, 20.), [[23.1, 22.9]])
+        assert np.allclose(cadence.epoch_depths('r', [0], 20.), [22.5])
+
+        # POINTINGS IN OTHER BANDS ARE SKIPPED
+        with open(pathToLog, "w") as stream:
+            stream.write("mjd,band,limitingMag\n56000.5,u,23.1\n")
+            stream.write("56000.6,g,22.8\n56000.7, y ,21.9\n56000.9,g,22.7\n")
+        cadenceDictionary, depthDictionary, numberOfYears = read_observation_log(
+            log,
+            pathToObservationLog=pathToLog)
+        assert np.allclose(cadenceDictionary['g'], [0.6, 0.9])
+        assert np.allclose(depthDictionary['g'], [22.8, 22.7])
+        assert 'u' not in cadenceDictionary
+
+        # ... UNLESS THEY ARE ASKED FOR
+        cadenceDictionary, depthDictionary, numberOfYears = read_observation_log(
+            log,
+            pathToObservationLog=pathToLog,
+            bands=['u', 'g', 'y'])
+        assert np.allclose(cadenceDictionary['u'], [0.5])
+        assert np.allclose(depthDictionary['y'], [21.9])
+        assert len(cadenceDictionary['g']) == 2
+
+        # A LOG WITH NO POINTINGS IN THE BANDS IS AN ERROR
+        with open(pathToLog, "w") as stream:
+            stream.write("56000.5,u,23.1\n")
+        self.assertRaises(ValueError, read_observation_log,
+                          log, pathToObservationLog=pathToLog)
+
+    def test_determine_if_sne_are_discovered_function(self):
+        lightCurves, discoverableList = _parabolic_lightcurves(500)
+        ripeDayList = surveysim.determine_when_sne_are_ripe_for_discovery(
+            log,
+            redshiftArray=np.zeros(500),
+            limitingMags=limitingMags,
+            observedFrameLightCurveInfo=lightCurves,
+            discoverableList=discoverableList,
+            plot=False)
+        cadenceDictionary = {}
+        for ffilter, first in zip(filters, [1, 1, 2, 3]):
+            cadenceDictionary[ffilter] = range(first, 176, 3)
+
+        lcDiscoveries, surveyDiscoveries, campaigns = surveysim.determine_if_sne_are_discovered(
+            log,
+            limitingMags=limitingMags,
+            ripeDayList=ripeDayList,
+            cadenceDictionary=cadenceDictionary,
+            observedFrameLightCurveInfo=lightCurves,
+            extraSurveyConstraints={},
+            plot=False,
+            randomState=np.random.RandomState(3))
+
+        # STEP THROUGH THE CADENCE ONE OBSERVATION AT A TIME, AS THE
+        # ORIGINAL CAMPAIGN LOOP DID
+        surveyYear = 12. * 29.3
+        anyDiscovered = 0
+        for item in range(500):
+            lightCurve = lightCurves[item]
+            for ffilter in filters:
+                if not surveyDiscoveries[item][ffilter]:
+                    continue
+                anyDiscovered += 1
+                epochs = cadenceDictionary[ffilter]
+                cdIndex = epochs.index(surveyDiscoveries[item][ffilter]) + 1
+                lcDay = lcDiscoveries[item][ffilter]
+                campaign = 0.
+                while True:
+                    if cdIndex >= len(epochs):
+                        nextLcDay = lcDay + surveyYear + epochs[0] - epochs[-1]
+                        cdIndex = 1
+                    else:
+                        nextLcDay = lcDay + epochs[cdIndex] - epochs[cdIndex - 1]
+                        cdIndex += 1
+                    if lightCurve['lightCurves'][ffilter](nextLcDay) < limitingMags[ffilter] and lightCurve['endOfLightcurveDay'] > nextLcDay:
+                        campaign += nextLcDay - lcDay
+                        lcDay = nextLcDay
+                    else:
+                        break
+                assert abs(campaign - campaigns[item][ffilter]) < 1e-6
+        assert anyDiscovered > 0
+
+    def test_grid_chunks_function(self):
+        # LONG LIGHTCURVES WELL PAST ROW 10000 OF WHAT WOULD BE ONE CHUNK
+        counts = np.ones(30000, dtype=int)
+        counts[15000] = 1000
+        counts[25000] = 6000
+        chunks = surveysim._grid_chunks(counts, maxElements=4000)
+        assert chunks[0].start == 0 and chunks[-1].stop == len(counts)
+        for thisChunk, nextChunk in zip(chunks[:-1], chunks[1:]):
+            assert thisChunk.stop == nextChunk.start
+        for chunk in chunks:
+            rows = chunk.stop - chunk.start
+            # AN OBJECT WIDER THAN THE LIMIT SITS IN A CHUNK OF ITS OWN
+            assert rows * counts[chunk].max() <= 4000 or rows == 1
+
+    def test_survey_epoch_depths_function(self):
+        cadenceDictionary = {'g': range(1, 60), 'r': range(1, 60)}
+        surveyCadenceSettings = {'Filters': [
+            {'band': 'g', 'limiting magnitude loss at full moon': 1.0},
+            {'band': 'r'}]}
+        depthDictionary = surveysim.survey_epoch_depths(
+            log,
+            cadenceDictionary=cadenceDictionary,
+            limitingMags=limitingMags,
+            surveyCadenceSettings=surveyCadenceSettings,
+            randomState=np.random.RandomState(1))
+        assert 'r' not in depthDictionary
+        depths = depthDictionary['g']
+        assert np.all(depths <= limitingMags['g'] + 1e-12)
+        assert np.all(depths >= limitingMags['g'] - 1.)
+        # NEW MOON AT THE START OF THE LUNAR MONTH, FULL HALF-WAY THROUGH
+        assert depths[0] > depths[13]
+
+        # NO VARIATION - A SINGLE DEPTH PER FILTER
+        assert surveysim.survey_epoch_depths(
+            log,
+            cadenceDictionary=cadenceDictionary,
+            limitingMags=limitingMags,
+            surveyCadenceSettings={'Filters': [{'band': 'g'}]}) is None
+
+    def test_per_epoch_depths_discovery_function(self):
+        lightCurves, discoverableList = _parabolic_lightcurves(500)
+        ripeDayList = surveysim.determine_when_sne_are_ripe_for_discovery(
+            log,
+            redshiftArray=np.zeros(500),
+            limitingMags=limitingMags,
+            observedFrameLightCurveInfo=lightCurves,
+            discoverableList=discoverableList,
+            plot=False)
+        cadenceDictionary = {}
+        for ffilter, first in zip(filters, [1, 1, 2, 3]):
+            cadenceDictionary[ffilter] = range(first, 176, 3)
+
+        # EPOCHS ALL AT THE FILTER'S DEPTH REPRODUCE THE SINGLE-DEPTH RESULTS
+        results = []
+        for limitingMagsPerEpoch in [None, dict((f, np.ones(len(cadenceDictionary[f])) * limitingMags[f]) for f in filters)]:
+            results.append(surveysim.determine_if_sne_are_discovered(
+                log,
+                limitingMags=limitingMags,
+                ripeDayList=ripeDayList,
+                cadenceDictionary=cadenceDictionary,
+                observedFrameLightCurveInfo=lightCurves,
+                extraSurveyConstraints={},
+                plot=False,
+                randomState=np.random.RandomState(3),
+                limitingMagsPerEpoch=limitingMagsPerEpoch))
+        for single, perEpoch in zip(*results):
+            for item in range(500):
+                for ffilter in filters:
+                    a, b = single[item].get(ffilter), perEpoch[item].get(ffilter)
+                    if a is False or b is False:
+                        assert a is b
+                    elif a is not None:
+                        assert abs(a - b) < 1e-9
+
+        # SHALLOWER EPOCHS NEVER DISCOVER MORE SNE
+        shallow = dict((f, np.ones(len(cadenceDictionary[f])) * limitingMags[f] - 0.5 * (np.arange(len(cadenceDictionary[f])) % 2)) for f in filters)
+        lcDiscoveries, surveyDiscoveries, campaigns = surveysim.determine_if_sne_are_discovered(
+            log,
+            limitingMags=limitingMags,
+            ripeDayList=ripeDayList,
+            cadenceDictionary=cadenceDictionary,
+            observedFrameLightCurveInfo=lightCurves,
+            extraSurveyConstraints={},
+            plot=False,
+            randomState=np.random.RandomState(3),
+            limitingMagsPerEpoch=shallow)
+        for ffilter in filters:
+            assert sum([1 for d in surveyDiscoveries if d.get(ffilter)]) <= \
+                sum([1 for d in results[0][1] if d.get(ffilter)])
+
+    def test_determine_sn_discoveries_function(self):
+        lightCurves, discoverableList = _parabolic_lightcurves(500)
+        ripeDayList = surveysim.determine_when_sne_are_ripe_for_discovery(
+            log,
+            redshiftArray=np.zeros(500),
+            limitingMags=limitingMags,
+            observedFrameLightCurveInfo=lightCurves,
+            discoverableList=discoverableList,
+            plot=False)
+        cadenceDictionary = {}
+        for ffilter, first in zip(filters, [1, 1, 2, 3]):
+            cadenceDictionary[ffilter] = range(first, 176, 3)
+        staged = surveysim.determine_if_sne_are_discovered(
+            log,
+            limitingMags=limitingMags,
+            ripeDayList=ripeDayList,
+            cadenceDictionary=cadenceDictionary,
+            observedFrameLightCurveInfo=lightCurves,
+            extraSurveyConstraints={},
+            plot=False,
+            randomState=np.random.RandomState(3))
+
+        # THE FUSED PASS MATCHES THE THREE STAGES, HOWEVER IT IS CHUNKED
+        for chunkSize in [500, 64]:
+            discoveries = surveysim.determine_sn_discoveries(
+                log,
+                redshiftArray=np.zeros(500),
+                limitingMags=limitingMags,
+                cadenceDictionary=cadenceDictionary,
+                observedFrameLightCurveInfo=lightCurves,
+                pathToOutputPlotDirectory=pathToOutputDir,
+                plot=False,
+                randomState=np.random.RandomState(3),
+                chunkSize=chunkSize)
+            assert discoveries.shape == (500, 4)
+            for column, ffilter in enumerate(filters):
+                assert discoveries["discoverable"][:, column].tolist() == \
+                    [d[ffilter] for d in discoverableList]
+            fused = surveysim.discovery_lists(log, discoveries=discoveries)
+            for stagedList, fusedList in zip(staged, fused):
+                assert stagedList == fusedList
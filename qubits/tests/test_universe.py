@@ -0,0 +1,128 @@
+import os
+import nose
+import unittest
+import time
+import pytest
+import numpy as np
+from qubits import universe
+from qubits.utKit import utKit
+
+# SETUP AND TEARDOWN FIXTURE FUNCTIONS FOR THE ENTIRE MODULE
+moduleDirectory = os.path.dirname(__file__)
+utKit = utKit(moduleDirectory)
+log, dbConn, pathToInputDir, pathToOutputDir = utKit.setupModule()
+utKit.tearDownModule()
+
+# Recursively create missing directories
+if not os.path.exists(pathToOutputDir):
+    os.makedirs(pathToOutputDir)
+
+
+class test_universe(unittest.TestCase):
+
+    def test_snap_to_grid_function(self):
+        grid = np.arange(0., 1.0, 0.1)
+        values = np.array([-0.2, 0.04, 0.05, 0.06, 0.449, 0.951, 1.3])
+        snapped = universe._snap_to_grid(values, grid)
+
+        # COMPARE TO THE ORIGINAL PER-OBJECT `closestNumber` LOOKUP
+        closestNumber = lambda n, l: min(l, key=lambda x: abs(x - n))
+        for v, s in zip(values, snapped):
+            assert s == closestNumber(v, grid)
+
+    def test_random_redshift_array_function(self):
+        redshiftArray = universe.random_redshift_array(
+            log,
+            sampleNumber=1000,
+            lowerRedshiftLimit=0.0,
+            upperRedshiftLimit=1.0,
+            redshiftResolution=0.1,
+            pathToOutputPlotDirectory=pathToOutputDir,
+            plot=False)
+        assert len(redshiftArray) == 1000
+        assert redshiftArray.min() >= 0.
+        assert redshiftArray.max() <= 0.9
+        # VOLUME WEIGHTED - THE FAR HALF OF THE VOLUME DOMINATES
+        assert (redshiftArray > 0.5).sum() > (redshiftArray < 0.5).sum()
+
+    def test_random_sn_types_array_function(self):
+        snTypesArray, snTypeNames = universe.random_sn_types_array(
+            log,
+            sampleNumber=10000,
+            relativeSNRates={"SNOne": 0.8, "SNTwo": 0.2},
+            pathToOutputPlotDirectory=pathToOutputDir,
+            plot=False)
+        assert snTypesArray.dtype.itemsize == 1
+        names = snTypeNames[snTypesArray]
+        assert set(names) == set(["SNOne", "SNTwo"])
+        assert 0.75 < (names == "SNOne").mean() < 0.85
+
+        peakMags = universe.random_peak_magnitudes(
+            log,
+            peakMagnitudeDistributions={
+                "magnitude": {"SNOne": -19., "SNTwo": -21.},
+                "sigma": {"SNOne": 0.1, "SNTwo": 0.}},
+            snTypesArray=snTypesArray,
+            plot=False,
+            snTypeNames=snTypeNames)
+        assert np.all(peakMags[names == "SNTwo"] == -21.)
+        assert abs(peakMags[names == "SNOne"].mean() + 19.) < 0.01
+
+    @pytest.mark.slow
+    def test_random_redshift_array_benchmark(self):
+        print "\nsampleNumber  seconds"
+        for power in range(3, 8):
+            sampleNumber = 10**power
+            start = time.time()
+            universe.random_redshift_array(
+                log,
+                sampleNumber=sampleNumber,
+                lowerRedshiftLimit=0.0,
+                upperRedshiftLimit=1.0,
+                redshiftResolution=0.01,
+                pathToOutputPlotDirectory=pathToOutputDir,
+                plot=False)
+            print "%12s  %0.3f" % (sampleNumber, time.time() - start)
+
+    def test_convert_lightcurves_to_observered_frame_function(self):
+        # A QUADRATIC LIGHTCURVE AND A LINEAR K-CORRECTION - BOTH TIME
+        # DILATION METHODS SHOULD GIVE THE SAME OBSERVED LIGHTCURVES
+        rawLightCurveDict = {"SNOne": {"g": {
+            "poly": np.poly1d([0.001, 0.01, 0.]),
+            "Explosion Day Relative to Peak": -20.}}}
+        snLightCurves = {"SNOne": {"End of lightcurve relative to peak": 100}}
+        kCorDict = {"g": np.poly1d([0.002, 0.1]), "r": None,
+                    "i": np.poly1d([0.3]), "z": None}
+        redshiftArray = np.array([0.1, 0.3, 0.3])
+        kwargs = dict(
+            log=log,
+            snLightCurves=snLightCurves,
+            rawLightCurveDict=rawLightCurveDict,
+            redshiftArray=redshiftArray,
+            snTypesArray=np.array(["SNOne", "SNOne", "SNOne"]),
+            peakMagnitudesArray=np.array([-19., -19.5, -20.]),
+            hostExtinctionArray=np.zeros(3),
+            kCorrectionArray=[kCorDict, kCorDict, kCorDict],
+            galacticExtinctionArray=np.array([0., 0.1, 0.2]),
+            restFrameFilter="g",
+            pathToOutputDirectory=pathToOutputDir,
+            pathToOutputPlotDirectory=pathToOutputDir,
+            polyOrder=2,
+            plot=False)
+
+        analytic, peakMags = universe.convert_lightcurves_to_observered_frame(
+            timeDilationMethod="analytic", **kwargs)
+        fit, peakMags = universe.convert_lightcurves_to_observered_frame(
+            timeDilationMethod="fit", **kwargs)
+
+        times = np.array([-10., 25., 80.])
+        for ffilter in ["g", "i"]:
+            assert np.allclose(analytic.evaluate(ffilter, times),
+                               fit.evaluate(ffilter, times))
+        assert peakMags[0]["r"] is None
+        assert analytic[1]["explosionDay"] == -20. * 1.3
+
+        # p(t / (1+z)) EXACTLY
+        restPoly = rawLightCurveDict["SNOne"]["g"]["poly"] - kCorDict["g"]
+        mags = analytic.evaluate("g", times) - analytic.peak_magnitudes("g")
+        assert np.allclose(mags, restPoly(times / (1. + redshiftArray)) - restPoly(0))
@@ -0,0 +1,43 @@
+import os
+import nose
+import unittest
+from qubits.workers import run_work_units
+from qubits.utKit import utKit
+
+# SETUP AND TEARDOWN FIXTURE FUNCTIONS FOR THE ENTIRE MODULE
+moduleDirectory = os.path.dirname(__file__)
+utKit = utKit(moduleDirectory)
+log, dbConn, pathToInputDir, pathToOutputDir = utKit.setupModule()
+utKit.tearDownModule()
+
+
+def _work_unit(log, model, redshift, pathToOutputDirectory):
+    "a work unit that fails for one model"
+    if model == "broken":
+        raise ValueError("no spectra for %s" % (model,))
+    if redshift > 0.25:
+        return -1
+    return None
+
+
+class test_workers(unittest.TestCase):
+
+    def test_run_work_units_function(self):
+        workUnits = [{"model": m, "redshift": z}
+                     for m in ["SNOne", "broken"] for z in [0.1, 0.2, 0.3]]
+        for numberOfWorkers in [1, 3]:
+            failures = run_work_units(
+                log=log,
+                function=_work_unit,
+                workUnits=workUnits,
+                commonArguments={"pathToOutputDirectory": pathToOutputDir},
+                numberOfWorkers=numberOfWorkers,
+                description="test units"
+            )
+            failed = sorted([(u["model"], u["redshift"])
+                             for u, e in failures])
+            assert failed == [("SNOne", 0.3), ("broken", 0.1),
+                              ("broken", 0.2), ("broken", 0.3)]
+            errors = dict([((u["model"], u["redshift"]), e)
+                           for u, e in failures])
+            assert "no spectra for broken" in errors[("broken", 0.1)]
@@ -40,7 +40,9 @@ def random_redshift_array(
         upperRedshiftLimit,
         redshiftResolution,
         pathToOutputPlotDirectory,
-        plot=False):
+        plot=False,
+        cosmology=False,
+        randomState=None):
     """
     *Generate a NumPy array of random distances given a sample number and distance limit*
 
@@ -52,6 +54,8 @@ def random_redshift_array(
         - ``redshiftResolution`` -- the resolution of the redshift distribution
         - ``pathToOutputPlotDirectory`` -- path to the output directory (provided by the user)
         - ``plot`` -- generate plot?
+        - ``cosmology`` -- the run's shared ``cosmology_table``. Default *False* (build a table for this call only)
+        - ``randomState`` -- the ``numpy.random.RandomState`` to draw from. Default *None* (the global numpy random state)
 
     **Return:**
         - ``redshiftArray`` -- an array of random redshifts within the volume limit
@@ -63,38 +67,35 @@ def random_redshift_array(
     import numpy as np
     import numpy.random as npr
     ## LOCAL APPLICATION ##
-    import dryxPython.astrotools as da
+    from .cosmology import cosmology_table
+
+    if randomState is None:
+        randomState = npr
 
     redshiftDistribution = np.arange(
         0., upperRedshiftLimit, redshiftResolution)
-    closestNumber = lambda n, l: min(l, key=lambda x: abs(x - n))
+
+    if not cosmology:
+        cosmology = cosmology_table(
+            log=log,
+            upperRedshiftLimit=upperRedshiftLimit
+        )
 
     # GIVEN THE REDSHIFT LIMIT - DETERMINE THE VOLUME LIMIT
-    distanceDictionary = da.convert_redshift_to_distance(upperRedshiftLimit)
-    upperMpcLimit = distanceDictionary["dl_mpc"]
-    upperVolumeLimit = (4. / 3.) * np.pi * upperMpcLimit ** 3
+    upperVolumeLimit = cosmology.volume(upperRedshiftLimit)
 
     if lowerRedshiftLimit == 0.:
         lowerVolumeLimit = 0.
     else:
-        distanceDictionary = da.convert_redshift_to_distance(
-            lowerRedshiftLimit)
-        lowerMpcLimit = distanceDictionary["dl_mpc"]
-        lowerVolumeLimit = (4. / 3.) * np.pi * lowerMpcLimit ** 3
+        lowerVolumeLimit = cosmology.volume(lowerRedshiftLimit)
 
     volumeShell = upperVolumeLimit - lowerVolumeLimit
 
-    # GENERATE A LIST OF RANDOM DISTANCES
-    redshiftList = []
-    for i in range(sampleNumber):
-        randomVolume = lowerVolumeLimit + npr.random() * volumeShell
-        randomDistance = (randomVolume * (3. / 4.) / np.pi) ** (1. / 3.)
-        randomRedshift = da.convert_mpc_to_redshift(randomDistance)
-        randomRedshift = closestNumber(randomRedshift, redshiftDistribution)
-        # log.debug('randomDistance %s' % (randomDistance,))
-        redshiftList.append(randomRedshift)
-
-    redshiftArray = np.array(redshiftList)
+    # GENERATE THE RANDOM DISTANCES IN ONE DRAW AND CONVERT TO REDSHIFTS
+    randomVolumes = lowerVolumeLimit + randomState.random_sample(sampleNumber) * volumeShell
+    randomDistances = (randomVolumes * (3. / 4.) / np.pi) ** (1. / 3.)
+    randomRedshifts = cosmology.redshift_from_distance(randomDistances)
+    redshiftArray = _snap_to_grid(randomRedshifts, redshiftDistribution)
     # log.info('redshiftArray %s' % (redshiftArray,))
 
     if plot:
@@ -111,11 +112,8 @@ def random_redshift_array(
             [0.1, 0.1, 0.8, 0.8],
             polar=True)
 
-        thetaList = []
         twoPi = 2. * np.pi
-        for i in range(sampleNumber):
-            thetaList.append(twoPi * npr.random())
-        thetaArray = np.array(thetaList)
+        thetaArray = twoPi * randomState.random_sample(sampleNumber)
 
         plt.scatter(
             thetaArray,
@@ -142,7 +140,7 @@ def random_redshift_array(
     return redshiftArray
 
 
-# LAST MODIFIED : April 12, 2013
+# LAST MODIFIED : October 18, 2026
 # CREATED : April 12, 2013
 # AUTHOR : DRYX
 def random_sn_types_array(
@@ -150,19 +148,24 @@ def random_sn_types_array(
         sampleNumber,
         relativeSNRates,
         pathToOutputPlotDirectory,
-        plot=False):
+        plot=False,
+        randomState=None):
     """
     *Generate random supernova types from the weighted distributions set in the simulation settings file*
 
+    The types are returned as compact integer codes into a lookup table of type names, i.e. ``snTypeNames[snTypesArray]`` gives the type names of the objects.
+
     **Key Arguments:**
         - ``log`` -- logger
         - ``sampleNumber`` -- the sample number, i.e. array size
         - ``relativeSNRates`` -- dictionary of the rates
         - ``pathToOutputPlotDirectory`` -- path to the output directory (provided by the user)
         - ``plot`` -- generate plot?
+        - ``randomState`` -- the ``numpy.random.RandomState`` to draw from. Default *None* (the global numpy random state)
 
     **Return:**
-        - ``snTypesArray`` -- numpy array of the random SN types
+        - ``snTypesArray`` -- numpy array of the random SN type codes
+        - ``snTypeNames`` -- numpy array of the SN type names (the lookup table for the codes)
     """
     ################ > IMPORTS ################
     ## STANDARD LIB ##
@@ -174,37 +177,25 @@ def random_sn_types_array(
     ################ > VARIABLE SETTINGS ######
 
     ################ >ACTION(S) ################
-    randomSNTypeList = []
-    # CREATE COUNTERS FOR PLOTTING
-    counters = {}
-    for k, v in relativeSNRates.iteritems():
-        counters[k] = 0
-
-    for i in range(sampleNumber):
-        randNum = np.random.rand()
-        cumulative = 0.
-        for k, v in relativeSNRates.iteritems():
-            cumulative = cumulative + v
-            if (randNum <= cumulative):
-                randType = k
-                counters[k] += 1
-                break
-        randomSNTypeList.append(randType)
-
-    # for k, v in relativeSNRates.iteritems():
-    #     log.debug('%s = %s' % (k, counters[k]))
-
-    snTypeArray = np.array(randomSNTypeList)
+    if randomState is None:
+        randomState = np.random
+
+    snTypeNames = np.array(sorted(relativeSNRates.keys()))
+    weights = np.array([relativeSNRates[k]
+                        for k in snTypeNames], dtype=float)
+
+    # ONE WEIGHTED DRAW FOR THE WHOLE SAMPLE, STORED IN THE SMALLEST INTEGER
+    # TYPE THAT CAN HOLD THE CODES
+    snTypesArray = randomState.choice(
+        len(snTypeNames), size=sampleNumber, p=weights / weights.sum())
+    snTypesArray = snTypesArray.astype(np.min_scalar_type(len(snTypeNames)))
 
     if plot:
-        numTypes = len(relativeSNRates)
+        numTypes = len(snTypeNames)
         x = np.arange(1, numTypes + 1, 1)
 
-        heights = []
-        xticks = []
-        for k, v in relativeSNRates.iteritems():
-            xticks.append(k)
-            heights.append(counters[k])
+        heights = np.bincount(snTypesArray, minlength=numTypes)
+        xticks = snTypeNames.tolist()
 
         fig = plt.figure(
             num=None,
@@ -235,7 +226,7 @@ def random_sn_types_array(
         plt.savefig(fileName)
         plt.clf()  # clear figure
 
-    return snTypeArray
+    return snTypesArray, snTypeNames
 
 
 # LAST MODIFIED : April 12, 2013
@@ -433,14 +424,16 @@ def generate_numpy_polynomial_lightcurves(
     return rawLightCurveDict
 
 
-# LAST MODIFIED : April 15, 2013
+# LAST MODIFIED : October 18, 2026
 # CREATED : April 15, 2013
 # AUTHOR : DRYX
 def random_peak_magnitudes(
         log,
         peakMagnitudeDistributions,
         snTypesArray,
-        plot=True):
+        plot=True,
+        snTypeNames=None,
+        randomState=None):
     """
     *Generate a numpy array of random (distribution weighted) peak magnitudes for the given sn types.*
 
@@ -449,9 +442,11 @@ def random_peak_magnitudes(
         - ``peakMagnitudeDistributions`` -- yaml style dictionary of peak magnitude distributions
         - ``snTypesArray`` -- the pre-generated array of random sn types
         - ``plot`` -- generate plot?
+        - ``snTypeNames`` -- the lookup table of type names if ``snTypesArray`` holds integer type codes. Default *None* (``snTypesArray`` holds the type names)
+        - ``randomState`` -- the ``numpy.random.RandomState`` to draw from. Default *None* (the global numpy random state)
 
     **Return:**
-        - None
+        - ``peakMagArray`` -- numpy array of the random peak magnitudes
     """
     ################ > IMPORTS ################
     ## STANDARD LIB ##
@@ -461,19 +456,21 @@ def random_peak_magnitudes(
     ## LOCAL APPLICATION ##
 
     ################ >ACTION(S) ################
-    magDistributions = {}
-    for snType, peakMag in peakMagnitudeDistributions['magnitude'].iteritems():
-        sigma = peakMagnitudeDistributions['sigma'][snType]
-        magDistributions[snType] = [peakMag, sigma]
+    if randomState is None:
+        randomState = np.random
+
+    if snTypeNames is None:
+        snTypeNames, snTypesArray = np.unique(
+            snTypesArray, return_inverse=True)
 
-    peakMagList = []
-    for item in snTypesArray:
-        thisPeak = magDistributions[item][
-            1] * np.random.randn() + magDistributions[item][0]
-        peakMagList.append(thisPeak)
+    # PER-TYPE MEAN AND SIGMA LOOKUP ARRAYS INDEXED BY THE TYPE CODES
+    means = np.array([peakMagnitudeDistributions['magnitude'][t]
+                      for t in snTypeNames], dtype=float)
+    sigmas = np.array([peakMagnitudeDistributions['sigma'][t]
+                       for t in snTypeNames], dtype=float)
 
-    peakMagArray = np.array(peakMagList)
-    # log.debug('peakMagArray %s' % (peakMagArray,))
+    peakMagArray = means[snTypesArray] + sigmas[snTypesArray] * \
+        randomState.randn(len(snTypesArray))
 
     return peakMagArray
 
@@ -487,7 +484,9 @@ def build_kcorrection_array(
         snTypesArray,
         snLightCurves,
         pathToOutputDirectory,
-        plot=True):
+        plot=True,
+        snTypeNames=None,
+        restFrameFilter=None):
     """
     *Given the random redshiftArray and snTypeArray, generate a dictionary of k-correction polynomials (one for each filter) for every object.*
 
@@ -498,51 +497,55 @@ def build_kcorrection_array(
         - ``snLightCurves`` -- yaml style dictionary of SN lightcurve info
         - ``pathToOutputDirectory`` -- path to the output directory (provided by the user)
         - ``plot`` -- generate plot?
+        - ``snTypeNames`` -- the lookup table of type names if ``snTypesArray`` holds integer type codes. Default *None* (``snTypesArray`` holds the type names)
+        - ``restFrameFilter`` -- the rest frame filter the k-corrections are anchored to. Default *None* (any)
 
     **Return:**
-        - None
+        - ``kCorArray`` -- array of { filter : k-correction polynomial } dictionaries, one per SN. SNe of the same model and redshift share the same dictionary
     """
     ################ > IMPORTS ################
     ## STANDARD LIB ##
     ## THIRD PARTY ##
-    import yaml
     import numpy as np
     ## LOCAL APPLICATION ##
 
     ################ >ACTION(S) ################
-    dataDir = pathToOutputDirectory + "/k_corrections/"
     filters = ['g', 'r', 'i', 'z']
-    fileName = pathToOutputDirectory + "/transient_light_curves.yaml"
-    stream = file(fileName, 'r')
-    generatedLCs = yaml.load(stream)
-    models = generatedLCs.keys()
-    kCorList = []
 
-    for i in range(len(redshiftArray)):
-        redshift = redshiftArray[i]
+    # REDSHIFTS ARE SNAPPED TO A GRID SO ONLY A HANDFUL OF (MODEL, REDSHIFT)
+    # BINS EXIST - BUILD ONE K-CORRECTION DICTIONARY PER BIN AND HAND EVERY
+    # SN A REFERENCE TO ITS BIN'S DICTIONARY
+    uniqueTypes, typeIndex = np.unique(snTypesArray, return_inverse=True)
+    if snTypeNames is not None:
+        uniqueTypes = np.asarray(snTypeNames)[uniqueTypes]
+    uniqueRedshifts, redshiftIndex = np.unique(
+        redshiftArray, return_inverse=True)
+    binIndex = typeIndex * len(uniqueRedshifts) + redshiftIndex
+    uniqueBins, binInverse = np.unique(binIndex, return_inverse=True)
+
+    kCorrectionIndex = _load_kcorrection_index(
+        log,
+        pathToOutputDirectory=pathToOutputDirectory,
+        models=uniqueTypes,
+        filters=filters,
+        redshifts=uniqueRedshifts,
+        restFrameFilter=restFrameFilter)
+
+    binDicts = np.empty(len(uniqueBins), dtype=object)
+    for i, thisBin in enumerate(uniqueBins):
+        model = uniqueTypes[thisBin // len(uniqueRedshifts)]
+        strRed = "%0.3f" % (uniqueRedshifts[thisBin % len(uniqueRedshifts)],)
         kCorDict = {}
-        for model in models:
-            for ffilter in filters:
-                filterDir = dataDir + model + "/" + ffilter
-                strRed = "%0.3f" % (redshift,)
-                fileName = filterDir + "/z" + \
-                    str(strRed).replace(".", "pt") + "_poly.yaml"
-                try:
-                    stream = file(fileName, 'r')
-                    yamlContent = yaml.load(stream)
-                    # log.info('yamlContent %s' % (yamlContent,))
-                    stream.close()
-                    flatPoly = np.poly1d(yamlContent['polyCoeffs'])
-                except:
-                    flatPoly = None
-                kCorDict[ffilter] = flatPoly
-                kCorList.append(kCorDict)
-
-    kCorArray = np.array(kCorList)
+        for ffilter in filters:
+            kCorDict[ffilter] = kCorrectionIndex.get(
+                (model, ffilter, strRed), None)
+        binDicts[i] = kCorDict
+
+    kCorArray = binDicts[binInverse]
     return kCorArray
 
 
-# LAST MODIFIED : April 15, 2013
+# LAST MODIFIED : October 18, 2026
 # CREATED : April 15, 2013
 # AUTHOR : DRYX
 def convert_lightcurves_to_observered_frame(
@@ -559,9 +562,14 @@ def convert_lightcurves_to_observered_frame(
         pathToOutputDirectory,
         pathToOutputPlotDirectory,
         polyOrder,
-        plot=True):
+        plot=True,
+        cosmology=False,
+        timeDilationMethod="analytic",
+        snTypeNames=None):
     """
-    *Given all the randomly generated parameters of the survey, generate a dictionary of lightcurves for each object (one lightcurve per filter)*
+    *Given all the randomly generated parameters of the survey, generate the observed-frame lightcurves of every object (one lightcurve per filter)*
+
+    Objects of the same model at the same redshift share the shape of their lightcurves, so the k-correction and time-dilation work is done once per (model, redshift) bin. Peak magnitudes, distance moduli and galactic extinctions are carried as per-object magnitude offsets.
 
     **Key Arguments:**
         - ``log`` -- logger
@@ -578,71 +586,71 @@ def convert_lightcurves_to_observered_frame(
         - ``pathToOutputPlotDirectory`` -- path to the output plot directory
         - ``polyOrder`` -- order of the polynomial used to fit the lightcurve
         - ``plot`` -- generate plots?
+        - ``cosmology`` -- the run's shared ``cosmology_table``. Default *False* (build a table for this call only)
+        - ``timeDilationMethod`` -- how to stretch the lightcurves into the observed frame. ``analytic`` rescales the polynomial coefficients exactly, ``fit`` re-samples each lightcurve and re-fits a polynomial of order ``polyOrder`` (kept for validation). Default *analytic*
+        - ``snTypeNames`` -- the lookup table of type names if ``snTypesArray`` holds integer type codes. Default *None* (``snTypesArray`` holds the type names)
 
     **Return:**
-        - None
+        - ``observedFrameLightCurveInfo`` -- a ``lightcurve_array`` of the observed-frame lightcurves (indexing it gives the per-object ``lightCurves``, ``peakMags``, ``explosionDay`` and ``endOfLightcurveDay`` dictionary)
+        - ``peakAppMagList`` -- list of the peak apparent magnitudes of each object (one dictionary per object keyed by filter)
     """
     ################ > IMPORTS ################
     ## STANDARD LIB ##
     ## THIRD PARTY ##
     import numpy as np
     import matplotlib.pyplot as plt
-    import math
-    import yaml
     ## LOCAL APPLICATION ##
-    import dryxPython.astrotools as da
     import dryxPython.plotting as dp
+    from .cosmology import cosmology_table
+    from .lightcurves import lightcurve_array
 
     ################ >ACTION(S) ################
     filters = ['g', 'r', 'i', 'z']
-    fileName = pathToOutputDirectory + "/transient_light_curves.yaml"
-    stream = file(fileName, 'r')
-    generatedLCs = yaml.load(stream)
-    models = generatedLCs.keys()
     ebvConverters = {'g': 3.793, 'r': 2.751, 'i': 2.086, 'z': 1.479}
     stepNum = 0
 
+    redshiftArray = np.asarray(redshiftArray, dtype=float)
+    snTypesArray = np.asarray(snTypesArray)
+    numberOfObjects = len(snTypesArray)
+
+    # GROUP THE OBJECTS INTO (MODEL, REDSHIFT) BINS
+    uniqueTypes, typeIndex = np.unique(snTypesArray, return_inverse=True)
+    if snTypeNames is not None:
+        uniqueTypes = np.asarray(snTypeNames)[uniqueTypes]
+    uniqueRedshifts, redshiftIndex = np.unique(
+        redshiftArray, return_inverse=True)
+    binKeys = typeIndex * len(uniqueRedshifts) + redshiftIndex
+    uniqueBins, binFirstObject, binIndex = np.unique(
+        binKeys, return_index=True, return_inverse=True)
+    binModels = uniqueTypes[uniqueBins // len(uniqueRedshifts)]
+    binRedshifts = uniqueRedshifts[uniqueBins % len(uniqueRedshifts)]
+    numberOfBins = len(uniqueBins)
+    log.debug('%s objects fall into %s (model, redshift) bins' %
+              (numberOfObjects, numberOfBins))
+
+    # REST-FRAME EXPLOSION AND END DAYS OF EACH BIN
+    binExplosionDays = np.array([rawLightCurveDict[m][restFrameFilter][
+        'Explosion Day Relative to Peak'] for m in binModels], dtype=float)
+    binEndDays = np.array([snLightCurves[m][
+        'End of lightcurve relative to peak'] for m in binModels], dtype=float)
+
     ###########################################################
     # STEP 1 - CONVERT RAW LIGHTCURVES TO ABSOLUTE MAG CURVES #
     ###########################################################
     stepNum += 1
-    stepStr = "%02d" % stepNum
-    # CONVERT PEAK MAGS TO POLYNOMIALS
-    peakMagPolyList = []
-    for item in peakMagnitudesArray:
-        thisPoly = np.poly1d([item, ])
-        peakMagPolyList.append(thisPoly)
-
-    # CONVERT RAW LIGHTCURVES TO ABSOLUTE MAG CURVES
-    absLightCurveList = []
-    exampleDictionary = {}
-
-    for item in range(len(snTypesArray)):
-        thisModel = snTypesArray[item]
-        # explosionDay = snLightCurves[thisModel]['Explosion Day Relative to Peak']
-        log.debug('thisModel, restFrameFilter: %s, %s' %
-                  (thisModel, restFrameFilter,))
-        explosionDay = rawLightCurveDict[thisModel][
-            restFrameFilter]['Explosion Day Relative to Peak']
-        endOfLightcurveDay = snLightCurves[thisModel][
-            'End of lightcurve relative to peak']
-        log.info(
-            'explosionDay, endOfLightcurveDay for absolute Light Curve: %s, %s' %
-            (explosionDay, endOfLightcurveDay))
-        absLightCurve = rawLightCurveDict[thisModel][
-            restFrameFilter]['poly'] + peakMagPolyList[item]
-        absLightCurve = np.poly1d(absLightCurve)
-        absLightCurveList.append(absLightCurve)
-        exampleDictionary['SN %02d @ z = %04.3f' %
-                          (item, redshiftArray[item])] = absLightCurve
+    # THE RAW LIGHTCURVES PEAK AT MAG = 0 - THE PEAK MAGNITUDES ARE A
+    # PER-OBJECT OFFSET
+    magOffsets = np.asarray(peakMagnitudesArray, dtype=float)
     if plot:
+        exampleDictionary = _offset_lightcurve_dictionary(
+            rawLightCurveDict, restFrameFilter, binModels[binIndex], redshiftArray, magOffsets)
         plot_polynomial(
             log,
             title="Absoulte Magnitude Lightcurves - random sample",
             polynomialDict=exampleDictionary,
             orginalDataDictionary=False,
             pathToOutputPlotsFolder=pathToOutputPlotDirectory,
-            xRange=[explosionDay, endOfLightcurveDay],
+            xRange=[binExplosionDays[binIndex[-1]], binEndDays[binIndex[-1]]],
             xlabel="Days Relative to Peak (Rest Frame)",
             ylabel="Absolute Magnitude",
             xAxisLimits=False,
@@ -654,49 +662,25 @@ def convert_lightcurves_to_observered_frame(
     # STEP 2 - CONVERT ABSOLUTE LIGHTCURVES TO APPARENT MAG CURVES #
     ################################################################
     stepNum += 1
-    stepStr = "%02d" % stepNum
-    # CONVERT DISTANCE MOD TO POLYNOMIALS
-    distanceModPolyList = []
-    for item in redshiftArray:
-        log.debug('redshift: %s' % (item,))
-        if item == 0.0:
-            item = 0.01
-        distanceDictionary = da.convert_redshift_to_distance(item)
-        distanceMpc = distanceDictionary["dl_mpc"]
-        distanceModulus = distanceDictionary["dmod"]
-        # log.debug('distanceMpc %s' % (distanceMpc,))
-        # log.info('redshift %s = distanceModulus %s' % (item, distanceModulus,))
-        thisPoly = np.poly1d([distanceModulus, ])
-        distanceModPolyList.append(thisPoly)
-
-    # CONVERT ABSOLUTE LIGHTCURVES TO APPARENT MAG CURVES
-    apparentLightCurveList = []
-    for item in range(len(snTypesArray)):
-        thisModel = snTypesArray[item]
-        # explosionDay = snLightCurves[thisModel]['Explosion Day Relative to Peak']
-        explosionDay = rawLightCurveDict[thisModel][
-            restFrameFilter]['Explosion Day Relative to Peak']
-        endOfLightcurveDay = snLightCurves[thisModel][
-            'End of lightcurve relative to peak']
-        log.info(
-            'explosionDay, endOfLightcurveDay for apparent Light Curve: %s, %s' %
-            (explosionDay, endOfLightcurveDay))
-        apparentLightCurve = absLightCurveList[
-            item] + distanceModPolyList[item]
-        # log.debug('apparentLightCurve %s' % (apparentLightCurve,))
-        apparentLightCurve = np.poly1d(apparentLightCurve)
-        apparentLightCurveList.append(apparentLightCurve)
-        exampleDictionary['SN %02d @ z = %04.3f' %
-                          (item, redshiftArray[item])] = apparentLightCurve
-        #log.info('absLightCurveDictionary %s' % (absLightCurveDictionary,))
+    # z = 0 IS PLACED AT z = 0.01 TO KEEP THE DISTANCE MODULUS FINITE
+    if not cosmology:
+        cosmology = cosmology_table(
+            log=log,
+            upperRedshiftLimit=max(np.max(redshiftArray), 0.01)
+        )
+    distanceModuli = cosmology.distance_modulus(
+        np.where(redshiftArray == 0.0, 0.01, redshiftArray))
+    magOffsets = magOffsets + distanceModuli
     if plot:
+        exampleDictionary = _offset_lightcurve_dictionary(
+            rawLightCurveDict, restFrameFilter, binModels[binIndex], redshiftArray, magOffsets)
         plot_polynomial(
             log,
             title="Pre-KCorrection Apparent Magnitude Lightcurves - random sample",
             polynomialDict=exampleDictionary,
             orginalDataDictionary=False,
             pathToOutputPlotsFolder=pathToOutputPlotDirectory,
-            xRange=[explosionDay, endOfLightcurveDay],
+            xRange=[binExplosionDays[binIndex[-1]], binEndDays[binIndex[-1]]],
             xlabel="Days Relative to Peak (Rest Frame)",
             ylabel="Apparent Magnitude",
             xAxisLimits=False,
@@ -708,89 +692,57 @@ def convert_lightcurves_to_observered_frame(
     # STEP 3 - (UN) K-CORRECT THE APPARENT LIGHTCURVES        #
     ###########################################################
     stepNum += 1
-    stepStr = "%02d" % stepNum
-    # (UN) K-CORRECT THE APPARENT LIGHTCURVES
-    kCorApparentLightCurveList = []
-    for i in range(len(apparentLightCurveList)):
-        thisModel = snTypesArray[i]
-        # explosionDay = snLightCurves[thisModel]['Explosion Day Relative to Peak']
-        explosionDay = rawLightCurveDict[thisModel][
-            restFrameFilter]['Explosion Day Relative to Peak']
-        endOfLightcurveDay = snLightCurves[thisModel][
-            'End of lightcurve relative to peak']
-        log.info(
-            'explosionDay, endOfLightcurveDay for unkcor apparent Light Curve: %s, %s' %
-            (explosionDay, endOfLightcurveDay))
-        kCorDict = kCorrectionArray[i]
-        lcDict = {}
-        plotLcDict = {}
-        for ffilter, poly in kCorDict.iteritems():
+    # ONE (UN) K-CORRECTED SHAPE PER BIN AND FILTER - ALL OBJECTS IN A BIN
+    # SHARE THE SAME K-CORRECTION DICTIONARY
+    restCoefficients = {}
+    for ffilter in filters:
+        restCoefficients[ffilter] = []
+    for b in range(numberOfBins):
+        rawPoly = rawLightCurveDict[binModels[b]][restFrameFilter]['poly']
+        kCorDict = kCorrectionArray[binFirstObject[b]]
+        for ffilter in filters:
+            poly = kCorDict.get(ffilter)
             if poly is None:
-                kcorLightCurve = None
+                restCoefficients[ffilter].append(None)
             else:
-                kcorLightCurve = apparentLightCurveList[i] - poly
-                plotLcDict[ffilter] = kcorLightCurve
-            lcDict[ffilter] = kcorLightCurve
-            if plot:
-                plot_polynomial(
-                    log,
-                    title="K(un)corrected Apparent Magnitude Lightcurves - SN Number %s" % (
-                        i),
-                    polynomialDict=plotLcDict,
-                    orginalDataDictionary=False,
-                    pathToOutputPlotsFolder=pathToOutputPlotDirectory,
-                    xRange=[explosionDay, endOfLightcurveDay],
-                    xlabel="Days Relative to Peak (Rest Frame)",
-                    ylabel="Apparent Magnitude",
-                    xAxisLimits=False,
-                    yAxisLimits=False,
-                    yAxisInvert=True,
-                    prependNum=stepNum)
-
-        kCorApparentLightCurveList.append(lcDict)
+                restCoefficients[ffilter].append(
+                    np.poly1d(rawPoly - poly).coeffs)
+    for ffilter in filters:
+        restCoefficients[ffilter] = _stack_coefficients(
+            restCoefficients[ffilter])
+    if plot:
+        for item in range(numberOfObjects):
+            plotLcDict = _object_lightcurve_dictionary(
+                restCoefficients, binIndex[item], dict((f, magOffsets[item]) for f in filters))
+            plot_polynomial(
+                log,
+                title="K(un)corrected Apparent Magnitude Lightcurves - SN Number %s" % (
+                    item),
+                polynomialDict=plotLcDict,
+                orginalDataDictionary=False,
+                pathToOutputPlotsFolder=pathToOutputPlotDirectory,
+                xRange=[binExplosionDays[binIndex[item]],
+                        binEndDays[binIndex[item]]],
+                xlabel="Days Relative to Peak (Rest Frame)",
+                ylabel="Apparent Magnitude",
+                xAxisLimits=False,
+                yAxisLimits=False,
+                yAxisInvert=True,
+                prependNum=stepNum)
 
     ###########################################################
     # STEP 4 - INCLUDE GALACTIC EXTINCTION IN LIGHTCURVES     #
     ###########################################################
     stepNum += 1
-    stepStr = "%02d" % stepNum
-    # INCLUDE GALACTIC EXTINCTION
-    # CONVERT EXT TO POLYNOMIALS
-    galExtPolyList = []
-    for ext in galacticExtinctionArray:
-        extDict = {}
-        for ffilter in filters:
-            thisExt = ext * ebvConverters[ffilter]
-            # log.info('ext %s, filter %s' % (thisExt, ffilter))
-            thisPoly = np.poly1d([thisExt, ])
-            extDict[ffilter] = thisPoly
-        galExtPolyList.append(extDict)
-
-    # INCLUDE GALAXTIC EXTINTION IN LIGHTCURVES
-    galExtLightCurveList = []
-    for item in range(len(kCorApparentLightCurveList)):
-        thisModel = snTypesArray[item]
-        # explosionDay = snLightCurves[thisModel]['Explosion Day Relative to Peak']
-        explosionDay = rawLightCurveDict[thisModel][
-            restFrameFilter]['Explosion Day Relative to Peak']
-        endOfLightcurveDay = snLightCurves[thisModel][
-            'End of lightcurve relative to peak']
-        log.info(
-            'explosionDay, endOfLightcurveDay for galatic extinction corr Frame Light Curve: %s, %s' %
-            (explosionDay, endOfLightcurveDay))
-        lcDict = {}
-        plotLcDict = {}
-        for ffilter in filters:
-            if kCorApparentLightCurveList[item][ffilter] is not None:
-                galExtLightCurve = kCorApparentLightCurveList[
-                    item][ffilter] + galExtPolyList[item][ffilter]
-                # log.debug('apparentLightCurve %s' % (apparentLightCurve,))
-                galExtPoly = np.poly1d(galExtLightCurve)
-                plotLcDict[ffilter] = galExtPoly
-            else:
-                galExtPoly = None
-            lcDict[ffilter] = galExtPoly
-        if plot:
+    galacticExtinctionArray = np.asarray(galacticExtinctionArray, dtype=float)
+    offsets = {}
+    for ffilter in filters:
+        offsets[ffilter] = magOffsets + \
+            galacticExtinctionArray * ebvConverters[ffilter]
+    if plot:
+        for item in range(numberOfObjects):
+            plotLcDict = _object_lightcurve_dictionary(
+                restCoefficients, binIndex[item], dict((f, offsets[f][item]) for f in filters))
             plot_polynomial(
                 log,
                 title="Galactic Extinction Corrected Lightcurves - SN Number %s" % (
@@ -798,7 +750,8 @@ def convert_lightcurves_to_observered_frame(
                 polynomialDict=plotLcDict,
                 orginalDataDictionary=False,
                 pathToOutputPlotsFolder=pathToOutputPlotDirectory,
-                xRange=[explosionDay, endOfLightcurveDay],
+                xRange=[binExplosionDays[binIndex[item]],
+                        binEndDays[binIndex[item]]],
                 xlabel="Days Relative to Peak (Rest Frame)",
                 ylabel="Apparent Magnitude",
                 xAxisLimits=False,
@@ -806,63 +759,64 @@ def convert_lightcurves_to_observered_frame(
                 yAxisInvert=True,
                 prependNum=stepNum)
 
-        galExtLightCurveList.append(lcDict)
-
     ###########################################################
     # STEP 5 - TIME-DILATE LIGHTCURVES                        #
     ###########################################################
     stepNum += 1
-    stepStr = "%02d" % stepNum
-    observedFrameLightCurveInfo = []
-    peakAppMagList = []
-    for item in range(len(redshiftArray)):
-        timeDilation = 1. + redshiftArray[item]
-        thisModel = snTypesArray[item]
-        # explosionDay = snLightCurves[thisModel]['Explosion Day Relative to Peak']*timeDilation
-        explosionDay = rawLightCurveDict[thisModel][restFrameFilter][
-            'Explosion Day Relative to Peak'] * timeDilation
-        endOfLightcurveDay = snLightCurves[thisModel][
-            'End of lightcurve relative to peak'] * timeDilation
-        log.info(
-            'explosionDay, endOfLightcurveDay for observed time dil Frame Light Curve: %s, %s' %
-            (explosionDay, endOfLightcurveDay))
-        polyDict = {}
-        lcPolyDict = {}
-        peakMagDict = {}
-        floatPeakMagDict = {}
-
+    timeDilations = 1. + binRedshifts
+    observedCoefficients = {}
+    if timeDilationMethod == "analytic":
+        # THE OBSERVED LIGHTCURVE IS p(t / (1+z)) - THE COEFFICIENT OF t^k IS
+        # EXACTLY THE REST-FRAME COEFFICIENT SCALED BY (1+z)^-k
         for ffilter in filters:
-            if galExtLightCurveList[item][ffilter] is not None:
-                xList = []
-                yList = []
-                for x in range(int(explosionDay), int(endOfLightcurveDay)):
-                    xList.append(x * timeDilation)
-                    y = galExtLightCurveList[item][ffilter](x)
-                    yList.append(y)
-
-                x = np.array(xList)
-                y = np.array(yList)
-                thisPoly = np.polyfit(x, y, polyOrder)
-                flatPoly = np.poly1d(thisPoly)
-                peakMag = flatPoly(0)
-                floatPeakMag = float(peakMag)
-                polyDict[ffilter] = flatPoly
-                peakMagDict[ffilter] = peakMag
-                floatPeakMagDict[ffilter] = floatPeakMag
-                lcPolyDict[ffilter] = flatPoly
-            else:
-                polyDict[ffilter] = None
-                peakMagDict[ffilter] = None
-                floatPeakMagDict[ffilter] = None
+            powers = np.arange(restCoefficients[ffilter].shape[1])[::-1]
+            observedCoefficients[ffilter] = restCoefficients[ffilter] * \
+                timeDilations[:, None] ** -powers[None, :]
+    elif timeDilationMethod == "fit":
+        # THE FIT IS LINEAR IN THE COEFFICIENTS SO THE CONSTANT PER-OBJECT
+        # OFFSETS PASS STRAIGHT THROUGH IT - FIT THE SHAPE ONCE PER BIN
+        for ffilter in filters:
+            observedCoefficients[ffilter] = np.ones(
+                (numberOfBins, polyOrder + 1)) * np.nan
+        for b in range(numberOfBins):
+            timeDilation = timeDilations[b]
+            x = np.arange(int(binExplosionDays[b] * timeDilation),
+                          int(binEndDays[b] * timeDilation))
+            for ffilter in filters:
+                row = restCoefficients[ffilter][b]
+                if np.isnan(row[0]):
+                    continue
+                observedCoefficients[ffilter][b] = np.polyfit(
+                    x * timeDilation, np.polyval(row, x), polyOrder)
+    else:
+        message = 'the lightcurve time dilation method must be `analytic` or `fit`, not `%s`' % (
+            timeDilationMethod,)
+        log.critical(message)
+        raise ValueError(message)
+
+    observedFrameLightCurveInfo = lightcurve_array(
+        log=log,
+        filters=filters,
+        coefficients=observedCoefficients,
+        binIndex=binIndex,
+        offsets=offsets,
+        explosionDay=(binExplosionDays * timeDilations)[binIndex],
+        endOfLightcurveDay=(binEndDays * timeDilations)[binIndex]
+    )
 
-        if plot:
+    if plot:
+        for item in range(numberOfObjects):
+            thisData = observedFrameLightCurveInfo[item]
+            lcPolyDict = dict((f, p) for f, p in thisData[
+                              'lightCurves'].iteritems() if p is not None)
             plot_polynomial(
                 log,
                 title="Observed Lightcurves - SN Number %s" % (item, ),
                 polynomialDict=lcPolyDict,
                 orginalDataDictionary=False,
                 pathToOutputPlotsFolder=pathToOutputPlotDirectory,
-                xRange=[explosionDay, endOfLightcurveDay],
+                xRange=[thisData['explosionDay'],
+                        thisData['endOfLightcurveDay']],
                 xlabel="Days Relative to Peak (Observed Frame)",
                 ylabel="Apparent Magnitude",
                 xAxisLimits=False,
@@ -871,13 +825,19 @@ def convert_lightcurves_to_observered_frame(
                 prependNum=stepNum,
                 legend=True)
 
-        thisData = {
-            'lightCurves': polyDict,
-            'peakMags': peakMagDict,
-            'explosionDay': explosionDay,
-            'endOfLightcurveDay': endOfLightcurveDay}
-        # log.info('peakMagDict %s' % (peakMagDict,))
-        observedFrameLightCurveInfo.append(thisData)
+    # PEAK MAGS AS PLAIN FLOATS (None FOR MISSING FILTERS) FOR THE RESULTS FILE
+    peakMags = {}
+    for ffilter in filters:
+        peakMags[ffilter] = observedFrameLightCurveInfo.peak_magnitudes(
+            ffilter).tolist()
+    peakAppMagList = []
+    for item in range(numberOfObjects):
+        floatPeakMagDict = {}
+        for ffilter in filters:
+            peakMag = peakMags[ffilter][item]
+            if peakMag != peakMag:
+                peakMag = None
+            floatPeakMagDict[ffilter] = peakMag
         peakAppMagList.append(floatPeakMagDict)
 
     return observedFrameLightCurveInfo, peakAppMagList
@@ -886,6 +846,201 @@ def convert_lightcurves_to_observered_frame(
 ###################################################################
 # PRIVATE (HELPER) FUNCTIONS                                      #
 ###################################################################
+# LAST MODIFIED : October 18, 2026
+# CREATED : October 18, 2026
+# AUTHOR : DRYX
+def _load_kcorrection_index(
+        log,
+        pathToOutputDirectory,
+        models,
+        filters,
+        redshifts,
+        restFrameFilter=None):
+    """
+    *Load every k-correction polynomial needed for a run into memory, once*
+
+    **Key Arguments:**
+        - ``log`` -- logger
+        - ``pathToOutputDirectory`` -- path to the output directory (provided by the user)
+        - ``models`` -- the transient models to load k-corrections for
+        - ``filters`` -- the observed frame filters to load k-corrections for
+        - ``redshifts`` -- the (grid snapped) redshifts to load k-corrections for
+        - ``restFrameFilter`` -- the rest frame filter the k-corrections are anchored to. Default *None* (any)
+
+    **Return:**
+        - ``kCorrectionIndex`` -- dictionary of { (model, filter, "%0.3f" redshift) : polynomial }. Missing k-corrections are absent from the index
+    """
+    ################ > IMPORTS ################
+    ## STANDARD LIB ##
+    import os
+    ## THIRD PARTY ##
+    ## LOCAL APPLICATION ##
+    from .kcorrections import kcorrection_store
+
+    ################ >ACTION(S) ################
+    pathToDatabase = pathToOutputDirectory + "/k_corrections.db"
+    if not os.path.exists(pathToDatabase):
+        log.warning(
+            'the k-correction database %s does not exist - no k-corrections will be applied' % (pathToDatabase,))
+        return {}
+
+    # ONE OPEN AND ONE QUERY FOR THE WHOLE RUN
+    store = kcorrection_store(
+        log=log,
+        pathToDatabase=pathToDatabase
+    )
+    kCorrectionIndex = store.polynomials(
+        models=models,
+        obsFilters=filters,
+        redshifts=redshifts,
+        restFilter=restFrameFilter)
+    store.close()
+
+    log.debug('%s k-correction polynomials loaded into the index' %
+              (len(kCorrectionIndex),))
+    return kCorrectionIndex
+
+
+# LAST MODIFIED : October 18, 2026
+# CREATED : October 18, 2026
+# AUTHOR : DRYX
+def _snap_to_grid(
+        values,
+        grid):
+    """
+    *Snap every value to the closest point of a sorted grid (ties go to the lower grid point)*
+
+    **Key Arguments:**
+        - ``values`` -- numpy array of values to snap
+        - ``grid`` -- sorted numpy array of allowed values
+
+    **Return:**
+        - ``snapped`` -- numpy array of grid values, the same shape as ``values``
+    """
+    ################ > IMPORTS ################
+    ## STANDARD LIB ##
+    ## THIRD PARTY ##
+    import numpy as np
+    ## LOCAL APPLICATION ##
+
+    ################ >ACTION(S) ################
+    values = np.asarray(values, dtype=float)
+    grid = np.asarray(grid, dtype=float)
+    if len(grid) == 1:
+        return np.ones(values.shape) * grid[0]
+
+    upperIndex = np.searchsorted(grid, values, side="left")
+    upperIndex = np.clip(upperIndex, 1, len(grid) - 1)
+    lowerIndex = upperIndex - 1
+    useLower = (values - grid[lowerIndex]) <= (grid[upperIndex] - values)
+    snapped = np.where(useLower, grid[lowerIndex], grid[upperIndex])
+
+    return snapped
+
+
+# LAST MODIFIED : October 18, 2026
+# CREATED : October 18, 2026
+# AUTHOR : DRYX
+def _stack_coefficients(
+        coefficientList):
+    """
+    *stack a list of polynomial coefficient arrays (of possibly differing orders) into a single matrix, highest power first*
+
+    **Key Arguments:**
+        - ``coefficientList`` -- list of coefficient arrays, ``None`` where there is no polynomial
+
+    **Return:**
+        - ``coefficients`` -- (len(coefficientList), maxOrder + 1) array. Shorter polynomials are padded with leading zeros and ``None`` entries become rows of NaNs
+    """
+    ################ > IMPORTS ################
+    ## STANDARD LIB ##
+    ## THIRD PARTY ##
+    import numpy as np
+    ## LOCAL APPLICATION ##
+
+    ################ >ACTION(S) ################
+    width = max([len(c) for c in coefficientList if c is not None] + [1])
+    coefficients = np.ones((len(coefficientList), width)) * np.nan
+    for i, c in enumerate(coefficientList):
+        if c is None:
+            continue
+        coefficients[i] = 0.
+        coefficients[i, width - len(c):] = c
+
+    return coefficients
+
+
+# LAST MODIFIED : October 18, 2026
+# CREATED : October 18, 2026
+# AUTHOR : DRYX
+def _offset_lightcurve_dictionary(
+        rawLightCurveDict,
+        restFrameFilter,
+        models,
+        redshiftArray,
+        magOffsets):
+    """
+    *the per-object rest-frame lightcurves (raw lightcurve plus magnitude offset) used by the plots of the early lightcurve-conversion steps*
+
+    **Key Arguments:**
+        - ``rawLightCurveDict`` -- dictionary of the raw lightcurves (all peaking at mag = 0)
+        - ``restFrameFilter`` -- the rest frame filter
+        - ``models`` -- array of the model (sn type) names of the objects
+        - ``redshiftArray`` -- array of redshifts
+        - ``magOffsets`` -- array of per-object magnitude offsets
+
+    **Return:**
+        - ``exampleDictionary`` -- dictionary of polynomials keyed by object label
+    """
+    ################ > IMPORTS ################
+    ## STANDARD LIB ##
+    ## THIRD PARTY ##
+    import numpy as np
+    ## LOCAL APPLICATION ##
+
+    ################ >ACTION(S) ################
+    exampleDictionary = {}
+    for item in range(len(models)):
+        exampleDictionary['SN %02d @ z = %04.3f' % (item, redshiftArray[item])] = np.poly1d(
+            rawLightCurveDict[models[item]][restFrameFilter]['poly'] + magOffsets[item])
+
+    return exampleDictionary
+
+
+# LAST MODIFIED : October 18, 2026
+# CREATED : October 18, 2026
+# AUTHOR : DRYX
+def _object_lightcurve_dictionary(
+        coefficients,
+        binIndex,
+        offsets):
+    """
+    *the lightcurve polynomials of a single object - only used for plotting*
+
+    **Key Arguments:**
+        - ``coefficients`` -- dictionary of { filter : per-bin coefficient matrix }
+        - ``binIndex`` -- the bin of the object
+        - ``offsets`` -- dictionary of { filter : magnitude offset of the object }
+
+    **Return:**
+        - ``lcDict`` -- dictionary of { filter : polynomial } (filters without a lightcurve are left out)
+    """
+    ################ > IMPORTS ################
+    ## STANDARD LIB ##
+    ## THIRD PARTY ##
+    import numpy as np
+    ## LOCAL APPLICATION ##
+
+    ################ >ACTION(S) ################
+    lcDict = {}
+    for ffilter, matrix in coefficients.iteritems():
+        row = matrix[binIndex]
+        if np.isnan(row[0]):
+            continue
+        lcDict[ffilter] = np.poly1d(row) + offsets[ffilter]
+
+    return lcDict
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,132 @@
+#!/usr/local/bin/python
+# encoding: utf-8
+"""
+*Run independent units of work (e.g. one model at one redshift) serially or across a pool of worker processes, with progress reporting and a summary of the units that failed*
+
+:Author:
+    David Young
+
+:Date Created:
+    October 18, 2026
+"""
+################# GLOBAL IMPORTS ####################
+import sys
+import os
+import logging
+import itertools
+import traceback
+import multiprocessing
+
+
+def run_work_units(
+        log,
+        function,
+        workUnits,
+        commonArguments={},
+        numberOfWorkers=1,
+        description="work units"):
+    """
+    *run a function once for every work unit, serially or across a pool of worker processes*
+
+    The function must be defined at the top level of a module (so it can be sent to the worker processes) and is called as ``function(log, **unitArguments)`` where the unit arguments are the work unit merged over the common arguments. A unit fails if it raises an exception or returns ``-1``; failures do not stop the other units and are summarised in the log once every unit has run.
+
+    **Key Arguments:**
+        - ``log`` -- logger
+        - ``function`` -- the top-level function to run for each work unit
+        - ``workUnits`` -- list of dictionaries of the arguments that vary between units (e.g. ``{"model": "SNOne", "redshift": 0.1}``)
+        - ``commonArguments`` -- dictionary of the arguments shared by every unit. Default *{}*
+        - ``numberOfWorkers`` -- the number of worker processes. 1 runs the units serially in this process; 0 or *None* uses every core. Default *1*
+        - ``description`` -- what to call the units in the progress reports. Default *work units*
+
+    **Return:**
+        - ``failures`` -- list of (workUnit, errorMessage) tuples for the units that failed
+
+    **Usage:**
+
+        .. code-block:: python
+
+            from qubits.workers import run_work_units
+            failures = run_work_units(
+                log=log,
+                function=_kcorrection_listing_unit,
+                workUnits=[{"model": m, "redshift": z} for m in models for z in redshifts],
+                commonArguments={"pathToOutputDirectory": pathToOutputDirectory},
+                numberOfWorkers=8,
+                description="k-correction listings"
+            )
+    """
+    total = len(workUnits)
+    if not numberOfWorkers or numberOfWorkers < 1:
+        numberOfWorkers = multiprocessing.cpu_count()
+    numberOfWorkers = max(1, min(numberOfWorkers, total))
+    log.info('running %(total)s %(description)s with %(numberOfWorkers)s worker process(es)' % locals())
+
+    tasks = []
+    for index, unit in enumerate(workUnits):
+        arguments = dict(commonArguments)
+        arguments.update(unit)
+        tasks.append((function, log.name, index, arguments))
+
+    # WORKERS ARE FORKED FROM THIS PROCESS SO INHERIT THE LOGGER'S HANDLERS
+    pool = None
+    if numberOfWorkers == 1:
+        results = itertools.imap(_run_work_unit, tasks)
+    else:
+        pool = multiprocessing.Pool(numberOfWorkers)
+        results = pool.imap_unordered(_run_work_unit, tasks)
+
+    failures = []
+    reportEvery = max(1, total // 20)
+    try:
+        for done, (index, error) in enumerate(results, 1):
+            if error:
+                failures.append((workUnits[index], error))
+            if done % reportEvery == 0 or done == total:
+                log.info('%s of %s %s complete (%s failed)' %
+                         (done, total, description, len(failures)))
+        if pool:
+            pool.close()
+    except:
+        if pool:
+            pool.terminate()
+        raise
+    finally:
+        if pool:
+            pool.join()
+
+    if failures:
+        summary = ['%s of %s %s failed:' % (len(failures), total, description)]
+        for unit, error in failures:
+            unitName = ", ".join(["%s=%s" % (k, v)
+                                  for k, v in sorted(unit.items())])
+            summary.append('    %s -- %s' % (unitName, error.strip().split("\n")[-1]))
+        log.warning("\n".join(summary))
+
+    return failures
+
+
+###################################################################
+# PRIVATE (HELPER) FUNCTIONS                                      #
+###################################################################
+def _run_work_unit(
+        task):
+    """
+    *run a single work unit, catching its failure*
+
+    **Key Arguments:**
+        - ``task`` -- tuple of (function, logName, index, arguments)
+
+    **Return:**
+        - ``index`` -- the index of the work unit
+        - ``error`` -- the error message (traceback) if the unit failed, otherwise *None*
+    """
+    function, logName, index, arguments = task
+    log = logging.getLogger(logName)
+    try:
+        result = function(log, **arguments)
+    except Exception:
+        return index, traceback.format_exc()
+    if isinstance(result, int) and result == -1:
+        return index, "the work unit returned -1"
+
+    return index, None